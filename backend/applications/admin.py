@@ -3,6 +3,6 @@ from .models import Application
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
-    list_display = ('name', 'phone', 'status', 'created_at')
+    list_display = ('name', 'phone', 'status', 'submissions', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('name', 'phone')
\ No newline at end of file
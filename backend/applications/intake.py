@@ -0,0 +1,119 @@
+# backend/applications/intake.py
+#
+# Прием заявок с публичной формы. Повторная отправка (двойной клик, обновление
+# страницы, та же заявка через несколько минут) не создает новую строку: в пределах
+# окна APPLICATION_INTAKE['DEDUP_WINDOW'] она объединяется с новой заявкой на тот же
+# номер с тем же именем, классом и предметом. Заявка на другого ребенка или предмет
+# с того же номера телефона — отдельная строка. Клиент, передающий заголовок
+# Idempotency-Key, при повторе запроса с тем же телом получает сохраненный ответ первого.
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Application, normalize_phone
+
+IDEMPOTENCY_KEY = 'applications:idempotency:{}'
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+PENDING = 'pending'
+# Поля, по которым повторная отправка считается той же заявкой
+IDENTITY_FIELDS = ('name', 'student_class', 'subject')
+
+
+def identity(values):
+    """Имя, класс и предмет без учета регистра и лишних пробелов."""
+    return tuple(' '.join(str(values.get(field) or '').split()).casefold() for field in IDENTITY_FIELDS)
+
+
+def merge(application, data):
+    """Учитывает повторную отправку той же заявки: новый комментарий дописывается к прежнему."""
+    update_fields = ['submissions']
+    comment = data.get('comment', '').strip()
+    if comment and comment not in application.comment:
+        application.comment = f'{application.comment}\n{comment}' if application.comment else comment
+        update_fields.append('comment')
+    application.submissions = F('submissions') + 1
+    application.save(update_fields=update_fields)
+    application.refresh_from_db(fields=['submissions'])
+
+
+def submit(data):
+    """Создает заявку или объединяет ее с недавней такой же. Возвращает (заявка, создана ли)."""
+    since = timezone.now() - timedelta(seconds=settings.APPLICATION_INTAKE['DEDUP_WINDOW'])
+    key = identity(data)
+    with transaction.atomic():
+        recent = (
+            Application.objects.select_for_update()
+            .filter(phone_normalized=normalize_phone(data['phone']), status='new', created_at__gte=since)
+            .order_by('-created_at')
+        )
+        # Сравнение в Python: casefold для кириллицы в SQLite через iexact не работает
+        existing = next(
+            (application for application in recent if identity(vars(application)) == key), None,
+        )
+        if existing is None:
+            return Application.objects.create(**data), True
+        merge(existing, data)
+        return existing, False
+
+
+def fingerprint(data):
+    """Хеш тела запроса, не зависящий от порядка полей и формата (JSON или форма)."""
+    if hasattr(data, 'lists'):
+        data = {key: values[0] if len(values) == 1 else values for key, values in data.lists()}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def idempotent(request, handler):
+    """
+    Выполняет handler() один раз на значение Idempotency-Key. Успешный ответ хранится
+    IDEMPOTENCY_TIMEOUT секунд вместе с хешем тела запроса и отдается повторно только
+    на то же тело; тот же ключ с другими данными получает 422. Пока первый запрос
+    не завершился, повтор с тем же ключом получает 409. Ошибки не сохраняются:
+    исправленную форму можно отправить с тем же ключом.
+    """
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not idempotency_key:
+        return handler()
+
+    # Ключ задает клиент: хеш ограничивает длину ключа кеша
+    key = IDEMPOTENCY_KEY.format(hashlib.sha256(idempotency_key.encode()).hexdigest())
+    config = settings.APPLICATION_INTAKE
+    if not cache.add(key, PENDING, timeout=config['IDEMPOTENCY_LOCK_TIMEOUT']):
+        stored = cache.get(key)
+        if stored == PENDING:
+            return Response(
+                {'error': 'Заявка с этим ключом еще обрабатывается.'}, status=status.HTTP_409_CONFLICT,
+            )
+        if stored is not None:
+            if stored['body'] != fingerprint(request.data):
+                # Иначе чужая заявка молча потеряется, а клиент получит данные первой
+                return Response(
+                    {'error': 'Ключ идемпотентности уже использован для другой заявки.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            return Response(stored['data'], status=stored['status'], headers={'Idempotent-Replayed': 'true'})
+        cache.add(key, PENDING, timeout=config['IDEMPOTENCY_LOCK_TIMEOUT']) # Ключ истек между add и get
+
+    try:
+        response = handler()
+    except BaseException:
+        cache.delete(key)
+        raise
+    if status.is_success(response.status_code):
+        cache.set(
+            key,
+            {'status': response.status_code, 'data': dict(response.data), 'body': fingerprint(request.data)},
+            timeout=config['IDEMPOTENCY_TIMEOUT'],
+        )
+    else:
+        cache.delete(key)
+    return response
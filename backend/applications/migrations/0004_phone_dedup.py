@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+from applications.models import normalize_phone
+
+
+def fill_phone_normalized(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    batch = []
+    for application in Application.objects.only('id', 'phone').iterator(chunk_size=2000):
+        application.phone_normalized = normalize_phone(application.phone)
+        batch.append(application)
+        if len(batch) == 2000:
+            Application.objects.bulk_update(batch, ['phone_normalized'])
+            batch = []
+    Application.objects.bulk_update(batch, ['phone_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_status_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='Телефон (цифры)'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='submissions',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Отправок'),
+        ),
+        migrations.RunPython(fill_phone_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['phone_normalized', 'created_at'], name='application_phone_created_idx'),
+        ),
+    ]
@@ -1,7 +1,20 @@
 # backend/applications/models.py
 
+import re
+
 from django.db import models
 
+
+def normalize_phone(phone):
+    """Только цифры, с кодом страны 7: '+7 (777) 123-45-67', '87771234567' и '7771234567' -> '77771234567'."""
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) == 11 and digits[0] == '8':
+        digits = '7' + digits[1:]
+    elif len(digits) == 10:
+        digits = '7' + digits
+    return digits
+
+
 class Application(models.Model):
     """Модель заявки с сайта"""
     STATUS_CHOICES = (
@@ -12,6 +25,9 @@ class Application(models.Model):
     )
     name = models.CharField(max_length=100, verbose_name='Имя')
     phone = models.CharField(max_length=20, verbose_name='Телефон')
+    # Повторные заявки с тем же номером, именем, классом и предметом объединяются (applications/intake.py)
+    phone_normalized = models.CharField(max_length=20, blank=True, editable=False, verbose_name='Телефон (цифры)')
+    submissions = models.PositiveIntegerField(default=1, editable=False, verbose_name='Отправок')
     student_class = models.CharField(max_length=50, blank=True, verbose_name='Класс ученика')
     subject = models.CharField(max_length=100, blank=True, verbose_name='Предмет')
     comment = models.TextField(blank=True, verbose_name='Комментарий')
@@ -22,6 +38,21 @@ class Application(models.Model):
         verbose_name = 'Заявка'
         verbose_name_plural = 'Заявки'
         ordering = ['-created_at']
+        indexes = [
+            # Поддерживает сортировку и пагинацию по курсору в списке заявок
+            models.Index(fields=['created_at'], name='application_created_at_idx'),
+            # Фильтр ?status= с той же сортировкой
+            models.Index(fields=['status', 'created_at'], name='application_status_created_idx'),
+            # Поиск недавней заявки с тем же номером для объединения
+            models.Index(fields=['phone_normalized', 'created_at'], name='application_phone_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.phone_normalized = normalize_phone(self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'phone_normalized'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f'Заявка от {self.name} ({self.created_at.strftime("%d.%m.%Y")})'
\ No newline at end of file
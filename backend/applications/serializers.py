@@ -1,9 +1,14 @@
 # backend/applications/serializers.py
 
 from rest_framework import serializers
-from .models import Application
+from .models import Application, normalize_phone
 
 class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def validate_phone(self, value):
+        if len(normalize_phone(value)) < 10:
+            raise serializers.ValidationError('Введите номер телефона полностью.')
+        return value
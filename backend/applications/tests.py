@@ -1,3 +1,237 @@
-from django.test import TestCase
+import csv
+import hashlib
+import io
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .intake import PENDING, IDEMPOTENCY_KEY
+from .models import Application, normalize_phone
+
+
+class ApplicationPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True, role='admin')
+        self.client.force_authenticate(self.admin)
+        Application.objects.bulk_create(
+            Application(name=f'Заявка {i}', phone=f'+7700000{i:04d}') for i in range(7)
+        )
+
+    def test_cursor_pages_cover_all_rows_once(self):
+        url = reverse('application-list') + '?page_size=3'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(sorted(seen), sorted(Application.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_limit_offset_mode_is_opt_in(self):
+        response = self.client.get(reverse('application-list'), {'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_public_endpoint_ignores_offset_params(self):
+        response = self.client.get(reverse('review-list'), {'offset': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('count', response.data)
+
+
+class ApplicationExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True, role='admin')
+        self.client.force_authenticate(self.admin)
+        Application.objects.create(name='Айгуль', phone='+77001112233', subject='Математика')
+        Application.objects.create(name='Петр', phone='+77004445566', subject='Физика', status='processed')
+
+    def read_csv(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_is_streamed_with_list_filters(self):
+        response = self.client.get(reverse('application-export'), {'status': 'new'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="applications-', response['Content-Disposition'])
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][:3], ['ID', 'Дата создания', 'Имя'])
+        self.assertEqual([row[2] for row in rows[1:]], ['Айгуль'])
+
+    def test_xlsx_export(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse('application-export'), {'file_format': 'xlsx', 'search': 'Петр'})
+        self.assertEqual(response.status_code, 200)
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(sheet.values)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], 'Петр')
+
+    def test_formulas_are_escaped(self):
+        from openpyxl import load_workbook
+
+        Application.objects.create(
+            name='=HYPERLINK("http://evil")', phone='+7 (700) 777-88-99', subject='-5', comment='@SUM(A1)',
+        )
+        params = {'search': 'HYPERLINK'}
+        row = self.read_csv(self.client.get(reverse('application-export'), params))[1]
+        self.assertIn("'=HYPERLINK(\"http://evil\")", row)
+        self.assertIn("'@SUM(A1)", row)
+        # Телефон и число не меняются
+        self.assertIn('+7 (700) 777-88-99', row)
+        self.assertIn('-5', row)
+
+        response = self.client.get(reverse('application-export'), {**params, 'file_format': 'xlsx'})
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        cells = {cell.value: cell.data_type for cell in sheet[2]}
+        # В XLSX формулой становится только строка с =, и она записана текстом
+        self.assertEqual(cells['=HYPERLINK("http://evil")'], 's')
+        self.assertIn('+7 (700) 777-88-99', cells)
+        self.assertIn('@SUM(A1)', cells)
+        self.assertIn('-5', cells)
+
+    def test_json_export_is_streamed(self):
+        response = self.client.get(reverse('application-export'), {'file_format': 'json', 'search': 'Петр'})
+        self.assertTrue(response.streaming)
+        self.assertIn('.json"', response['Content-Disposition'])
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([(row['name'], row['status']) for row in rows], [('Петр', 'processed')])
+
+    def test_unknown_format_and_permissions(self):
+        self.assertEqual(self.client.get(reverse('application-export'), {'file_format': 'pdf'}).status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse('application-export')).status_code, 401)
+
+
+def throttle_rates(ip=None, phone=None):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'application_ip': ip, 'application_phone': phone},
+    })
+
+
+class ApplicationIntakeTests(APITestCase):
+    def setUp(self):
+        cache.clear() # Счетчики лимитов и ключи идемпотентности
+
+    def submit(self, phone='+7 (701) 123-45-67', ip='10.0.0.1', key=None, **data):
+        headers = {'REMOTE_ADDR': ip}
+        if key:
+            headers['HTTP_IDEMPOTENCY_KEY'] = key
+        return self.client.post(reverse('application-list'), {'name': 'Айгуль', 'phone': phone, **data}, **headers)
+
+    def test_normalize_phone(self):
+        for phone in ('+7 (701) 123-45-67', '87011234567', '7011234567', '+7-701-123-4567'):
+            self.assertEqual(normalize_phone(phone), '77011234567', phone)
+
+    def test_repeat_submission_is_merged(self):
+        first = self.submit(student_class='7', subject='Математика', comment='Математика, 7 класс')
+        self.assertEqual(first.status_code, 201)
+        repeat = self.submit(
+            phone='87011234567', name=' айгуль ', student_class='7', subject='математика',
+            comment='Удобно после 18:00',
+        )
+        self.assertEqual(repeat.status_code, 200)
+        self.assertEqual(repeat.data['id'], first.data['id'])
+        # В ответе сохраненная заявка, но прежний комментарий не раскрывается тому, кто знает только номер
+        self.assertEqual(repeat.data['name'], 'Айгуль')
+        self.assertEqual(repeat.data['subject'], 'Математика')
+        self.assertEqual(repeat.data['comment'], 'Удобно после 18:00')
+
+        application = Application.objects.get()
+        self.assertEqual(application.submissions, 2)
+        self.assertEqual(application.name, 'Айгуль')
+        self.assertEqual(application.comment, 'Математика, 7 класс\nУдобно после 18:00')
+
+    def test_other_child_from_same_phone_is_not_merged(self):
+        first = self.submit(name='Аня', student_class='5', subject='Математика')
+        second = self.submit(name='Борис', student_class='9', subject='Физика')
+        self.assertEqual(second.status_code, 201)
+        self.assertNotEqual(second.data['id'], first.data['id'])
+        self.assertEqual(
+            set(Application.objects.values_list('name', 'student_class', 'subject', 'submissions')),
+            {('Аня', '5', 'Математика', 1), ('Борис', '9', 'Физика', 1)},
+        )
+        # Другой предмет для того же ребенка — тоже новая заявка
+        self.assertEqual(self.submit(name='Аня', student_class='5', subject='Физика').status_code, 201)
+        self.assertEqual(self.submit(name='Аня', student_class='5', subject='Математика').status_code, 200)
+        self.assertEqual(Application.objects.count(), 3)
+
+    def test_old_or_processed_application_is_not_merged(self):
+        first = self.submit()
+        Application.objects.filter(pk=first.data['id']).update(
+            created_at=timezone.now() - timedelta(seconds=settings.APPLICATION_INTAKE['DEDUP_WINDOW'] + 60),
+        )
+        self.assertEqual(self.submit().status_code, 201)
+        Application.objects.update(status='contacted')
+        self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(Application.objects.count(), 3)
+
+    def test_invalid_phone_is_rejected(self):
+        response = self.submit(phone='12-34')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone', response.data)
+
+    def test_non_object_body_is_rejected(self):
+        with throttle_rates(phone='2/min'):
+            response = self.client.post(reverse('application-list'), [1, 2], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_idempotency_key_replays_response(self):
+        first = self.submit(key='form-1')
+        replay = self.submit(key='form-1')
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(Application.objects.get().submissions, 1)
+
+    def test_idempotency_key_with_other_body_is_rejected(self):
+        self.submit(key='abc')
+        response = self.submit(key='abc', name='Борис', phone='+77019999999')
+        self.assertEqual(response.status_code, 422)
+        # Данные первой заявки не раскрываются
+        self.assertNotIn('phone', response.data)
+        self.assertEqual(Application.objects.count(), 1)
+        # Тот же ключ в JSON с тем же содержимым — повтор
+        replay = self.client.post(
+            reverse('application-list'), {'phone': '+7 (701) 123-45-67', 'name': 'Айгуль'},
+            format='json', REMOTE_ADDR='10.0.0.1', HTTP_IDEMPOTENCY_KEY='abc',
+        )
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+
+    def test_idempotency_key_in_progress_and_errors(self):
+        cache.set(IDEMPOTENCY_KEY.format(hashlib.sha256(b'busy').hexdigest()), PENDING)
+        self.assertEqual(self.submit(key='busy').status_code, 409)
+        # Ошибка проверки не сохраняется: исправленную форму можно отправить с тем же ключом
+        self.assertEqual(self.submit(phone='1', key='form-2').status_code, 400)
+        self.assertEqual(self.submit(key='form-2').status_code, 201)
+
+    def test_phone_and_ip_throttles(self):
+        with throttle_rates(phone='2/min'):
+            self.assertEqual(self.submit(ip='10.0.0.1').status_code, 201)
+            self.assertEqual(self.submit(ip='10.0.0.2', phone='87011234567').status_code, 200)
+            response = self.submit(ip='10.0.0.3')
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            self.assertEqual(self.submit(ip='10.0.0.3', phone='+77019999999').status_code, 201)
+        with throttle_rates(ip='1/min'):
+            self.assertEqual(self.submit(ip='10.0.0.9', phone='+77010000001').status_code, 201)
+            self.assertEqual(self.submit(ip='10.0.0.9', phone='+77010000002').status_code, 429)
+
+    def test_admin_actions_are_not_throttled(self):
+        admin = User.objects.create_user(username='admin', password='pass', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        with throttle_rates(ip='1/min', phone='1/min'):
+            for _ in range(3):
+                self.assertEqual(self.client.get(reverse('application-list')).status_code, 200)
@@ -0,0 +1,27 @@
+# backend/applications/throttles.py
+
+from collections.abc import Mapping
+
+from backend.throttling import CounterRateThrottle
+from .models import normalize_phone
+
+
+class ApplicationIPThrottle(CounterRateThrottle):
+    """Заявки с одного IP (за NAT школы или мобильного оператора их может быть несколько)."""
+    scope = 'application_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class ApplicationPhoneThrottle(CounterRateThrottle):
+    """Заявки на один номер телефона с любых IP."""
+    scope = 'application_phone'
+
+    def get_cache_key(self, request, view):
+        if not isinstance(request.data, Mapping):
+            return None # Тело не объект (например, JSON-массив) — отклонит сериализатор
+        phone = normalize_phone(str(request.data.get('phone', '')))
+        if not phone:
+            return None # Без телефона заявку отклонит сериализатор
+        return self.cache_format % {'scope': self.scope, 'ident': phone}
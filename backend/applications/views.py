@@ -1,18 +1,78 @@
 # backend/applications/views.py
 
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .intake import idempotent, submit
 from .models import Application
 from .serializers import ApplicationSerializer
+from .throttles import ApplicationIPThrottle, ApplicationPhoneThrottle
 from backend.permissions import IsAdmin
+from backend.exports import EXPORT_FORMATS, export_response
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     """ViewSet для заявок. Создание - для всех, управление - для админов."""
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    ordering = '-created_at'
+    offset_pagination = True # Для ?limit=5 на дашборде и таблицы заявок
+    filter_backends = [filters.SearchFilter]
+    search_fields = ['name', 'phone']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
 
     def get_permissions(self):
         # Разрешаем любому пользователю создавать заявку (метод POST)
         if self.action == 'create':
             return [permissions.AllowAny()]
         # Все остальные действия (просмотр, редактирование, удаление) - только для админа
-        return [IsAdmin()]
\ No newline at end of file
+        return [IsAdmin()]
+
+    def get_throttles(self):
+        # Публичная форма: лимит по IP и по номеру телефона (см. DEFAULT_THROTTLE_RATES)
+        if self.action == 'create':
+            return [ApplicationIPThrottle(), ApplicationPhoneThrottle()]
+        return super().get_throttles()
+
+    def create(self, request, *args, **kwargs):
+        return idempotent(request, lambda: self.submit(request))
+
+    def submit(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        application, created = submit(serializer.validated_data)
+        if created:
+            serializer.instance = application
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        # Повторная отправка объединена с прежней заявкой. В ответе — сохраненная заявка,
+        # но вместо накопленных комментариев только присланный: их не должен видеть любой,
+        # кто знает номер
+        submitted = Application(
+            **{field.attname: getattr(application, field.attname) for field in Application._meta.concrete_fields},
+        )
+        submitted.comment = serializer.validated_data.get('comment', '')
+        return Response(self.get_serializer(submitted).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Выгрузка заявок в CSV/XLSX/JSON (?file_format=csv|xlsx|json) с теми же фильтрами, что и список."""
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response({'error': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+        columns = [
+            ('id', 'ID'),
+            ('created_at', 'Дата создания'),
+            ('name', 'Имя'),
+            ('phone', 'Телефон'),
+            ('student_class', 'Класс ученика'),
+            ('subject', 'Предмет'),
+            ('status', 'Статус'),
+            ('comment', 'Комментарий'),
+        ]
+        queryset = self.filter_queryset(self.get_queryset()).order_by(self.ordering)
+        return export_response(queryset, columns, 'applications', file_format)
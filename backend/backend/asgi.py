@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Публичные списки, курсы и уроки ученика обслуживаются async-view (backend/asgi_urls.py)
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'backend.asgi_urls')
+# Без постоянных соединений: под ASGI они не переиспользуются (backend/database.py)
+os.environ.setdefault('DJANGO_ASGI', 'True')
 
 application = get_asgi_application()
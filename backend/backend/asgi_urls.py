@@ -0,0 +1,45 @@
+# backend/backend/asgi_urls.py
+#
+# URL-схема для ASGI (backend/asgi.py): те же адреса и имена, что в backend/urls.py,
+# но самые нагруженные эндпоинты чтения обслуживаются async-view (backend/asyncviews.py).
+# Запись и остальные эндпоинты работают через исходные DRF-view.
+
+from django.urls import URLPattern, URLResolver
+
+from courses.views import amy_courses, aupcoming_lessons
+from .asyncviews import alist, aretrieve, async_read
+from .urls import urlpatterns as sync_urlpatterns
+
+# Имя URL -> async-обработчик GET
+ASYNC_HANDLERS = {
+    'course-list': alist,
+    'course-detail': aretrieve,
+    'post-list': alist,
+    'post-detail': aretrieve,
+    'review-list': alist,
+    'review-detail': aretrieve,
+    'public-teacher-list': alist,
+    'public-teacher-detail': aretrieve,
+    'my-courses': amy_courses,
+    'upcoming-lessons': aupcoming_lessons,
+}
+
+
+def async_patterns(patterns):
+    """Копия дерева URL, в которой view из ASYNC_HANDLERS заменены на async."""
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            result.append(URLResolver(
+                pattern.pattern, async_patterns(pattern.url_patterns), pattern.default_kwargs,
+                pattern.app_name, pattern.namespace,
+            ))
+        elif pattern.name in ASYNC_HANDLERS:
+            view = async_read(pattern.callback, ASYNC_HANDLERS[pattern.name])
+            result.append(URLPattern(pattern.pattern, view, pattern.default_args, pattern.name))
+        else:
+            result.append(pattern)
+    return result
+
+
+urlpatterns = async_patterns(sync_urlpatterns)
@@ -0,0 +1,131 @@
+# backend/backend/asyncviews.py
+#
+# Async-путь чтения для ASGI (см. backend/asgi_urls.py). DRF не умеет async-view,
+# поэтому async_read оборачивает готовый DRF-view: проверки доступа, сериализаторы,
+# пагинация и ETag остаются теми же, а запросы к БД выполняются через async ORM.
+# Пока ответ ждет БД или медленного клиента, воркер обслуживает других клиентов,
+# а не держит поток на каждый запрос.
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponse
+from rest_framework.response import Response
+
+from .database import reading_from_replica
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def setup_view(sync_view, request, args, kwargs):
+    """Экземпляр DRF-view с Request — то, что делают as_view() и dispatch() до вызова обработчика."""
+    view = sync_view.cls(**sync_view.initkwargs)
+    actions = getattr(sync_view, 'actions', None)
+    if actions: # ViewSet: метод HTTP -> действие (list, retrieve ...)
+        actions = dict(actions)
+        if 'get' in actions:
+            actions.setdefault('head', actions['get'])
+        view.action_map = actions
+        for method, action in actions.items():
+            setattr(view, method, getattr(view, action))
+    view.args, view.kwargs = args, kwargs
+    view.request = view.initialize_request(request, *args, **kwargs)
+    view.headers = view.default_response_headers
+    return view
+
+
+async def initial(view, request, *args, **kwargs):
+    """
+    view.initial — аутентификация, проверка прав, лимиты запросов — синхронный код:
+    он может читать пользователя из БД, счетчики throttling из кеша и объекты для
+    проверки прав. Поэтому он всегда выполняется в потоке (sync_to_async,
+    thread_sensitive), а не в цикле событий.
+    """
+    await sync_to_async(view.initial)(request, *args, **kwargs)
+
+
+def to_http_response(response):
+    """
+    Готовый HttpResponse вместо DRF Response: иначе Django отрендерит его
+    в отдельном потоке уже после возврата из view.
+    """
+    if hasattr(response, 'render'):
+        response.render()
+    return HttpResponse(response.content, status=response.status_code, headers=dict(response.items()))
+
+
+def async_read(sync_view, handler):
+    """
+    Async-view поверх DRF-view sync_view. GET и HEAD с ответом в JSON обрабатывает
+    корутина handler(view, request, *args, **kwargs) и возвращает Response;
+    запись и Browsable API уходят в исходный sync_view.
+    """
+    delegate = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return await delegate(request, *args, **kwargs)
+
+        drf_view = setup_view(sync_view, request, args, kwargs)
+        drf_request = drf_view.request
+        try:
+            await initial(drf_view, drf_request, *args, **kwargs)
+            if drf_request.accepted_renderer.format != 'json':
+                return await delegate(request, *args, **kwargs)
+            # ViewSet с ReplicaReadMixin читает из реплик и на async-пути
+            with reading_from_replica(hasattr(drf_view, 'use_replica') and drf_view.use_replica(request)):
+                response = await handler(drf_view, drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = drf_view.handle_exception(exc)
+        return to_http_response(drf_view.finalize_response(drf_request, response, *args, **kwargs))
+
+    # Как у исходного view: CSRF проверяет DRF, а cls/initkwargs нужны интроспекции URL
+    for attr in ('cls', 'initkwargs', 'actions', 'csrf_exempt'):
+        if hasattr(sync_view, attr):
+            setattr(view, attr, getattr(sync_view, attr))
+    return view
+
+
+async def conditional(view, handler, request, *args, **kwargs):
+    # ViewSet с ConditionalGetMixin отдает 304 и кешированный JSON так же, как sync-путь
+    if hasattr(view, 'aconditional_response'):
+        return await view.aconditional_response(handler, request, *args, **kwargs)
+    return await handler(request, *args, **kwargs)
+
+
+async def alist(view, request, *args, **kwargs):
+    """ListModelMixin.list через async ORM."""
+    async def handler(request, *args, **kwargs):
+        if hasattr(view, 'get_compiled_serializer'): # CompiledListMixin
+            return await compiled_list(view, request)
+        queryset = view.filter_queryset(view.get_queryset())
+        if view.paginator is not None:
+            page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+            if page is not None:
+                return view.get_paginated_response(view.get_serializer(page, many=True).data)
+        return Response(view.get_serializer([obj async for obj in queryset], many=True).data)
+    return await conditional(view, handler, request, *args, **kwargs)
+
+
+async def compiled_list(view, request):
+    """CompiledListMixin.list через async ORM."""
+    compiled = view.get_compiled_serializer()
+    queryset = view.get_compiled_queryset(compiled)
+    if view.paginator is not None:
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        if page is not None:
+            return view.get_paginated_response(await compiled.aserialize(page))
+    return Response(await compiled.aserialize(queryset))
+
+
+async def aretrieve(view, request, *args, **kwargs):
+    """RetrieveModelMixin.retrieve через async ORM (поиск объекта — как в GenericAPIView.get_object)."""
+    async def handler(request, *args, **kwargs):
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        await sync_to_async(view.check_object_permissions)(request, obj)
+        return Response(view.get_serializer(obj).data)
+    return await conditional(view, handler, request, *args, **kwargs)
@@ -0,0 +1,126 @@
+# backend/backend/authentication.py
+#
+# JWT без запроса к БД на каждый вызов API. В токене лежат role и is_staff,
+# поэтому правила доступа из backend/permissions.py проверяются без запросов,
+# а строка User загружается, только если view обращается к другим полям.
+# Отозванные токены (деактивация, смена роли или пароля) отсекаются по
+# короткоживущему списку в общем кеше (backend/caches.py): запись живет не дольше
+# access-токена. Без общего кеша отзыв в одном воркере не виден остальным,
+# поэтому тогда пользователь, как обычно, загружается из БД на каждый запрос.
+#
+# Отзыв делают сигналы users/signals.py при save() и delete() пользователя.
+# queryset.update(is_active=False, role=...) их обходит: после такого обновления
+# нужно вызвать revoke(*user_ids).
+
+import time
+
+from .caches import shared_cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+
+CLAIMS = ('role', 'is_staff')
+REVOKED_KEY = 'auth:revoked:{}'
+
+
+def add_claims(token, user):
+    token['role'] = user.role
+    token['is_staff'] = user.is_staff
+    return token
+
+
+# --- Список отзыва ---
+
+def revoke(*user_ids):
+    """Отзывает все токены пользователей, выпущенные до этого момента."""
+    cache = shared_cache()
+    if cache is None:
+        return # Без общего кеша токены проверяются по БД
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    now = int(time.time())
+    cache.set_many({REVOKED_KEY.format(user_id): now for user_id in user_ids}, timeout=timeout)
+
+
+def is_revoked(user_id, issued_at):
+    revoked_at = shared_cache().get(REVOKED_KEY.format(user_id))
+    # iat хранится с точностью до секунды: токен той же секунды тоже считаем отозванным
+    return revoked_at is not None and issued_at <= revoked_at
+
+
+# --- Выпуск токенов ---
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Вход по логину и паролю: в токены добавляются role и is_staff."""
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление access-токена: role и is_staff перечитываются из БД,
+    поэтому после смены роли новый токен несет актуальные значения.
+    """
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        add_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
+
+
+# --- Аутентификация ---
+
+class TokenUser(SimpleLazyObject):
+    """
+    Пользователь из токена. id, role и is_staff берутся из claims без запроса;
+    при обращении к любому другому полю (profile, email, save() ...) строка User
+    загружается один раз и дальше объект ведет себя как обычный User.
+    """
+    def __init__(self, user_id, role, is_staff):
+        # simplejwt хранит id в claim строкой: приводим к типу первичного ключа,
+        # иначе сравнения вида obj.user_id == request.user.pk всегда ложны
+        user_id = User._meta.pk.to_python(user_id)
+        super().__init__(lambda: self.load(user_id))
+        self.__dict__.update(
+            pk=user_id, id=user_id, role=role, is_staff=is_staff,
+            is_active=True, is_authenticated=True, is_anonymous=False,
+        )
+
+    @staticmethod
+    def load(user_id):
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None:
+            raise AuthenticationFailed('Пользователь не найден.', code='user_not_found')
+        return user
+
+    def __bool__(self):
+        return True
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без запроса к БД. Токены, выпущенные до появления
+    claims role/is_staff, и все токены без общего кеша (список отзыва негде хранить)
+    проверяются по-старому — с загрузкой пользователя.
+    """
+    def get_user(self, validated_token):
+        if shared_cache() is None or not all(claim in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if is_revoked(user_id, validated_token.get('iat', 0)):
+            raise AuthenticationFailed('Токен отозван.', code='token_revoked')
+        return TokenUser(user_id, validated_token['role'], validated_token['is_staff'])
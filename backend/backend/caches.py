@@ -0,0 +1,17 @@
+# backend/backend/caches.py
+#
+# Доступ к общему для всех воркеров кешу (алиас 'shared' в CACHES, см. settings.py).
+# Кеш по умолчанию может быть локальным для процесса и вытеснять записи, поэтому
+# в нем нельзя хранить то, от чего зависит корректность ответов других воркеров.
+
+from django.conf import settings
+from django.core.cache import caches
+
+SHARED_ALIAS = 'shared'
+
+
+def shared_cache():
+    """Общий кеш или None, если алиас не настроен: вызывающий код должен работать без него."""
+    if SHARED_ALIAS not in settings.CACHES:
+        return None
+    return caches[SHARED_ALIAS]
@@ -0,0 +1,306 @@
+# backend/backend/compiled.py
+#
+# Компиляция сериализаторов для списков только для чтения. DRF на каждую строку
+# создает модель и для каждого поля вызывает get_attribute и to_representation.
+# compile_serializer один раз разбирает объявление ModelSerializer и генерирует
+# функцию «строка .values() -> dict»: колонки читаются из словаря по ключу,
+# вложенные сериализаторы разворачиваются в JOIN, M2M читаются одним запросом
+# на связь. Поля, у которых to_representation не меняет значение из БД (строки,
+# целые, булевы), копируются как есть, остальные (даты, Decimal, выбор) проходят
+# через to_representation тех же полей DRF — поэтому вывод совпадает побайтно.
+#
+# Запись по-прежнему идет через обычные сериализаторы DRF. Поля, которые нельзя
+# свести к колонкам (SerializerMethodField, many=True-сериализаторы, файлы ...),
+# вызывают ImproperlyConfigured при компиляции.
+
+import inspect
+from functools import lru_cache
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+# Поля, которые отдают значение из колонки без изменений, и подходящие им типы колонок
+IDENTITY_FIELDS = {
+    serializers.CharField: {'CharField', 'TextField', 'EmailField', 'URLField', 'SlugField'},
+    serializers.EmailField: {'CharField', 'EmailField'},
+    serializers.URLField: {'CharField', 'URLField'},
+    serializers.SlugField: {'CharField', 'SlugField'},
+    serializers.IntegerField: {
+        'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+        'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+    },
+    serializers.BooleanField: {'BooleanField'},
+}
+INTEGER_COLUMNS = IDENTITY_FIELDS[serializers.IntegerField]
+
+
+class CompiledSerializer:
+    """
+    Скомпилированный сериализатор: values(queryset) — queryset строк с нужными колонками,
+    serialize(rows) / aserialize(rows) — список словарей, как у serializer_class(..., many=True).data.
+    """
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        serializer = serializer_class(fields=list(fields)) if fields is not None else serializer_class()
+        self.paths = []
+        self.many_to_many = [] # (колонка с pk владельца, поле ManyToManyField)
+        self.constants = {}
+        self.nested_count = 0
+        lines = ['def convert(row, many):']
+        self.compile_serializer(serializer, serializer.Meta.model, '', 'out', lines, 1)
+        lines.append('    return out')
+        namespace = dict(self.constants)
+        exec(compile('\n'.join(lines), f'<compiled {serializer_class.__name__}>', 'exec'), namespace)
+        self.convert = namespace['convert']
+        self.source = '\n'.join(lines)
+
+    # --- Компиляция ---
+
+    def column(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return repr(path)
+
+    def constant(self, value):
+        name = f'c{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def fail(self, field, reason):
+        raise ImproperlyConfigured(
+            f'{self.serializer_class.__name__}: поле {field.field_name!r} нельзя скомпилировать — {reason}.'
+        )
+
+    def resolve(self, field, model, attrs):
+        """
+        Разбирает source по связям модели. Возвращает промежуточные объекты
+        [(колонка проверки на None, 'fk' | 'reverse')], путь к последнему объекту ('author__'),
+        его модель и поле модели для последнего атрибута (None — метод или свойство).
+        """
+        hops, prefix = [], ''
+        for attr in attrs[:-1]:
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                self.fail(field, f'{attr!r} не связь модели {model.__name__}')
+            if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+                hops.append((prefix + attr, 'fk'))
+            elif model_field.one_to_one:
+                hops.append((prefix + attr + '__' + model_field.related_model._meta.pk.name, 'reverse'))
+            else:
+                self.fail(field, f'связь {attr!r} не к одному объекту')
+            model, prefix = model_field.related_model, prefix + attr + '__'
+        try:
+            model_field = model._meta.get_field(attrs[-1])
+        except FieldDoesNotExist:
+            model_field = None
+        return hops, prefix, model, model_field
+
+    def missing(self, field, target, indent):
+        """Код для промежуточного объекта None (AttributeError в Field.get_attribute DRF)."""
+        pad = '    ' * indent
+        if field.default is not empty:
+            default, convert = self.constant(field.get_default), self.constant(field.to_representation)
+            return [f'{pad}v = {default}()', f'{pad}{target} = None if v is None else {convert}(v)']
+        if field.allow_null:
+            return [f'{pad}{target} = None']
+        if not field.required:
+            return [f'{pad}pass'] # SkipField: ключа в ответе нет
+        return [f'{pad}raise AttributeError({field.field_name!r})']
+
+    def guarded(self, field, hops, target, body, lines, indent):
+        """body под проверками промежуточных объектов: FK None — как у DRF, обратная связь — None."""
+        pad = '    ' * indent
+        for number, (path, kind) in enumerate(hops):
+            keyword = 'if' if number == 0 else 'elif'
+            lines.append(f'{pad}{keyword} row[{self.column(path)}] is None:')
+            if kind == 'fk':
+                lines.extend(self.missing(field, target, indent + 1))
+            else:
+                lines.append(f'{pad}    {target} = None') # ObjectDoesNotExist: DRF отдает None
+        if hops:
+            lines.append(f'{pad}else:')
+            indent += 1
+        body(indent)
+
+    def converter(self, field, model_field):
+        """Имя функции преобразования значения или None, если значение отдается как есть."""
+        if type(field) is serializers.ReadOnlyField:
+            return None
+        identity = IDENTITY_FIELDS.get(type(field))
+        if type(field) is serializers.BigIntegerField:
+            # Большие целые DRF может отдавать строкой (COERCE_BIGINT_TO_STRING)
+            coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+            identity = None if coerce else INTEGER_COLUMNS
+        if identity and model_field is not None and model_field.get_internal_type() in identity:
+            return None
+        if isinstance(field, serializers.FileField):
+            self.fail(field, 'файловые поля не поддерживаются')
+        return self.constant(field.to_representation)
+
+    def compile_serializer(self, serializer, model, prefix, target, lines, indent):
+        pad = '    ' * indent
+        lines.append(f'{pad}{target} = {{}}')
+        for field in serializer._readable_fields:
+            if field.source == '*':
+                self.fail(field, "source='*'")
+            key = f'{target}[{field.field_name!r}]'
+            hops, path_prefix, owner, model_field = self.resolve(field, model, field.source_attrs)
+            attr = field.source_attrs[-1]
+            path = prefix + path_prefix + attr
+
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer) or model_field is None:
+                    self.fail(field, 'вложенный сериализатор должен быть связью к одному объекту')
+                if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+                    presence = path
+                elif model_field.one_to_one:
+                    presence = f'{path}__{model_field.related_model._meta.pk.name}'
+                else:
+                    self.fail(field, 'вложенный сериализатор должен быть связью к одному объекту')
+
+                def body(level, field=field, key=key, presence=presence, path=path, model_field=model_field):
+                    inner = '    ' * level
+                    nested = f'o{self.nested_count}'
+                    self.nested_count += 1
+                    lines.append(f'{inner}if row[{self.column(presence)}] is None:')
+                    lines.append(f'{inner}    {key} = None')
+                    lines.append(f'{inner}else:')
+                    self.compile_serializer(field, model_field.related_model, path + '__', nested, lines, level + 1)
+                    lines.append(f'{inner}    {key} = {nested}')
+                self.guarded(field, [(prefix + hop, kind) for hop, kind in hops], key, body, lines, indent)
+                continue
+
+            if isinstance(field, ManyRelatedField):
+                if hops or model_field is None or not (model_field.many_to_many and model_field.concrete):
+                    self.fail(field, 'поддерживаются только прямые ManyToManyField')
+                child = field.child_relation
+                if type(child) is not PrimaryKeyRelatedField or child.pk_field is not None:
+                    self.fail(field, 'в M2M поддерживаются только первичные ключи')
+                owner_column = self.column(prefix + owner._meta.pk.name)
+                index = len(self.many_to_many)
+                self.many_to_many.append((prefix + owner._meta.pk.name, model_field))
+                lines.append(f'{pad}{key} = list(many[{index}].get(row[{owner_column}], ()))')
+                continue
+
+            if isinstance(field, serializers.RelatedField):
+                if type(field) is not PrimaryKeyRelatedField or model_field is None or not model_field.many_to_one:
+                    self.fail(field, 'из связей поддерживается только первичный ключ FK')
+
+                def body(level, field=field, key=key, path=path):
+                    inner = '    ' * level
+                    value = f'row[{self.column(path)}]'
+                    if field.pk_field is not None:
+                        convert = self.constant(field.pk_field.to_representation)
+                        lines.append(f'{inner}v = {value}')
+                        lines.append(f'{inner}{key} = None if v is None else {convert}(v)')
+                    else:
+                        lines.append(f'{inner}{key} = {value}')
+                self.guarded(field, [(prefix + hop, kind) for hop, kind in hops], key, body, lines, indent)
+                continue
+
+            if model_field is not None:
+                if model_field.is_relation:
+                    self.fail(field, 'связь без сериализатора связи')
+                value = f'row[{self.column(path)}]'
+            else:
+                value = self.computed(field, owner, prefix, path_prefix, attr, serializer)
+            convert = self.converter(field, model_field)
+
+            def body(level, key=key, value=value, convert=convert):
+                inner = '    ' * level
+                if convert is None:
+                    lines.append(f'{inner}{key} = {value}')
+                else:
+                    lines.append(f'{inner}v = {value}')
+                    lines.append(f'{inner}{key} = None if v is None else {convert}(v)')
+            self.guarded(field, [(prefix + hop, kind) for hop, kind in hops], key, body, lines, indent)
+
+    def computed(self, field, model, prefix, relation, attr, serializer):
+        """
+        Метод или свойство модели (source='author.get_full_name'). Колонки, которые
+        он читает, берутся из query_fields сериализатора (EagerLoadingSerializerMixin);
+        метод вызывается на объекте только с этими атрибутами.
+        """
+        member = inspect.getattr_static(model, attr, None)
+        if isinstance(member, property):
+            function = member.fget
+        elif inspect.isfunction(member):
+            function = member
+        else:
+            self.fail(field, f'{attr!r} не поле, не метод и не свойство {model.__name__}')
+        paths = (getattr(serializer, 'query_fields', None) or {}).get(field.field_name)
+        if not paths:
+            self.fail(field, 'колонки метода не указаны в query_fields')
+        arguments = []
+        for path in paths:
+            name = path[len(relation):]
+            if not path.startswith(relation) or '__' in name:
+                self.fail(field, f'колонка {path!r} не поле {model.__name__}')
+            arguments.append(f'{name}=row[{self.column(prefix + path)}]')
+        return f'{self.constant(function)}({self.constant(SimpleNamespace)}({", ".join(arguments)}))'
+
+    # --- Выполнение ---
+
+    def values(self, queryset, extra_fields=()):
+        """queryset строк для serialize(); extra_fields — колонки сверх выводимых, например для курсора."""
+        paths = self.paths + [path for path in extra_fields if path not in self.paths]
+        return queryset.prefetch_related(None).values(*paths)
+
+    def many_queries(self, rows):
+        """Для каждой M2M: queryset пар (pk владельца, pk связанного) — тот же запрос, что у prefetch_related."""
+        queries = []
+        for owner_path, model_field in self.many_to_many:
+            owners = {row[owner_path] for row in rows} - {None}
+            query_name = model_field.related_query_name()
+            queries.append(
+                model_field.related_model._default_manager
+                .filter(**{f'{query_name}__in': owners})
+                .values_list(query_name, 'pk')
+            )
+        return queries
+
+    @staticmethod
+    def group(pairs):
+        result = {}
+        for owner, pk in pairs:
+            result.setdefault(owner, []).append(pk)
+        return result
+
+    def serialize(self, rows):
+        rows = list(rows)
+        many = [self.group(query) for query in self.many_queries(rows)] if self.many_to_many else []
+        convert = self.convert
+        return [convert(row, many) for row in rows]
+
+    async def aserialize(self, rows):
+        """serialize() для async-view: M2M читаются через async ORM."""
+        rows = [row async for row in rows] if hasattr(rows, '__aiter__') else list(rows)
+        many = [self.group([pair async for pair in query]) for query in self.many_queries(rows)]
+        convert = self.convert
+        return [convert(row, many) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _compile(serializer_class, fields):
+    return CompiledSerializer(serializer_class, fields)
+
+
+def compile_serializer(serializer_class, fields=None):
+    """
+    Скомпилированный serializer_class (кешируется). fields — выводимые поля для
+    сериализаторов с SparseFieldsSerializerMixin, как ?fields= в запросе.
+    """
+    from .mixins import SparseFieldsSerializerMixin
+
+    if fields is not None and issubclass(serializer_class, SparseFieldsSerializerMixin):
+        # Неизвестные имена сериализатор игнорирует, поэтому и в ключ кеша они не попадают
+        known = serializer_class().fields
+        fields = tuple(sorted(name for name in set(fields) if name in known))
+    else:
+        fields = None
+    return _compile(serializer_class, fields)
@@ -0,0 +1,137 @@
+# backend/backend/database.py
+#
+# Настройки БД из переменных окружения и роутер чтения из реплик.
+#
+# DB_ENGINE             django.db.backends.postgresql (по умолчанию) или django.db.backends.sqlite3
+# DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+# DB_CONN_MAX_AGE       сколько секунд держать соединение открытым между запросами (0 — закрывать сразу);
+#                       по умолчанию 60, под ASGI — 0
+# DB_CONN_HEALTH_CHECKS проверять постоянное соединение перед запросом (True/False)
+# DB_POOL               пул соединений psycopg 3 (True/False); DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT
+# DB_REPLICAS           реплики через запятую: host[:port] для PostgreSQL, путь к файлу для SQLite
+# DB_REPLICA_LAG        сколько секунд после изменения данных читать из основной БД, а не из реплик
+#
+# Пул и постоянные соединения взаимоисключающие: с DB_POOL=True CONN_MAX_AGE всегда 0,
+# соединения переиспользует пул. Под ASGI (backend/asgi.py выставляет DJANGO_ASGI) каждый
+# запрос выполняется в своем потоке, и постоянное соединение каждого потока осталось бы
+# открытым: там CONN_MAX_AGE по умолчанию 0, а переиспользовать соединения нужно пулом (DB_POOL).
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+DEFAULTS = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'NAME': 'munificenschool',
+    'USER': 'schooladmin',
+    'PASSWORD': '235689qW#',
+    'HOST': 'localhost',
+    'PORT': '5432',
+}
+REPLICA_PREFIX = 'replica'
+
+
+def flag(value):
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
+def primary_config(environ, base_dir):
+    config = {key: environ.get(f'DB_{key}', default) for key, default in DEFAULTS.items()}
+    if 'sqlite' in config['ENGINE']:
+        # Файловой БД не нужны сеть, пул и учетные данные
+        return {'ENGINE': config['ENGINE'], 'NAME': environ.get('DB_NAME', str(base_dir / 'db.sqlite3'))}
+
+    config['CONN_MAX_AGE'] = int(environ.get('DB_CONN_MAX_AGE', '0' if flag(environ.get('DJANGO_ASGI')) else '60'))
+    config['CONN_HEALTH_CHECKS'] = flag(environ.get('DB_CONN_HEALTH_CHECKS', 'True'))
+    if flag(environ.get('DB_POOL', 'False')):
+        pool = {
+            'min_size': int(environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(environ.get('DB_POOL_TIMEOUT', '10')),
+        }
+        if config['CONN_HEALTH_CHECKS']:
+            # psycopg_pool импортируется, только если пул включен: он нужен лишь для этого режима
+            from psycopg_pool import ConnectionPool
+            pool['check'] = ConnectionPool.check_connection
+        config['OPTIONS'] = {'pool': pool}
+        config['CONN_MAX_AGE'] = 0
+        config['CONN_HEALTH_CHECKS'] = False
+    return config
+
+
+def replica_config(primary, address):
+    config = dict(primary)
+    if 'sqlite' in primary['ENGINE']:
+        config['NAME'] = address
+    else:
+        host, _, port = address.partition(':')
+        config['HOST'], config['PORT'] = host, port or primary['PORT']
+    # В тестах реплика — та же тестовая БД, что и основная
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def databases(environ, base_dir):
+    """Словарь DATABASES: 'default' и реплики 'replica1', 'replica2', ..."""
+    primary = primary_config(environ, base_dir)
+    result = {'default': primary}
+    addresses = [address.strip() for address in environ.get('DB_REPLICAS', '').split(',') if address.strip()]
+    for number, address in enumerate(addresses, start=1):
+        result[f'{REPLICA_PREFIX}{number}'] = replica_config(primary, address)
+    return result
+
+
+# --- Чтение из реплик ---
+
+# Реплика, выбранная для текущего запроса (контекста); None — чтение из основной БД
+current_replica = ContextVar('current_replica', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+@contextmanager
+def reading_from_replica(enabled=True):
+    """
+    Внутри блока ReplicaRouter направляет чтение в реплики (если они настроены).
+    Реплика выбирается один раз на вход в блок: все запросы одного ответа читают
+    один и тот же снимок данных и одно соединение. Вложенный блок оставляет выбор внешнего.
+    """
+    if not enabled:
+        replica = None
+    else:
+        replicas = replica_aliases()
+        replica = current_replica.get() or (random.choice(replicas) if replicas else None)
+    token = current_replica.set(replica)
+    try:
+        yield
+    finally:
+        current_replica.reset(token)
+
+
+def recently_changed(versions, lag):
+    """Данные менялись последние lag секунд — реплика может еще не успеть их получить."""
+    return bool(versions) and time.time_ns() - max(versions) < lag * 10**9
+
+
+class ReplicaRouter:
+    """
+    Чтение идет в реплику только внутри reading_from_replica() — его включает
+    ReplicaReadMixin для безопасных запросов к ViewSet; реплика выбирается случайно
+    один раз на блок. Все остальное, включая запись и миграции, работает с основной БД.
+    """
+    def db_for_read(self, model, **hints):
+        return current_replica.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True # Реплики содержат те же данные, что и основная БД
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == 'default'
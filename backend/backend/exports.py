@@ -0,0 +1,104 @@
+# backend/backend/exports.py
+
+import csv
+import re
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .renderers import stream_list
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'json')
+CHUNK_SIZE = 2000
+# С этих символов Excel начинает формулу в CSV: значения с публичной формы заявок
+# иначе выполнятся при открытии выгрузки (CSV/formula injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Телефоны и числа (+7 701 123-45-67, -5) формулой не станут и выгружаются как есть
+PLAIN_VALUE = re.compile(r'[+-]?[\d\s().-]+')
+
+
+class Echo:
+    """Объект с методом write для csv.writer: возвращает строку, а не пишет ее в буфер."""
+    def write(self, value):
+        return value
+
+
+def iterate(queryset, fields):
+    # iterator() на PostgreSQL использует серверный курсор: строки читаются пачками,
+    # и память не растет с размером таблицы
+    return queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+
+
+def escape_formula(value):
+    """Строка CSV, которую Excel принял бы за формулу, получает префикс ' и остается текстом."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) and not PLAIN_VALUE.fullmatch(value):
+        return "'" + value
+    return value
+
+
+def csv_stream(header, rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff' # BOM, чтобы Excel правильно открыл кириллицу
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(['' if value is None else escape_formula(value) for value in row])
+
+
+def xlsx_file(header, rows):
+    # openpyxl импортируется только здесь: он нужен лишь для выгрузки в XLSX
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True) # Строки сразу сбрасываются во временный файл
+    sheet = workbook.create_sheet()
+
+    def cell(value):
+        if hasattr(value, 'tzinfo') and value.tzinfo:
+            return timezone.make_naive(value)
+        if isinstance(value, str) and value.startswith('='):
+            # openpyxl записал бы такую строку формулой: явная текстовая ячейка хранит ее как есть
+            text = WriteOnlyCell(sheet, value=value)
+            text.data_type = 's'
+            return text
+        return value
+
+    sheet.append(header)
+    for row in rows:
+        sheet.append([cell(value) for value in row])
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def export_response(queryset, columns, filename, file_format):
+    """
+    Ответ с выгрузкой queryset. columns — список пар (поле для values_list, заголовок).
+    CSV отдается потоком с первой строки; XLSX собирается во временном файле
+    (формат требует заголовков в конце архива) и затем отдается частями.
+    JSON — поток объектов {поле: значение}, ключи — поля values_list.
+    """
+    fields = [field for field, title in columns]
+    header = [title for field, title in columns]
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    rows = iterate(queryset, fields)
+
+    if file_format == 'xlsx':
+        return FileResponse(
+            xlsx_file(header, rows),
+            as_attachment=True,
+            filename=f'{filename}-{stamp}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+
+    if file_format == 'json':
+        response = StreamingHttpResponse(
+            stream_list(dict(zip(fields, row)) for row in rows), content_type='application/json',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.json"'
+        return response
+
+    response = StreamingHttpResponse(csv_stream(header, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.csv"'
+    return response
@@ -0,0 +1,177 @@
+# backend/backend/middleware.py
+
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('backend.metrics')
+
+# Метрики текущего запроса; None, если запрос не попал в выборку
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обертка для connection.execute_wrapper: считает запросы и время в БД
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+
+def wrap_connections(stack, metrics):
+    """Ставит metrics оберткой на все соединения текущего потока до закрытия stack."""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics))
+
+
+def finish_stream(content, metrics, finish):
+    """
+    Отдает части StreamingHttpResponse и закрывает замер, когда поток дочитан
+    (или клиент отключился). Запросы, которые ленивый итератор делает во время
+    отдачи, тоже считаются.
+    """
+    with ExitStack() as stack:
+        wrap_connections(stack, metrics)
+        try:
+            yield from content
+        finally:
+            finish()
+
+
+async def afinish_stream(content, finish):
+    # Асинхронный поток: запросы идут в других потоках (sync_to_async), считаем только время
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        finish()
+
+
+class RequestMetricsMiddleware:
+    """
+    Метрики запроса: число SQL-запросов, время в БД, время сериализации,
+    общее время и имя view. Отдаются в заголовке Server-Timing и пишутся
+    JSON-строкой в лог 'backend.metrics' (ротируемый файл, см. LOGGING).
+
+    Время сериализации — рендеринг ответа DRF/TemplateResponse в байты: замер
+    ставится в process_template_response и закрывается post-render callback'ом,
+    без подмены методов сериализаторов. Для StreamingHttpResponse заголовок не
+    ставится (тело еще не отдано), а запись в лог пишется, когда поток дочитан.
+
+    Работает и в WSGI, и в ASGI: под async-цепочкой __call__ возвращает корутину.
+
+    Включается настройкой REQUEST_METRICS['ENABLED']; SAMPLE_RATE задает долю
+    запросов, которые измеряются, чтобы middleware можно было держать включенным в продакшене.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.REQUEST_METRICS
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.header = config['HEADER']
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                wrap_connections(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Соединения у каждого потока свои: обертки ставим на соединения потока,
+                # в котором sync_to_async (thread_sensitive) выполняет запросы этого запроса
+                await sync_to_async(wrap_connections)(stack, metrics)
+                response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    def process_template_response(self, request, response):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return response
+        started, db_before = time.perf_counter(), metrics.db_ms
+
+        def rendered(response):
+            # Ленивые queryset'ы, выполненные при рендеринге, уже учтены в db_ms
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics.serializer_ms += elapsed - (metrics.db_ms - db_before)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, metrics, started):
+        def record():
+            total_ms = (time.perf_counter() - started) * 1000
+            match = request.resolver_match
+            return {
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_ms, 2),
+                'serializer_ms': round(metrics.serializer_ms, 2),
+                'total_ms': round(total_ms, 2),
+            }
+
+        def log():
+            logger.info(json.dumps(record(), ensure_ascii=False))
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = afinish_stream(response.streaming_content, log)
+            else:
+                response.streaming_content = finish_stream(response.streaming_content, metrics, log)
+            return response
+
+        data = record()
+        logger.info(json.dumps(data, ensure_ascii=False))
+        if self.header:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={data["db_ms"]};desc="{metrics.queries} queries"',
+                f'serializer;dur={data["serializer_ms"]}',
+                f'total;dur={data["total_ms"]}',
+            ])
+        return response
@@ -0,0 +1,150 @@
+# backend/backend/mixins.py
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from httpcache.versions import get_versions
+from .compiled import compile_serializer
+from .database import reading_from_replica, recently_changed
+
+
+class EagerLoadingSerializerMixin:
+    """
+    Сериализатор объявляет, какие связи ему нужны для вывода:
+    - select_related_fields: FK / OneToOne, подтягиваются JOIN-ом;
+    - prefetch_related_fields: M2M и обратные связи, одним запросом на связь.
+    Тогда список любого размера сериализуется за постоянное число запросов.
+
+    Если задан query_fields, из БД читаются только колонки выводимых полей (.only()):
+    {поле сериализатора: пути полей модели}; поле, которого нет в словаре, читается
+    из одноименной колонки. Связи подтягиваются только те, что нужны выбранным полям.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    query_fields = None
+
+    @classmethod
+    def get_query_paths(cls, fields=None):
+        names = [name for name in cls.Meta.fields if fields is None or name in fields]
+        paths = set()
+        for name in names:
+            paths.update(cls.query_fields.get(name, (name,)))
+        return paths
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, extra_fields=()):
+        """fields — выводимые поля (None — все); extra_fields — колонки, нужные сверх них, например для курсора."""
+        select_related, prefetch_related = cls.select_related_fields, cls.prefetch_related_fields
+        if cls.query_fields is not None:
+            paths = cls.get_query_paths(fields) | set(extra_fields)
+            # Связь нельзя одновременно отложить и подтянуть JOIN-ом, поэтому берем только нужные
+            relations = {path.split('__')[0] for path in paths}
+            select_related = [path for path in select_related if path.split('__')[0] in relations]
+            prefetch_related = [path for path in prefetch_related if path.split('__')[0] in relations]
+            queryset = queryset.only(queryset.model._meta.pk.name, *paths)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Сериализатор принимает fields=[...] и выводит только эти поля (?fields= в запросе).
+    Неизвестные имена игнорируются.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class EagerLoadingMixin:
+    """
+    Mixin для ViewSet: применяет к queryset связи, объявленные сериализатором.
+    serializer_action_classes позволяет задать отдельный сериализатор для действия,
+    например облегченный для list; ?fields=id,title сужает вывод и колонки в SQL.
+    """
+    serializer_action_classes = {}
+
+    def get_serializer_class(self):
+        return self.serializer_action_classes.get(getattr(self, 'action', None)) or super().get_serializer_class()
+
+    def get_requested_fields(self):
+        # Только для чтения: при записи сериализатору нужны все поля
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return None
+        value = request.query_params.get('fields')
+        if not value:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            # Поля сортировки нужны пагинации для курсора, даже если их нет в выводе
+            ordering = getattr(self, 'ordering', None) or ()
+            ordering = [ordering] if isinstance(ordering, str) else ordering
+            queryset = serializer_class.setup_eager_loading(
+                queryset, fields=self.get_requested_fields(), extra_fields=[field.lstrip('-') for field in ordering],
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None and issubclass(self.get_serializer_class(), SparseFieldsSerializerMixin):
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+class CompiledListMixin:
+    """
+    Mixin для ViewSet: list отдается скомпилированным сериализатором (backend/compiled.py)
+    из строк .values() — без создания моделей и обхода полей DRF. Ответ тот же побайтно;
+    retrieve и запись идут через обычный сериализатор.
+    """
+    def get_compiled_serializer(self):
+        fields = self.get_requested_fields() if hasattr(self, 'get_requested_fields') else None
+        return compile_serializer(self.get_serializer_class(), fields)
+
+    def get_compiled_queryset(self, compiled):
+        # Поля сортировки нужны пагинации для курсора, даже если их нет в выводе
+        ordering = getattr(self, 'ordering', None) or ()
+        ordering = [ordering] if isinstance(ordering, str) else ordering
+        queryset = self.filter_queryset(self.get_queryset())
+        return compiled.values(queryset, extra_fields=[field.lstrip('-') for field in ordering])
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        queryset = self.get_compiled_queryset(compiled)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize(queryset))
+
+
+class ReplicaReadMixin:
+    """
+    Mixin для ViewSet только для чтения: GET и HEAD читают из реплик (backend.database.ReplicaRouter).
+    Сразу после изменения моделей из version_models (ConditionalGetMixin) чтение еще
+    DATABASE_REPLICA_LAG секунд идет в основную БД, чтобы не отдать и не закешировать старые данные.
+    """
+    def use_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        labels = getattr(self, 'version_models', ())
+        if not labels:
+            return True
+        versions = get_versions(labels)
+        # Без общего кеша версий не узнать, давно ли менялись данные: читаем из основной БД
+        return versions is not None and not recently_changed(versions, settings.DATABASE_REPLICA_LAG)
+
+    def dispatch(self, request, *args, **kwargs):
+        with reading_from_replica(self.use_replica(request)):
+            return super().dispatch(request, *args, **kwargs)
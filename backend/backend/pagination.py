@@ -0,0 +1,82 @@
+# backend/backend/pagination.py
+
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class OffsetPagination(LimitOffsetPagination):
+    """
+    Классическая пагинация limit/offset для админских таблиц,
+    которым нужны номера страниц и общее количество записей.
+    """
+    default_limit = 50
+    max_limit = 500
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """То же, что paginate_queryset, но запросы идут через async ORM."""
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [item async for item in queryset[self.offset:self.offset + self.limit]]
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Пагинация по курсору (keyset) для всех списков API.
+
+    - Порядок берется из атрибута `ordering` у ViewSet, затем из Meta.ordering модели.
+      Поле сортировки должно быть покрыто индексом, иначе курсор не даст выигрыша.
+    - Если у ViewSet стоит `offset_pagination = True` и клиент передал
+      `limit` или `offset`, используется режим limit/offset (OffsetPagination).
+    - apaginate_queryset — то же для async-view (backend/asyncviews.py): страница
+      курсора читается штатным CursorPagination.paginate_queryset в потоке
+      (sync_to_async), режим limit/offset — через async ORM.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-pk'
+    offset_query_params = ('limit', 'offset')
+
+    def __init__(self):
+        self.offset_paginator = None
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'ordering', None) or queryset.model._meta.ordering or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return tuple(ordering)
+
+    def use_offset(self, request, view):
+        if not getattr(view, 'offset_pagination', False):
+            return False
+        return any(param in request.query_params for param in self.offset_query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_offset(request, view):
+            self.offset_paginator = OffsetPagination()
+            ordering = self.get_ordering(request, queryset, view)
+            return self.offset_paginator.paginate_queryset(queryset.order_by(*ordering), request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.use_offset(request, view):
+            self.offset_paginator = OffsetPagination()
+            ordering = self.get_ordering(request, queryset, view)
+            return await self.offset_paginator.apaginate_queryset(queryset.order_by(*ordering), request, view)
+        # Курсоры считает сам CursorPagination; его запрос синхронный, поэтому уходит в поток
+        return await sync_to_async(super().paginate_queryset)(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -11,8 +11,9 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        # Разрешить запросы на запись только администраторам
-        return request.user and request.user.is_staff
+        # Разрешить запросы на запись только администраторам.
+        # is_staff берется из токена, пользователь из БД не загружается
+        return bool(request.user and request.user.is_staff)
 
 class IsAdmin(permissions.BasePermission):
     """
@@ -20,7 +21,7 @@ class IsAdmin(permissions.BasePermission):
     - Разрешает доступ только администраторам (is_staff=True).
     """
     def has_permission(self, request, view):
-        return request.user and request.user.is_staff
+        return bool(request.user and request.user.is_staff)
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
@@ -34,4 +35,5 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         
         # Разрешить запросы на запись только владельцу объекта
-        return obj.user == request.user
\ No newline at end of file
+        # Сравниваем ID, чтобы не загружать пользователя из БД
+        return obj.user_id == request.user.pk
\ No newline at end of file
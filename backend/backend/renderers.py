@@ -0,0 +1,79 @@
+# backend/backend/renderers.py
+#
+# JSON через orjson вместо стандартного json: рендеринг больших списков
+# (пользователи с профилями, посты с полным текстом, уроки) в несколько раз быстрее.
+# Подключаются в REST_FRAMEWORK (DEFAULT_RENDERER_CLASSES / DEFAULT_PARSER_CLASSES);
+# сравнение со стандартным JSONRenderer — `python manage.py benchmark_renderers`.
+#
+# Вывод совпадает с JSONRenderer DRF побайтно, кроме записи чисел с плавающей точкой
+# в экспоненте (1e-5 вместо 1e-05). datetime, date, time и UUID orjson пишет сам,
+# Decimal и остальные типы, которые понимает DRF (ленивые строки, timedelta,
+# QuerySet ...), — через его JSONEncoder. Отступы (?indent=, Browsable API)
+# по-прежнему рендерит стандартный JSONRenderer: orjson умеет только отступ в 2 пробела.
+
+import codecs
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+# Сколько элементов списка кодируется за раз в stream_list
+STREAM_CHUNK_SIZE = 500
+
+default = JSONEncoder().default
+
+
+def dumps(data):
+    # \u2028 и \u2029 экранируются, как в JSONRenderer: JSON остается подмножеством JavaScript
+    content = orjson.dumps(data, default=default, option=OPTIONS)
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def stream_list(items, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    JSON-массив из итератора items частями по chunk_size элементов — для StreamingHttpResponse.
+    В памяти одновременно только одна часть, первые байты уходят клиенту сразу.
+    """
+    yield b'['
+    chunk, first = [], True
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield (b'' if first else b',') + dumps(chunk)[1:-1]
+            chunk, first = [], False
+    if chunk:
+        yield (b'' if first else b',') + dumps(chunk)[1:-1]
+    yield b']'
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            # Например, целое больше 64 бит: стандартный json с ним справится
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding') or 'utf-8'
+        try:
+            content = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
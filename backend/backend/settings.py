@@ -1,6 +1,12 @@
 # backend/backend/settings.py
+import os
+from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
+from backend import database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -21,6 +27,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
     "http://10.0.0.50:5173", # <-- Убедитесь, что эта строка есть
 ]
+# Форма заявки передает Idempotency-Key (applications/intake.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:5173',
@@ -52,11 +60,18 @@ INSTALLED_APPS = [
     'applications.apps.ApplicationsConfig',
     'reviews.apps.ReviewsConfig',
     'system_settings.apps.SystemSettingsConfig', 
+    'benchmarks.apps.BenchmarksConfig',
+    'stats.apps.StatsConfig',
+    'search.apps.SearchConfig',
+    'httpcache.apps.HttpCacheConfig',
+    'jobs.apps.JobsConfig',
+    'landing.apps.LandingConfig',
 ]
 
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', # <- Добавить сюда
+    'backend.middleware.RequestMetricsMiddleware', # Выключен, пока REQUEST_METRICS['ENABLED'] = False
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,7 +81,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'backend.urls'
+# Под ASGI (backend/asgi.py) используется backend.asgi_urls с async-view для чтения
+ROOT_URLCONF = os.environ.get('DJANGO_ROOT_URLCONF', 'backend.urls')
 
 TEMPLATES = [
     {
@@ -84,20 +100,59 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# Параметры подключения, пул и реплики задаются переменными окружения DB_* (см. backend/database.py)
+DATABASES = database.databases(os.environ, BASE_DIR)
+# Безопасные запросы к ViewSet с ReplicaReadMixin читают из реплик, если они есть
+DATABASE_ROUTERS = ['backend.database.ReplicaRouter']
+DATABASE_REPLICA_LAG = float(os.environ.get('DB_REPLICA_LAG', '5'))
+
+
+# Cache
+# По умолчанию кеш в памяти процесса. Для нескольких воркеров нужен общий кеш
+# (в нем же хранятся версии моделей для ETag — httpcache.versions), например:
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'munificenschool',
-        'USER': 'schooladmin',
-        'PASSWORD': '235689qW#', # Замените на ваш пароль
-        'HOST': 'localhost', # Или адрес вашего сервера БД
-        'PORT': '5432',      # Стандартный порт PostgreSQL
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+    # Готовые JSON-ответы публичных эндпоинтов (httpcache.responses) — отдельно,
+    # чтобы объемные ответы не вытесняли из кеша версии моделей и настройки
+    'responses': {
+        'BACKEND': os.environ.get('RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('RESPONSE_CACHE_LOCATION', 'responses'),
+    },
+}
+
+# Состояние, которое должно быть одним на все воркеры: список отозванных JWT
+# (backend/authentication.py) и версии моделей для ETag (httpcache/versions.py).
+# В продакшене — Redis или Memcached: SHARED_CACHE_BACKEND, SHARED_CACHE_LOCATION.
+# Локальный кеш процесса годится только для разработки (DEBUG); без алиаса 'shared'
+# токены проверяются по БД, а условные GET и кеш ответов выключены (backend/caches.py).
+SHARED_CACHE_BACKEND = os.environ.get(
+    'SHARED_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache' if DEBUG else '',
+)
+if SHARED_CACHE_BACKEND:
+    CACHES['shared'] = {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': os.environ.get('SHARED_CACHE_LOCATION', 'shared'),
+        # Записи мало (по одной на модель и на отозванного пользователя), вытеснять их нельзя
+        'OPTIONS': {'MAX_ENTRIES': 100000},
     }
+
+RESPONSE_CACHE = {
+    'ENABLED': os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True',
+    'ALIAS': 'responses',
+    'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '300')),
+    # Защита от «эффекта толпы»: ответ строит один запрос, остальные ждут до WAIT секунд
+    'LOCK_TIMEOUT': 10,
+    'WAIT': 5,
 }
 
 
@@ -126,11 +181,122 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    # Указываем, что для аутентификации используется JWT
+    # Указываем, что для аутентификации используется JWT (без запроса к БД, см. backend/authentication.py)
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'backend.authentication.StatelessJWTAuthentication',
+    ),
+    # JSON через orjson (backend/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Все списки отдаются постранично по курсору (см. backend/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'backend.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # Лимиты публичной формы заявок (applications/throttles.py), счетчики — в кеше 'default'
+    'DEFAULT_THROTTLE_RATES': {
+        'application_ip': os.environ.get('APPLICATION_RATE_PER_IP', '20/hour'),
+        'application_phone': os.environ.get('APPLICATION_RATE_PER_PHONE', '5/hour'),
+    },
+}
+
+# Прием заявок (applications/intake.py): повторные заявки на тот же номер с тем же именем, классом
+# и предметом за DEDUP_WINDOW секунд объединяются, ответы на запросы с Idempotency-Key хранятся
+# IDEMPOTENCY_TIMEOUT секунд
+APPLICATION_INTAKE = {
+    'DEDUP_WINDOW': int(os.environ.get('APPLICATION_DEDUP_WINDOW', '3600')),
+    'IDEMPOTENCY_TIMEOUT': 24 * 60 * 60,
+    'IDEMPOTENCY_LOCK_TIMEOUT': 30,
+}
+
+# JWT: в токенах лежат role и is_staff. Срок жизни access-токена ограничивает
+# и время хранения записи об отзыве в кеше
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES', '5'))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', '1'))),
+    'TOKEN_OBTAIN_SERIALIZER': 'backend.authentication.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'backend.authentication.RoleTokenRefreshSerializer',
+}
+
+# Фоновые задачи (jobs/queue.py), воркер — `python manage.py run_jobs`
+JOBS = {
+    'BATCH_SIZE': 50,
+    # Сколько секунд задача принадлежит взявшему ее воркеру; потом ее заберет другой
+    'LEASE': 5 * 60,
+    'POLL_INTERVAL': 2,
+    # Повторы: 30 с, 1 мин, 2 мин ... но не реже раза в час
+    'BACKOFF_BASE': 30,
+    'BACKOFF_MAX': 60 * 60,
+    'KEEP_DONE_DAYS': 7,
+    # Напоминание уходит за столько секунд до начала урока; проверка — раз в REMINDER_INTERVAL
+    'CLASS_REMINDER_AHEAD': int(os.environ.get('CLASS_REMINDER_HOURS', '2')) * 60 * 60,
+    'REMINDER_INTERVAL': 60,
+}
+
+# Документ главной страницы (landing/snapshot.py): сколько записей каждого раздела выводится,
+# через сколько секунд после изменения воркер собирает документ заново и через сколько
+# секунд его соберет сам запрос, если воркер так и не успел
+LANDING = {
+    'COURSES': 50,
+    'REVIEWS': 10,
+    'TEACHERS': 50,
+    'POSTS': 6,
+    'DEBOUNCE': 2,
+    'REBUILD_AFTER': 60,
+}
+
+# Уведомления. По умолчанию письма и SMS печатаются в консоль воркера; для реальной
+# отправки EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend (EMAIL_HOST и т.д.)
+# и SMS_BACKEND — класс шлюза с методом send_messages (см. jobs/transports.py)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'info@munificentschool.kz')
+SMS_BACKEND = os.environ.get('SMS_BACKEND', 'jobs.transports.ConsoleSMSBackend')
+
+# Метрики запросов: SQL, время в БД и сериализации (backend/middleware.py)
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS_ENABLED', 'False') == 'True',
+    # Доля измеряемых запросов: 1.0 — все, 0.05 — каждый двадцатый
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '1.0')),
+    'HEADER': os.environ.get('REQUEST_METRICS_HEADER', 'True') == 'True',
+    'LOG_FILE': os.environ.get('REQUEST_METRICS_LOG_FILE', str(BASE_DIR / 'logs' / 'requests.log')),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json_line': {'format': '{"time": "%(asctime)s", "metrics": %(message)s}'},
+    },
+    'handlers': {
+        'request_metrics': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': REQUEST_METRICS['LOG_FILE'],
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'formatter': 'json_line',
+            'delay': True, # Файл открывается при первой записи
+        },
+    },
+    'loggers': {
+        'backend.metrics': {
+            'handlers': ['request_metrics'] if REQUEST_METRICS['ENABLED'] else [],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
+if REQUEST_METRICS['ENABLED']:
+    Path(REQUEST_METRICS['LOG_FILE']).parent.mkdir(parents=True, exist_ok=True)
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
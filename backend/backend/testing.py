@@ -0,0 +1,30 @@
+# backend/backend/testing.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin:
+    """
+    Помощники для тестов API, которые следят за числом SQL-запросов.
+    Используется вместе с APITestCase.
+    """
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, url, grow, budget=None, **params):
+        """
+        Проверяет, что число запросов к url не зависит от объема данных:
+        сначала запрос на текущих данных, затем grow() добавляет строки,
+        и число запросов должно остаться прежним (и не выше budget).
+        """
+        before = self.count_queries(url, **params)
+        grow()
+        after = self.count_queries(url, **params)
+        self.assertEqual(before, after, f'{url}: {before} запросов до роста данных, {after} после')
+        if budget is not None:
+            self.assertLessEqual(after, budget, f'{url}: {after} запросов при бюджете {budget}')
@@ -0,0 +1,487 @@
+import json
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, router
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.authentication import RoleTokenObtainPairSerializer, StatelessJWTAuthentication, revoke
+from backend.caches import shared_cache
+from backend.compiled import compile_serializer
+from backend.database import databases, reading_from_replica
+from backend.permissions import IsOwnerOrReadOnly
+from backend.renderers import ORJSONRenderer, dumps, stream_list
+from blog.models import Category, Post
+from blog.serializers import PostListSerializer, PostSerializer
+from courses.models import Course, Lesson
+from courses.serializers import CourseListSerializer, CourseSerializer, UpcomingLessonSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from users.models import User
+
+METRICS_ON = {'ENABLED': True, 'SAMPLE_RATE': 1.0, 'HEADER': True, 'LOG_FILE': None}
+
+
+class RequestMetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        Review.objects.create(author='Аня, 11 класс', text='Спасибо!', score_info='ЕНТ: 125', is_published=True)
+
+    @override_settings(REQUEST_METRICS=METRICS_ON)
+    def test_server_timing_header_and_log_record(self):
+        with self.assertLogs('backend.metrics', level='INFO') as logs:
+            response = self.client.get(reverse('review-list'))
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'review-list')
+        self.assertEqual(record['queries'], 1)
+        self.assertGreater(record['total_ms'], 0)
+
+    @override_settings(REQUEST_METRICS=METRICS_ON)
+    def test_async_chain_is_measured(self):
+        with self.assertLogs('backend.metrics', level='INFO') as logs:
+            response = async_to_sync(self.async_client.get)(reverse('review-list'))
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 1)
+
+    @override_settings(REQUEST_METRICS=METRICS_ON)
+    def test_streaming_response_is_logged_when_body_is_sent(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        with self.assertLogs('backend.metrics', level='INFO') as logs:
+            response = self.client.get(reverse('application-export'))
+            self.assertEqual(logs.records, [])
+            b''.join(response.streaming_content)
+        self.assertNotIn('Server-Timing', response)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'application-export')
+        self.assertGreaterEqual(record['queries'], 1) # Строки читаются, пока поток отдается
+
+    @override_settings(REQUEST_METRICS={**METRICS_ON, 'SAMPLE_RATE': 0.0})
+    def test_unsampled_request_is_not_measured(self):
+        response = self.client.get(reverse('review-list'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse('review-list'))
+        self.assertNotIn('Server-Timing', response)
+
+
+class ORJSONRendererTests(APITestCase):
+    def test_output_matches_drf_renderer(self):
+        data = {
+            'price': Decimal('1500.50'),
+            'utc': datetime(2025, 9, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'almaty': datetime(2025, 9, 1, 14, 30, tzinfo=dt_timezone(timedelta(hours=5))),
+            'naive': datetime(2025, 9, 1, 9, 30),
+            'day': date(2025, 9, 1),
+            'time': time(18, 30, 0, 500),
+            'duration': timedelta(minutes=90),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Курс'),
+            'js': 'строка\u2028с разделителем\u2029',
+            1: [None, True, 2, 'три'],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        self.assertEqual(ORJSONRenderer().render({'big': 2 ** 70}), b'{"big":1180591620717411303424}')
+        # С отступом — как у стандартного рендерера
+        indented = ORJSONRenderer().render(data, 'application/json; indent=4')
+        self.assertEqual(indented, JSONRenderer().render(data, 'application/json; indent=4'))
+
+    def test_stream_list(self):
+        items = [{'n': n, 'price': Decimal(n)} for n in range(7)]
+        for chunk_size in (1, 3, 7, 10):
+            self.assertEqual(b''.join(stream_list(iter(items), chunk_size)), dumps(items))
+        self.assertEqual(b''.join(stream_list([])), b'[]')
+
+    def test_api_renders_and_parses_json(self):
+        response = self.client.post(reverse('token_obtain_pair'), '{"username": "нет", "password": "x"}',
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(reverse('token_obtain_pair'), '{"username": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', response.json()['detail'])
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True, role='admin')
+
+    def obtain(self, username='admin', password='pass'):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': username, 'password': password})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get_as(self, access, url):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.get(url)
+
+    def user_queries(self, captured):
+        return [query['sql'] for query in captured.captured_queries if 'users_user' in query['sql']]
+
+    def test_token_carries_role_claims(self):
+        token = AccessToken(self.obtain()['access'])
+        self.assertEqual(token['role'], 'admin')
+        self.assertTrue(token['is_staff'])
+
+    def test_admin_endpoint_does_not_load_user(self):
+        access = self.obtain()['access']
+        with CaptureQueriesContext(connection) as captured:
+            response = self.get_as(access, reverse('application-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.user_queries(captured), [])
+
+    def test_user_is_loaded_lazily_when_view_needs_it(self):
+        access = self.obtain()['access']
+        with CaptureQueriesContext(connection) as captured:
+            response = self.get_as(access, reverse('current-user'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'admin')
+        self.assertEqual(len(self.user_queries(captured)), 1)
+
+    def test_non_staff_token_is_forbidden_on_admin_endpoint(self):
+        User.objects.create_user(username='student', password='pass')
+        response = self.get_as(self.obtain('student')['access'], reverse('application-list'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_deactivation_revokes_issued_tokens(self):
+        access = self.obtain()['access']
+        self.admin.is_active = False
+        self.admin.save()
+        response = self.get_as(access, reverse('application-list'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_last_login_update_does_not_revoke(self):
+        access = self.obtain()['access']
+        self.admin.save(update_fields=['last_login'])
+        self.assertEqual(self.get_as(access, reverse('application-list')).status_code, 200)
+
+    def test_refresh_picks_up_new_role(self):
+        tokens = self.obtain()
+        User.objects.filter(pk=self.admin.pk).update(is_staff=False, role='teacher')
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 200)
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['role'], 'teacher')
+        self.assertFalse(token['is_staff'])
+
+    def test_refresh_rejected_for_inactive_user(self):
+        tokens = self.obtain()
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_user_id_matches_primary_key(self):
+        access = AccessToken(self.obtain()['access'])
+        user = StatelessJWTAuthentication().get_user(access)
+        self.assertEqual(user.pk, self.admin.pk)
+        self.assertIsInstance(user.pk, int)
+        request = SimpleNamespace(method='PATCH', user=user)
+        owned, foreign = SimpleNamespace(user_id=self.admin.pk), SimpleNamespace(user_id=self.admin.pk + 1)
+        self.assertTrue(IsOwnerOrReadOnly().has_object_permission(request, None, owned))
+        self.assertFalse(IsOwnerOrReadOnly().has_object_permission(request, None, foreign))
+
+    def test_revocations_live_in_shared_cache(self):
+        access = self.obtain()['access']
+        User.objects.filter(pk=self.admin.pk).update(is_active=False) # В обход сигналов
+        revoke(self.admin.pk)
+        cache.clear() # Кеш по умолчанию на отзыв не влияет
+        self.assertEqual(self.get_as(access, reverse('application-list')).status_code, 401)
+
+    def test_without_shared_cache_user_is_loaded_from_database(self):
+        access = self.obtain()['access']
+        caches = {alias: config for alias, config in settings.CACHES.items() if alias != 'shared'}
+        with override_settings(CACHES=caches):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.get_as(access, reverse('application-list'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(self.user_queries(captured)), 1)
+            # Деактивация видна сразу, без списка отзыва
+            User.objects.filter(pk=self.admin.pk).update(is_active=False)
+            self.assertEqual(self.get_as(access, reverse('application-list')).status_code, 401)
+
+    def test_token_without_claims_falls_back_to_database(self):
+        access = AccessToken.for_user(self.admin)
+        self.assertNotIn('role', access)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.get_as(str(access), reverse('application-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.user_queries(captured)), 1)
+
+
+def access_for(user):
+    return str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+
+
+ASGI_URLS = override_settings(ROOT_URLCONF='backend.asgi_urls')
+NO_RESPONSE_CACHE = {'ENABLED': False, 'ALIAS': 'responses', 'TIMEOUT': 300, 'LOCK_TIMEOUT': 10, 'WAIT': 5}
+
+
+class AsyncReadPathTests(APITestCase):
+    """Async-view из backend/asgi_urls.py отдают те же ответы, что и DRF-view из backend/urls.py."""
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        teacher = User.objects.create_user(username='teacher', first_name='Анна', last_name='Ли', role='teacher')
+        self.student = User.objects.create_user(username='student', role='student')
+        self.courses = [
+            Course.objects.create(title=f'Курс {i}', subject='Математика', price=1000, teacher=teacher)
+            for i in range(3)
+        ]
+        self.student.profile.enrolled_courses.add(*self.courses)
+        start = timezone.now() + timedelta(days=1)
+        for i, course in enumerate(self.courses):
+            Lesson.objects.create(course=course, title=f'Урок {i}', start=start + timedelta(hours=i),
+                                  end=start + timedelta(hours=i, minutes=90))
+        category = Category.objects.create(name='Новости', slug='news')
+        self.post = Post.objects.create(title='Пост', content='Текст', author=teacher, category=category)
+        self.review = Review.objects.create(author='Аня', text='Спасибо!', score_info='ЕНТ: 125', is_published=True)
+        self.teacher = teacher
+        self.token = access_for(self.student)
+
+    def urls(self):
+        return [
+            reverse('course-list'), reverse('course-list') + '?page_size=2',
+            reverse('course-detail', kwargs={'pk': self.courses[0].pk}),
+            reverse('course-detail', kwargs={'pk': 0}),
+            reverse('post-list'), reverse('post-detail', kwargs={'pk': self.post.pk}),
+            reverse('review-list'), reverse('review-detail', kwargs={'pk': self.review.pk}),
+            reverse('public-teacher-list'), reverse('public-teacher-detail', kwargs={'pk': self.teacher.pk}),
+            reverse('my-courses'), reverse('upcoming-lessons'), reverse('upcoming-lessons') + '?days=x',
+        ]
+
+    def async_get(self, url, **headers):
+        with ASGI_URLS:
+            return async_to_sync(self.async_client.get)(url, headers=headers)
+
+    def test_hot_endpoints_are_async(self):
+        for url in self.urls():
+            self.assertTrue(iscoroutinefunction(resolve(url.split('?')[0], urlconf='backend.asgi_urls').func), url)
+
+    @override_settings(RESPONSE_CACHE=NO_RESPONSE_CACHE)
+    def test_same_responses_as_sync_views(self):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        for url in self.urls():
+            with self.subTest(url=url):
+                expected = self.client.get(url, headers=headers)
+                response = self.async_get(url, **headers)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+
+    def test_next_page_by_cursor(self):
+        first = json.loads(self.async_get(reverse('course-list') + '?page_size=2').content)
+        second = json.loads(self.async_get(first['next']).content)
+        ids = [item['id'] for item in first['results'] + second['results']]
+        self.assertEqual(ids, [course.pk for course in self.courses])
+
+    def test_conditional_get_and_response_cache(self):
+        url = reverse('post-list')
+        first = self.async_get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(self.async_get(url)['X-Cache'], 'HIT')
+        self.assertEqual(self.async_get(url, **{'If-None-Match': first['ETag']}).status_code, 304)
+
+    def test_token_without_claims_is_checked_in_thread(self):
+        token = AccessToken.for_user(self.student)
+        response = self.async_get(reverse('my-courses'), Authorization=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)), 3)
+
+    def test_initial_runs_outside_event_loop(self):
+        threads = []
+        original = APIView.initial
+
+        def initial(view, request, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return original(view, request, *args, **kwargs)
+
+        with mock.patch.object(APIView, 'initial', initial):
+            self.assertEqual(self.async_get(reverse('upcoming-lessons'), Authorization=f'Bearer {self.token}').status_code, 200)
+        self.assertEqual(threads, [threading.main_thread()]) # async_to_sync: цикл событий в другом потоке
+
+    def test_anonymous_is_rejected_on_private_endpoints(self):
+        self.assertEqual(self.async_get(reverse('my-courses')).status_code, 401)
+
+    def test_writes_go_to_sync_view(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        token = access_for(admin)
+        with ASGI_URLS:
+            response = async_to_sync(self.async_client.post)(
+                reverse('course-list'), {'title': 'Новый', 'subject': 'Физика', 'price': 500},
+                content_type='application/json', headers={'Authorization': f'Bearer {token}'},
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Course.objects.filter(title='Новый').exists())
+
+
+class CompiledSerializerTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        teacher = User.objects.create_user(username='teacher', first_name='Анна', last_name='Ли', role='teacher')
+        self.courses = [
+            Course.objects.create(title='Алгебра', subject='Математика', price='1500.50', teacher=teacher),
+            Course.objects.create(title='Без преподавателя', subject='Физика', price=1000),
+        ]
+        teacher.profile.enrolled_courses.add(*self.courses)
+        category = Category.objects.create(name='Новости', slug='news')
+        Post.objects.create(title='Пост', content='Текст', author=teacher, category=category)
+        Post.objects.create(title='Без категории', content='Текст', excerpt='Кратко', author=teacher)
+        Review.objects.create(author='Аня', text='Спасибо!', score_info='ЕНТ: 125', is_published=True)
+
+    def test_same_output_as_drf_serializers(self):
+        cases = [
+            (CourseSerializer, Course.objects.order_by('id')),
+            (CourseListSerializer, Course.objects.order_by('id')),
+            (PostSerializer, Post.objects.order_by('-created_at')),
+            (PostListSerializer, Post.objects.order_by('-created_at')),
+            (ReviewSerializer, Review.objects.order_by('-id')),
+        ]
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                compiled = compile_serializer(serializer_class)
+                expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+                self.assertEqual(JSONRenderer().render(compiled.serialize(compiled.values(queryset))), expected)
+
+        posts = compile_serializer(PostListSerializer).serialize(
+            compile_serializer(PostListSerializer).values(Post.objects.order_by('id'))
+        )
+        self.assertNotIn('category_name', posts[1]) # Как у DRF: у поста без категории ключа нет
+        compiled = compile_serializer(CourseSerializer)
+        self.assertEqual(compiled.serialize(compiled.values(Course.objects.order_by('id')))[0]['teacher_details']
+                         ['profile']['enrolled_courses'], [course.pk for course in self.courses])
+
+    def test_unsupported_fields_fail_at_compile_time(self):
+        with self.assertRaises(ImproperlyConfigured):
+            compile_serializer(UpcomingLessonSerializer) # SerializerMethodField
+
+    @override_settings(RESPONSE_CACHE=NO_RESPONSE_CACHE)
+    def test_list_endpoints(self):
+        compiled = compile_serializer(CourseListSerializer, ['id', 'title', 'nonexistent'])
+        self.assertEqual(compiled.paths, ['id', 'title'])
+
+        response = self.client.get(reverse('course-list'), {'fields': 'id,title', 'page_size': 1})
+        self.assertEqual(response.json()['results'], [{'id': self.courses[0].pk, 'title': 'Алгебра'}])
+        response = self.client.get(response.json()['next'])
+        self.assertEqual(response.json()['results'], [{'id': self.courses[1].pk, 'title': 'Без преподавателя'}])
+
+        with self.assertNumQueries(1):
+            titles = [post['title'] for post in self.client.get(reverse('post-list')).json()['results']]
+        self.assertEqual(titles, ['Без категории', 'Пост'])
+
+
+class DatabaseSettingsTests(TestCase):
+    def test_persistent_connections_by_default(self):
+        config = databases({}, Path('/app'))
+        self.assertEqual(list(config), ['default'])
+        self.assertEqual(config['default']['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['default']['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['default']['CONN_HEALTH_CHECKS'])
+
+    def test_no_persistent_connections_under_asgi(self):
+        self.assertEqual(databases({'DJANGO_ASGI': 'True'}, Path('/app'))['default']['CONN_MAX_AGE'], 0)
+        config = databases({'DJANGO_ASGI': 'True', 'DB_CONN_MAX_AGE': '30'}, Path('/app'))
+        self.assertEqual(config['default']['CONN_MAX_AGE'], 30)
+
+    def test_pool_replaces_persistent_connections(self):
+        config = databases({'DB_POOL': 'True', 'DB_POOL_MAX_SIZE': '20', 'DB_CONN_HEALTH_CHECKS': 'False'}, Path('/app'))
+        default = config['default']
+        self.assertEqual(default['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10})
+        self.assertEqual(default['CONN_MAX_AGE'], 0)
+
+    def test_replicas_inherit_primary_settings(self):
+        config = databases({'DB_HOST': 'primary', 'DB_REPLICAS': 'r1, r2:6432'}, Path('/app'))
+        self.assertEqual(list(config), ['default', 'replica1', 'replica2'])
+        self.assertEqual((config['replica1']['HOST'], config['replica1']['PORT']), ('r1', '5432'))
+        self.assertEqual((config['replica2']['HOST'], config['replica2']['PORT']), ('r2', '6432'))
+        self.assertEqual(config['replica2']['NAME'], config['default']['NAME'])
+        self.assertEqual(config['replica1']['TEST'], {'MIRROR': 'default'})
+
+    def test_sqlite_replica_is_a_file(self):
+        config = databases({'DB_ENGINE': 'django.db.backends.sqlite3', 'DB_REPLICAS': 'replica.sqlite3'}, Path('/app'))
+        self.assertEqual(config['default']['NAME'], '/app/db.sqlite3')
+        self.assertEqual(config['replica1']['NAME'], 'replica.sqlite3')
+
+
+REPLICA_DATABASES = databases({'DB_ENGINE': 'django.db.backends.sqlite3', 'DB_REPLICAS': 'replica.sqlite3'}, Path('/app'))
+
+
+class ReplicaRouterTests(APITestCase):
+    def test_reads_go_to_replica_only_when_enabled(self):
+        with override_settings(DATABASES=REPLICA_DATABASES):
+            self.assertEqual(router.db_for_read(Post), 'default')
+            with reading_from_replica():
+                self.assertEqual(router.db_for_read(Post), 'replica1')
+                self.assertEqual(router.db_for_write(Post), 'default')
+            self.assertFalse(router.allow_migrate('replica1', 'blog'))
+
+    def test_one_replica_per_block(self):
+        databases = {**REPLICA_DATABASES, 'replica2': REPLICA_DATABASES['replica1']}
+        with override_settings(DATABASES=databases):
+            for _ in range(5):
+                with reading_from_replica():
+                    chosen = router.db_for_read(Post)
+                    self.assertEqual({router.db_for_read(Post) for _ in range(20)}, {chosen})
+                    with reading_from_replica():
+                        self.assertEqual(router.db_for_read(Post), chosen)
+                    with reading_from_replica(False):
+                        self.assertEqual(router.db_for_read(Post), 'default')
+
+    def test_without_replicas_everything_reads_primary(self):
+        with override_settings(DATABASES={'default': REPLICA_DATABASES['default']}), reading_from_replica():
+            self.assertEqual(router.db_for_read(Post), 'default')
+
+
+HAS_REPLICA = 'replica1' in connections
+
+
+@skipUnless(HAS_REPLICA, 'Нужна реплика: DB_REPLICAS=replica.sqlite3')
+class ReplicaReadViewSetTests(APITransactionTestCase):
+    """
+    Запускаются с двумя SQLite: DB_ENGINE=django.db.backends.sqlite3 DB_REPLICAS=replica.sqlite3.
+    Реплика — отдельное соединение к той же тестовой БД, поэтому данные должны быть закоммичены.
+    """
+    databases = {'default', 'replica1'} if HAS_REPLICA else {'default'}
+
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        Review.objects.create(author='Аня', text='Спасибо!', score_info='ЕНТ: 125', is_published=True)
+
+    def queries(self, alias, url):
+        with CaptureQueriesContext(connections[alias]) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def test_read_only_viewset_reads_replica(self):
+        with override_settings(DATABASE_REPLICA_LAG=0):
+            self.assertEqual(self.queries('default', reverse('review-list')), 0)
+            self.assertEqual(self.queries('replica1', reverse('review-list') + '?page_size=1'), 1)
+
+    def test_recent_change_reads_primary(self):
+        self.assertEqual(self.queries('replica1', reverse('review-list')), 0)
+
+    def test_other_viewsets_read_primary(self):
+        self.assertEqual(self.queries('replica1', reverse('course-list')), 0)
@@ -0,0 +1,47 @@
+# backend/backend/throttling.py
+#
+# Ограничение частоты запросов на счетчиках в кеше. Стандартный SimpleRateThrottle
+# хранит список времен всех запросов и перезаписывает его целиком (get + set): это
+# медленно при большом лимите и теряет запросы при гонке воркеров. Здесь на каждое
+# окно один счетчик, который увеличивается атомарно (cache.incr — INCR в Redis).
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CounterRateThrottle(SimpleRateThrottle):
+    """
+    Фиксированное окно длиной в период лимита ('5/hour' — окно в час).
+    На стыке окон клиент может успеть сделать до двух лимитов подряд —
+    плата за один запрос к кешу вместо списка времен.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_rate(self):
+        # Лимиты читаются из настроек при каждом запросе, а не при импорте класса
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"Не задан лимит для scope '{self.scope}' в DEFAULT_THROTTLE_RATES")
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        window = int(self.timer()) // self.duration
+        self.window_ends = (window + 1) * self.duration
+        key = f'{self.key}:{window}'
+        self.cache.add(key, 0, timeout=self.duration)
+        try:
+            count = self.cache.incr(key)
+        except ValueError: # Счетчик истек между add и incr
+            self.cache.add(key, 1, timeout=self.duration)
+            count = 1
+        return count <= self.num_requests
+
+    def wait(self):
+        return max(0, self.window_ends - self.timer())
@@ -32,5 +32,8 @@ urlpatterns = [
     path('api/', include('users.custom_urls')),
     path('api/', include('courses.nested_urls')),
     path('api/', include('courses.custom_urls')), # <--- ДОБАВЛЕНО
+    path('api/settings/', include('system_settings.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/landing/', include('landing.urls')),
     path('api/', include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,91 @@
+# backend/benchmarks/explain.py
+#
+# Планы запросов эндпоинтов API. Каждый эндпоинт из runner.ENDPOINTS вызывается
+# один раз, для каждого его SELECT выполняется EXPLAIN, и в отчет попадают таблицы,
+# которые СУБД читает полным проходом (Seq Scan в PostgreSQL, SCAN без индекса в SQLite).
+# На маленькой таблице полный проход дешевле индекса, поэтому запускать имеет смысл
+# на данных из benchmarks/seed.py, а таблицы-справочники можно исключить (ignore).
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .runner import ENDPOINTS, load_fixtures, make_call, unthrottled
+
+# Справочники и агрегаты по курсам из нескольких строк: полный проход по ним нормален
+SMALL_TABLES = {
+    'blog_category', 'system_settings_systemsettings', 'stats_counter', 'stats_courseenrollmentstat',
+    'django_content_type',
+}
+
+PG_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+# SCAN без индекса; поиск по FTS5 (VIRTUAL TABLE) идет по собственному индексу таблицы.
+# Проход по rowid в порядке первичного ключа с LIMIT (keyset-пагинация) SQLite тоже
+# показывает как SCAN — такие строки в отчете надо сверять с ORDER BY запроса
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)\b(?! USING| VIRTUAL TABLE)')
+
+
+def explain(sql):
+    """Строки плана запроса."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute('EXPLAIN ' + sql)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def seq_scans(plan):
+    """Таблицы, которые план читает полным проходом."""
+    pattern = SQLITE_SCAN if connection.vendor == 'sqlite' else PG_SEQ_SCAN
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return tables
+
+
+def analyze():
+    # Статистика для планировщика: без нее PostgreSQL оценивает таблицы как пустые
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def explain_endpoint(spec, fixtures, ignore=SMALL_TABLES):
+    url, call = make_call(spec, fixtures)
+    with CaptureQueriesContext(connection) as ctx:
+        call()
+    queries = []
+    for query in ctx.captured_queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        try:
+            plan = explain(sql)
+        except Exception as exc: # SQL из лога с подставленными параметрами не всегда исполним
+            queries.append({'sql': sql, 'error': str(exc), 'seq_scans': []})
+            continue
+        scans = [table for table in seq_scans(plan) if table not in ignore]
+        queries.append({'sql': sql, 'plan': plan, 'seq_scans': scans})
+    return {
+        'method': spec['method'].upper(),
+        'path': url,
+        'queries': queries,
+        'seq_scans': sorted({table for query in queries for table in query['seq_scans']}),
+    }
+
+
+def run(ignore=SMALL_TABLES):
+    """Планы всех эндпоинтов: {label: {'method', 'path', 'queries', 'seq_scans'}}."""
+    analyze()
+    fixtures = load_fixtures()
+    # Готовый ответ из кеша (httpcache) не обращается к БД, а нужны именно запросы
+    with override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False}), unthrottled():
+        return {
+            spec.get('label', spec['name']): explain_endpoint(spec, fixtures, ignore)
+            for spec in ENDPOINTS
+        }
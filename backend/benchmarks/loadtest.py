@@ -0,0 +1,244 @@
+# backend/benchmarks/loadtest.py
+#
+# Нагрузочный тест путей чтения. Одни и те же GET-запросы подаются прямо в обработчики Django
+# (сервер не нужен) в трех режимах:
+# - wsgi: backend.wsgi, DRF-view, пул из `threads` потоков — как gunicorn --threads;
+# - asgi-sync: ASGI-обработчик с DRF-view из backend/urls.py;
+# - asgi: ASGI-обработчик с async-view из backend/asgi_urls.py, один цикл событий.
+# Клиенты работают по замкнутому циклу: каждый шлет следующий запрос после ответа на предыдущий,
+# время ответа включает ожидание свободного потока сервера.
+# db_latency добавляет задержку к каждому SQL-запросу — как сетевой RTT до PostgreSQL,
+# client_latency — время, за которое медленный клиент (мобильная сеть) забирает ответ:
+# WSGI-поток все это время занят отправкой, а ASGI ждет клиента без потока.
+
+import asyncio
+import io
+import itertools
+import sys
+import threading
+import time
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import reverse
+
+from backend.authentication import RoleTokenObtainPairSerializer
+from .runner import load_fixtures, percentile
+
+MODES = ('wsgi', 'asgi-sync', 'asgi')
+URLCONFS = {'wsgi': 'backend.urls', 'asgi-sync': 'backend.urls', 'asgi': 'backend.asgi_urls'}
+
+# Эндпоинты, которые обслуживает async-путь: имя URL и kwargs для reverse()
+LOAD_ENDPOINTS = [
+    ('course-list', lambda f: {}),
+    ('course-detail', lambda f: {'pk': f['course'].pk}),
+    ('post-list', lambda f: {}),
+    ('post-detail', lambda f: {'pk': f['post'].pk}),
+    ('review-list', lambda f: {}),
+    ('public-teacher-list', lambda f: {}),
+    ('my-courses', lambda f: {}),
+    ('upcoming-lessons', lambda f: {}),
+]
+
+
+class DatabaseLatency:
+    """Обертка для connection.execute_wrapper: спит перед каждым запросом."""
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def add(self, connection, **kwargs):
+        connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        if self.seconds:
+            # Соединения создаются в потоках обработчиков, поэтому обертка ставится и на новые
+            connection_created.connect(self.add)
+            for connection in connections.all(initialized_only=True):
+                self.add(connection)
+        return self
+
+    def __exit__(self, *exc):
+        connection_created.disconnect(self.add)
+        for connection in connections.all(initialized_only=True):
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+class ThreadCounter:
+    """Сколько потоков процесс запустил во время прогона (ASGI выполняет sync-код в потоках)."""
+    def __init__(self):
+        self.peak = 0
+        self.running = False
+
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.005)
+
+    def __enter__(self):
+        self.baseline = threading.active_count()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+
+    @property
+    def extra(self):
+        return max(0, self.peak - self.baseline - 1) # Без самого счетчика
+
+
+def split(url):
+    path, _, query = url.partition('?')
+    return path, query
+
+
+def wsgi_environ(url, headers):
+    path, query = split(url)
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1', 'wsgi.input': io.BytesIO(b''), 'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http', 'wsgi.version': (1, 0),
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    for name, value in headers.items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    return environ
+
+
+def run_wsgi(urls, headers, clients, total, threads, client_latency):
+    handler = WSGIHandler()
+    server = threading.BoundedSemaphore(threads)
+    queue = iter(itertools.islice(itertools.cycle(urls), total))
+    lock = threading.Lock()
+    timings, errors = [], []
+
+    def client():
+        while True:
+            with lock:
+                url = next(queue, None)
+            if url is None:
+                return
+            started = time.perf_counter()
+            with server: # Ждем свободный поток сервера
+                status = []
+                body = handler(wsgi_environ(url, headers), lambda s, h, exc_info=None: status.append(s))
+                b''.join(body)
+                body.close()
+                time.sleep(client_latency) # Поток отдает ответ медленному клиенту
+            timings.append((time.perf_counter() - started) * 1000)
+            if not status[0].startswith('200'):
+                errors.append(status[0])
+
+    workers = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return timings, errors, time.perf_counter() - started, min(threads, clients)
+
+
+async def asgi_get(app, url, headers, client_latency):
+    path, query = split(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+        'headers': [(b'host', b'testserver')] + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    disconnect = asyncio.Event()
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnect.wait() # Клиент не отключается, пока не получит ответ
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            await asyncio.sleep(client_latency)
+
+    await app(scope, receive, send)
+    disconnect.set()
+    return status[0]
+
+
+async def run_asgi_clients(urls, headers, clients, total, client_latency):
+    app = ASGIHandler()
+    queue = iter(itertools.islice(itertools.cycle(urls), total))
+    timings, errors = [], []
+
+    async def client():
+        for url in queue:
+            started = time.perf_counter()
+            status = await asgi_get(app, url, headers, client_latency)
+            timings.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors.append(status)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return timings, errors, time.perf_counter() - started
+
+
+def run_asgi(urls, headers, clients, total, client_latency):
+    with ThreadCounter() as counter:
+        timings, errors, elapsed = asyncio.run(run_asgi_clients(urls, headers, clients, total, client_latency))
+    return timings, errors, elapsed, counter.extra
+
+
+def run(modes=MODES, clients=50, total=500, threads=8, db_latency_ms=0.0, client_latency_ms=0.0):
+    """Прогоняет LOAD_ENDPOINTS в каждом режиме и возвращает отчет в виде словаря."""
+    fixtures = load_fixtures()
+    token = RoleTokenObtainPairSerializer.get_token(fixtures['student']).access_token
+    # От имени ученика: my-courses и upcoming-lessons требуют входа, а публичные
+    # списки так не попадают в кеш готовых ответов и каждый раз читают БД
+    headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+
+    results = {}
+    for mode in modes:
+        with override_settings(ROOT_URLCONF=URLCONFS[mode]):
+            urls = [reverse(name, kwargs=kwargs(fixtures)) for name, kwargs in LOAD_ENDPOINTS]
+            with DatabaseLatency(db_latency_ms / 1000):
+                if mode == 'wsgi':
+                    timings, errors, elapsed, server_threads = run_wsgi(
+                        urls, headers, clients, total, threads, client_latency_ms / 1000,
+                    )
+                else:
+                    timings, errors, elapsed, server_threads = run_asgi(
+                        urls, headers, clients, total, client_latency_ms / 1000,
+                    )
+        results[mode] = {
+            'requests': len(timings),
+            'errors': len(errors),
+            'rps': round(len(timings) / elapsed, 1),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'max_ms': round(max(timings), 2),
+            'server_threads': server_threads,
+        }
+    return {
+        'meta': {
+            'clients': clients, 'requests': total, 'wsgi_threads': threads, 'db_latency_ms': db_latency_ms,
+            'client_latency_ms': client_latency_ms,
+            'database': connections['default'].vendor,
+            'endpoints': [name for name, kwargs in LOAD_ENDPOINTS],
+        },
+        'modes': results,
+    }
@@ -0,0 +1,70 @@
+# backend/benchmarks/management/commands/benchmark_api.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from users.models import User
+from benchmarks import runner, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет отдельную тестовую БД реалистичным объемом данных, прогоняет все эндпоинты API '
+        'и пишет отчет (запросы, p50/p95, пиковая память) в JSON. Работает с SQLite и PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Множитель объемов из benchmarks/seed.py')
+        parser.add_argument('--repeat', type=int, default=20, help='Сколько раз вызывать каждый эндпоинт')
+        parser.add_argument('--output', default='benchmark_report.json', help='Куда записать отчет')
+        parser.add_argument('--baseline', help='Отчет, с которым сравнивать результат')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Допустимое ухудшение p95 (0.2 = 20%%)')
+        parser.add_argument('--update-baseline', action='store_true', help='Записать отчет в файл --baseline')
+        parser.add_argument('--keepdb', action='store_true', help='Не удалять тестовую БД, чтобы не заполнять ее заново')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=options['verbosity'], keepdb=options['keepdb'])
+        try:
+            report = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=options['verbosity'], keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        Path(options['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        self.stdout.write(f"Отчет записан в {options['output']}")
+
+        baseline = options['baseline']
+        if not baseline:
+            return
+        if options['update_baseline']:
+            Path(baseline).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Baseline обновлен: {baseline}'))
+            return
+
+        regressions = runner.compare(report, json.loads(Path(baseline).read_text()), options['tolerance'])
+        if regressions:
+            raise CommandError('Регрессии относительно baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий относительно baseline нет.'))
+
+    def run_benchmark(self, options):
+        if User.objects.filter(username__startswith='bench').exists():
+            self.stdout.write('Данные уже есть в тестовой БД, заполнение пропущено.')
+            counts = None
+        else:
+            self.stdout.write(f"Заполнение БД (scale={options['scale']})...")
+            counts = seed.seed(scale=options['scale'])
+            self.stdout.write(f'Создано: {counts}')
+
+        report = runner.run(repeat=options['repeat'], scale=options['scale'], counts=counts)
+        for label, result in report['endpoints'].items():
+            self.stdout.write(
+                f"{result['method']:5} {label:28} {result['status']}  запросов: {result['queries']:3}  "
+                f"p50: {result['p50_ms']:8.2f} мс  p95: {result['p95_ms']:8.2f} мс  память: {result['peak_kb']:9.1f} КБ"
+            )
+        return report
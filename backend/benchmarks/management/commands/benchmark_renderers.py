@@ -0,0 +1,53 @@
+# backend/benchmarks/management/commands/benchmark_renderers.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from users.models import User
+from benchmarks import rendering, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет отдельную тестовую БД и сравнивает время рендеринга больших списков '
+        'стандартным JSONRenderer DRF и ORJSONRenderer (backend/renderers.py).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.1, help='Множитель объемов из benchmarks/seed.py')
+        parser.add_argument('--limit', type=int, default=1000, help='Сколько объектов в каждом списке')
+        parser.add_argument('--repeat', type=int, default=20, help='Сколько раз рендерить каждый список')
+        parser.add_argument('--output', help='Записать отчет в JSON')
+        parser.add_argument('--keepdb', action='store_true', help='Не удалять тестовую БД, чтобы не заполнять ее заново')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=options['verbosity'], keepdb=options['keepdb'])
+        try:
+            if not User.objects.filter(username__startswith='bench').exists():
+                self.stdout.write(f"Заполнение БД (scale={options['scale']})...")
+                seed.seed(scale=options['scale'])
+            report = rendering.run(limit=options['limit'], repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=options['verbosity'], keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        for name, result in report.items():
+            line = (
+                f"{name:8} {result['items']:5} шт. {result['bytes'] / 1024:8.1f} КБ  "
+                f"drf p50 {result['drf_p50_ms']:8.3f} мс  orjson p50 {result['orjson_p50_ms']:8.3f} мс  "
+                f"x{result['speedup']}"
+            )
+            if result['identical']:
+                self.stdout.write(line)
+            else:
+                self.stdout.write(self.style.WARNING(f'{line}  вывод отличается'))
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+            self.stdout.write(f"Отчет записан в {options['output']}")
@@ -0,0 +1,58 @@
+# backend/benchmarks/management/commands/explain_endpoints.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from users.models import User
+from benchmarks import explain, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет отдельную тестовую БД, вызывает каждый эндпоинт API, выполняет EXPLAIN '
+        'для его SELECT-запросов и показывает таблицы, которые читаются полным проходом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.1, help='Множитель объемов из benchmarks/seed.py')
+        parser.add_argument('--ignore', default=','.join(sorted(explain.SMALL_TABLES)),
+                            help='Таблицы через запятую, полный проход по которым не считается проблемой')
+        parser.add_argument('--output', help='Записать планы всех запросов в JSON')
+        parser.add_argument('--strict', action='store_true', help='Завершиться с ошибкой, если найден полный проход')
+        parser.add_argument('--keepdb', action='store_true', help='Не удалять тестовую БД, чтобы не заполнять ее заново')
+
+    def handle(self, *args, **options):
+        ignore = {table.strip() for table in options['ignore'].split(',') if table.strip()}
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=options['verbosity'], keepdb=options['keepdb'])
+        try:
+            if not User.objects.filter(username__startswith='bench').exists():
+                self.stdout.write(f"Заполнение БД (scale={options['scale']})...")
+                seed.seed(scale=options['scale'])
+            report = explain.run(ignore=ignore)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=options['verbosity'], keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        flagged = []
+        for label, result in report.items():
+            line = f"{result['method']:5} {label:28} запросов: {len(result['queries']):3}"
+            if result['seq_scans']:
+                flagged.append(label)
+                self.stdout.write(self.style.WARNING(f"{line}  полный проход: {', '.join(result['seq_scans'])}"))
+            else:
+                self.stdout.write(line)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+            self.stdout.write(f"Отчет записан в {options['output']}")
+
+        if flagged and options['strict']:
+            raise CommandError(f"Полный проход таблиц в эндпоинтах: {', '.join(flagged)}")
+        if not flagged:
+            self.stdout.write(self.style.SUCCESS('Полных проходов таблиц нет.'))
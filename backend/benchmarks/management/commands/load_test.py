@@ -0,0 +1,55 @@
+# backend/benchmarks/management/commands/load_test.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from users.models import User
+from benchmarks import loadtest, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест эндпоинтов чтения: WSGI с пулом потоков против ASGI с async-view '
+        '(backend/asgi_urls.py). Заполняет отдельную тестовую БД и пишет отчет (rps, p50/p95) в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.1, help='Множитель объемов из benchmarks/seed.py')
+        parser.add_argument('--clients', type=int, default=50, help='Одновременных клиентов')
+        parser.add_argument('--requests', type=int, default=500, help='Всего запросов в каждом режиме')
+        parser.add_argument('--threads', type=int, default=8, help='Потоков WSGI-сервера')
+        parser.add_argument('--db-latency', type=float, default=0.0, help='Задержка каждого SQL-запроса, мс')
+        parser.add_argument('--client-latency', type=float, default=0.0, help='Сколько клиент забирает ответ, мс')
+        parser.add_argument('--modes', default=','.join(loadtest.MODES), help='Режимы через запятую')
+        parser.add_argument('--output', default='load_test_report.json', help='Куда записать отчет')
+        parser.add_argument('--keepdb', action='store_true', help='Не удалять тестовую БД, чтобы не заполнять ее заново')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=options['verbosity'], keepdb=options['keepdb'])
+        try:
+            if not User.objects.filter(username__startswith='bench').exists():
+                self.stdout.write(f"Заполнение БД (scale={options['scale']})...")
+                seed.seed(scale=options['scale'])
+            report = loadtest.run(
+                modes=[mode.strip() for mode in options['modes'].split(',') if mode.strip()],
+                clients=options['clients'], total=options['requests'],
+                threads=options['threads'], db_latency_ms=options['db_latency'],
+                client_latency_ms=options['client_latency'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=options['verbosity'], keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        for mode, result in report['modes'].items():
+            self.stdout.write(
+                f"{mode:10} {result['rps']:8.1f} rps  p50: {result['p50_ms']:8.2f} мс  p95: {result['p95_ms']:8.2f} мс  "
+                f"ошибок: {result['errors']}  потоков сервера: {result['server_threads']}"
+            )
+        Path(options['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        self.stdout.write(f"Отчет записан в {options['output']}")
@@ -0,0 +1,57 @@
+# backend/benchmarks/rendering.py
+#
+# Сравнение рендереров JSON на самых тяжелых ответах API: пользователи с профилями,
+# посты с полным текстом, уроки с материалами, курсы с преподавателями (Decimal в цене).
+# Данные сериализуются один раз, замеряется только рендеринг в байты.
+
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from blog.models import Post
+from blog.serializers import PostSerializer
+from courses.models import Course, Lesson
+from courses.serializers import CourseSerializer, LessonSerializer
+from users.models import User
+from users.serializers import UserSerializer
+from .runner import percentile
+
+RENDERERS = {'drf': JSONRenderer, 'orjson': ORJSONRenderer}
+
+
+def payloads(limit):
+    """{название: данные сериализатора} — списки по limit объектов."""
+    users = UserSerializer.setup_eager_loading(User.objects.order_by('id'))
+    courses = CourseSerializer.setup_eager_loading(Course.objects.order_by('id'))
+    return {
+        'users': UserSerializer(users[:limit], many=True).data,
+        'posts': PostSerializer(PostSerializer.setup_eager_loading(Post.objects.order_by('id'))[:limit], many=True).data,
+        'lessons': LessonSerializer(Lesson.objects.order_by('id')[:limit], many=True).data,
+        'courses': CourseSerializer(courses[:limit], many=True).data,
+    }
+
+
+def measure(renderer, data, repeat):
+    renderer.render(data) # Прогрев
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        renderer.render(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def run(limit=1000, repeat=20):
+    """Отчет: для каждого набора данных — p50/p95 рендереров, размер ответа, ускорение и совпадение вывода."""
+    report = {}
+    for name, data in payloads(limit).items():
+        outputs = {key: renderer_class().render(data) for key, renderer_class in RENDERERS.items()}
+        result = {'items': len(data), 'bytes': len(outputs['drf']), 'identical': outputs['drf'] == outputs['orjson']}
+        for key, renderer_class in RENDERERS.items():
+            timings = measure(renderer_class(), data, repeat)
+            result[f'{key}_p50_ms'] = round(percentile(timings, 50), 3)
+            result[f'{key}_p95_ms'] = round(percentile(timings, 95), 3)
+        result['speedup'] = round(result['drf_p50_ms'] / max(result['orjson_p50_ms'], 0.001), 1)
+        report[name] = result
+    return report
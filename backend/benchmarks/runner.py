@@ -0,0 +1,232 @@
+# backend/benchmarks/runner.py
+
+import platform
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.models import Application
+from blog.models import Category, Post
+from courses.models import Course, Lesson, ScheduleSlot
+from courses.timetable import feed_token
+from reviews.models import Review
+from users.models import User
+from .seed import BENCH_PASSWORD
+
+IMPORT_CSV = 'email,first_name,last_name,phone,school,student_class,parent_name,parent_phone\n' + ''.join(
+    f'import{i}@example.com,Имя,Фамилия,+7702{i:07d},Школа №1,9,Родитель,+7703{i:07d}\n' for i in range(100)
+)
+
+# Каждый эндпоинт API: имя URL, метод, от чьего имени, kwargs для reverse(), тело запроса.
+# Запросы на запись выполняются в транзакции с откатом, чтобы данные не менялись между прогонами.
+ENDPOINTS = [
+    {'name': 'api-root', 'method': 'get', 'as': 'admin'},
+    {'name': 'token_obtain_pair', 'method': 'post', 'as': None,
+     'data': lambda f: {'username': f['student'].username, 'password': BENCH_PASSWORD}},
+    {'name': 'token_refresh', 'method': 'post', 'as': None,
+     'data': lambda f: {'refresh': str(RefreshToken.for_user(f['student']))}},
+
+    {'name': 'user-list', 'method': 'get', 'as': 'admin'},
+    {'name': 'user-detail', 'method': 'get', 'as': 'admin', 'kwargs': lambda f: {'pk': f['student'].pk}},
+    {'name': 'user-export', 'method': 'get', 'as': 'admin', 'data': lambda f: {'role': 'student'}},
+    {'name': 'user-export-enrollments', 'method': 'get', 'as': 'admin', 'data': lambda f: {'role': 'student'}},
+    {'name': 'public-teacher-list', 'method': 'get', 'as': None},
+    {'name': 'public-teacher-detail', 'method': 'get', 'as': None, 'kwargs': lambda f: {'pk': f['teacher'].pk}},
+    {'name': 'course-list', 'method': 'get', 'as': None},
+    {'name': 'course-detail', 'method': 'get', 'as': None, 'kwargs': lambda f: {'pk': f['course'].pk}},
+    {'name': 'course-lessons-list', 'method': 'get', 'as': 'admin', 'kwargs': lambda f: {'course_pk': f['course'].pk}},
+    {'name': 'course-lessons-detail', 'method': 'get', 'as': 'admin',
+     'kwargs': lambda f: {'course_pk': f['course'].pk, 'pk': f['lesson'].pk}},
+    {'name': 'course-schedule-list', 'method': 'get', 'as': 'admin', 'kwargs': lambda f: {'course_pk': f['slot'].course_id}},
+    {'name': 'course-schedule-detail', 'method': 'get', 'as': 'admin',
+     'kwargs': lambda f: {'course_pk': f['slot'].course_id, 'pk': f['slot'].pk}},
+    {'name': 'post-list', 'method': 'get', 'as': None},
+    {'name': 'post-detail', 'method': 'get', 'as': None, 'kwargs': lambda f: {'pk': f['post'].pk}},
+    {'name': 'category-list', 'method': 'get', 'as': None},
+    {'name': 'category-detail', 'method': 'get', 'as': None, 'kwargs': lambda f: {'pk': f['category'].pk}},
+    {'name': 'application-list', 'method': 'get', 'as': 'admin'},
+    {'name': 'application-export', 'method': 'get', 'as': 'admin'},
+    {'name': 'application-detail', 'method': 'get', 'as': 'admin', 'kwargs': lambda f: {'pk': f['application'].pk}},
+    {'name': 'application-list', 'label': 'application-create', 'method': 'post', 'as': None,
+     'data': lambda f: {'name': 'Бенчмарк', 'phone': '+77000000000', 'subject': 'Математика'}},
+    {'name': 'review-list', 'method': 'get', 'as': None},
+    {'name': 'review-detail', 'method': 'get', 'as': None, 'kwargs': lambda f: {'pk': f['review'].pk}},
+    {'name': 'landing', 'method': 'get', 'as': None},
+
+    {'name': 'current-user', 'method': 'get', 'as': 'student'},
+    {'name': 'change-password', 'method': 'post', 'as': 'student',
+     'data': lambda f: {'old_password': BENCH_PASSWORD, 'new_password': BENCH_PASSWORD}},
+    {'name': 'admin-stats', 'method': 'get', 'as': 'admin'},
+    {'name': 'enroll-student', 'method': 'post', 'as': 'admin', 'kwargs': lambda f: {'pk': f['student'].pk},
+     'data': lambda f: {'course_ids': f['course_ids']}},
+    {'name': 'bulk-enroll-students', 'method': 'post', 'as': 'admin',
+     'data': lambda f: {'enrollments': [{'student_id': f['student'].pk, 'course_ids': f['course_ids']}]}},
+    {'name': 'import-students', 'method': 'post', 'as': 'admin', 'format': 'multipart',
+     'data': lambda f: {'file': SimpleUploadedFile('students.csv', IMPORT_CSV.encode(), content_type='text/csv')}},
+    {'name': 'timetable', 'method': 'get', 'as': 'student'},
+    {'name': 'timetable-feed', 'method': 'get', 'as': None, 'kwargs': lambda f: {'token': feed_token(f['student'].pk)}},
+    {'name': 'timetable-reset-feed', 'method': 'post', 'as': 'student'},
+    {'name': 'my-courses', 'method': 'get', 'as': 'student'},
+    {'name': 'upcoming-lessons', 'method': 'get', 'as': 'student'},
+    {'name': 'dashboard', 'method': 'get', 'as': 'student'},
+    {'name': 'system-settings', 'method': 'get', 'as': 'admin'},
+    {'name': 'search', 'method': 'get', 'as': None, 'data': lambda f: {'q': 'Курс'}},
+]
+
+
+def api_url_names():
+    """Имена всех URL под /api/ — по ним проверяется, что бенчмарк покрывает весь API."""
+    names = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif pattern.name and route.startswith('api/'):
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns, '')
+    return names
+
+
+def load_fixtures():
+    admin, created = User.objects.get_or_create(
+        username='bench-admin', defaults={'is_staff': True, 'role': 'admin'},
+    )
+    student = User.objects.filter(role='student', profile__enrolled_courses__isnull=False).first()
+    if not student.check_password(BENCH_PASSWORD):
+        # Смена пароля отзывает выпущенные JWT, поэтому сохраняем, только если он другой
+        student.set_password(BENCH_PASSWORD)
+        student.save(update_fields=['password'])
+    return {
+        'admin': admin,
+        'student': student,
+        'teacher': User.objects.filter(role='teacher', is_active=True).first(),
+        'course': Course.objects.filter(lessons__isnull=False).first(),
+        'lesson': Lesson.objects.first(),
+        'slot': ScheduleSlot.objects.first(),
+        'course_ids': list(Course.objects.values_list('pk', flat=True)[:3]),
+        'post': Post.objects.first(),
+        'category': Category.objects.first(),
+        'application': Application.objects.first(),
+        'review': Review.objects.filter(is_published=True).first(),
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def unthrottled():
+    """Без лимитов частоты: бенчмарк вызывает каждый эндпоинт десятки раз подряд с одного IP."""
+    rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {scope: None for scope in rates},
+    })
+
+
+def make_call(spec, fixtures):
+    client = APIClient()
+    if spec['as']:
+        client.force_authenticate(fixtures[spec['as']])
+    kwargs = spec['kwargs'](fixtures) if 'kwargs' in spec else {}
+    url = reverse(spec['name'], kwargs=kwargs)
+    method = getattr(client, spec['method'])
+
+    def call():
+        # Данные строятся заново на каждый вызов: загруженный файл читается только один раз
+        data = spec['data'](fixtures) if 'data' in spec else None
+        if spec['method'] == 'get':
+            response = method(url, data)
+            if response.streaming: # Выгрузки: запросы к БД идут по мере чтения тела
+                b''.join(response.streaming_content)
+            return response
+        with transaction.atomic():
+            response = method(url, data, format=spec.get('format', 'json'))
+            transaction.set_rollback(True)
+        return response
+
+    return url, call
+
+
+def measure(spec, fixtures, repeat):
+    url, call = make_call(spec, fixtures)
+    call() # Прогрев: кеши URL, сериализаторов, ContentType
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = call()
+    # Следующий запрос очистит лог (сигнал request_started), поэтому считаем сразу
+    queries = len(ctx.captured_queries)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Память меряем отдельным прогоном: tracemalloc сильно искажает время
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'method': spec['method'].upper(),
+        'path': url,
+        'status': response.status_code,
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run(repeat=20, scale=None, counts=None):
+    """Прогоняет все эндпоинты из ENDPOINTS и возвращает отчет в виде словаря."""
+    fixtures = load_fixtures()
+    endpoints = {}
+    with unthrottled():
+        for spec in ENDPOINTS:
+            endpoints[spec.get('label', spec['name'])] = measure(spec, fixtures, repeat)
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'scale': scale,
+            'repeat': repeat,
+            'rows': counts or {},
+        },
+        'endpoints': endpoints,
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    """
+    Сравнивает отчет с сохраненным baseline.
+    Регрессия — рост числа запросов или p95 хуже baseline больше чем на tolerance.
+    """
+    regressions = []
+    for label, current in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(label)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{label}: запросов {previous['queries']} -> {current['queries']}")
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {previous['p95_ms']} мс -> {current['p95_ms']} мс")
+    return regressions
@@ -0,0 +1,161 @@
+# backend/benchmarks/seed.py
+
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from applications.models import Application
+from blog.models import Category, Post
+from courses.models import Course, Lesson, ScheduleSlot
+from reviews.models import Review
+from search.index import rebuild as rebuild_search_index
+from stats.counters import reconcile as reconcile_stats
+from users.models import User, Profile
+
+# Объемы при scale=1.0 — примерно то, к чему придет школа за несколько лет
+VOLUMES = {
+    'users': 50_000,
+    'teachers': 500,
+    'courses': 2_000,
+    'lessons_per_course': 30,
+    'courses_per_student': 2,
+    'applications': 100_000,
+    'posts': 10_000,
+    'categories': 10,
+    'reviews': 1_000,
+}
+
+BENCH_PASSWORD = 'bench-password'
+BATCH_SIZE = 2_000
+
+SUBJECTS = ['Математика', 'Физика', 'Химия', 'Биология', 'История', 'Английский язык']
+
+
+def scaled(name, scale):
+    return max(1, int(VOLUMES[name] * scale))
+
+
+def bulk_create(model, objects):
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+@transaction.atomic
+def seed(scale=1.0, seed_value=42):
+    """
+    Заполняет базу реалистичным объемом данных для бенчмарка.
+    bulk_create не вызывает сигналы, поэтому профили создаются здесь же.
+    Возвращает словарь с количеством созданных строк.
+    """
+    rnd = random.Random(seed_value)
+    password = make_password(BENCH_PASSWORD) # Хешируем один раз для всех
+
+    teachers_count = scaled('teachers', scale)
+    users_count = max(scaled('users', scale), teachers_count + 1)
+    bulk_create(User, [
+        User(
+            username=f'bench{i}@example.com',
+            email=f'bench{i}@example.com',
+            first_name=f'Имя{i}',
+            last_name=f'Фамилия{i}',
+            role='teacher' if i < teachers_count else 'student',
+            password=password,
+        )
+        for i in range(users_count)
+    ])
+    bulk_create(Profile, [
+        Profile(user_id=pk, phone=f'+7700{pk:07d}', school='Школа №1', student_class='9')
+        for pk in User.objects.filter(profile__isnull=True).values_list('pk', flat=True)
+    ])
+    teacher_ids = list(User.objects.filter(role='teacher').values_list('pk', flat=True))
+
+    bulk_create(Course, [
+        Course(
+            title=f'Курс {i}',
+            description='Описание курса. ' * 20,
+            subject=SUBJECTS[i % len(SUBJECTS)],
+            price=Decimal('25000.00'),
+            teacher_id=teacher_ids[i % len(teacher_ids)],
+        )
+        for i in range(scaled('courses', scale))
+    ])
+    course_ids = list(Course.objects.values_list('pk', flat=True))
+
+    # Раз в неделю на курс; две трети уроков уже прошли — как у курса в середине года
+    lessons_per_course = VOLUMES['lessons_per_course']
+    past_weeks = lessons_per_course * 2 // 3
+    base = timezone.now().replace(minute=0, second=0, microsecond=0)
+    for start in range(0, len(course_ids), 100):
+        bulk_create(Lesson, [
+            Lesson(
+                course_id=course_id, title=f'Урок {n}', content='Материалы урока. ' * 50,
+                start=base + timedelta(weeks=n - past_weeks, hours=course_id % 72),
+                end=base + timedelta(weeks=n - past_weeks, hours=course_id % 72, minutes=90),
+            )
+            for course_id in course_ids[start:start + 100]
+            for n in range(lessons_per_course)
+        ])
+    bulk_create(ScheduleSlot, [
+        ScheduleSlot(course_id=course_id, weekday=course_id % 7, start_time=time(9 + course_id % 10))
+        for course_id in course_ids
+    ])
+
+    Enrollment = Profile.enrolled_courses.through
+    student_profile_ids = Profile.objects.filter(user__role='student').values_list('pk', flat=True)
+    per_student = min(VOLUMES['courses_per_student'], len(course_ids))
+    bulk_create(Enrollment, [
+        Enrollment(profile_id=profile_id, course_id=course_id)
+        for profile_id in student_profile_ids.iterator(chunk_size=BATCH_SIZE)
+        for course_id in rnd.sample(course_ids, per_student)
+    ])
+
+    statuses = [choice for choice, _ in Application.STATUS_CHOICES]
+    bulk_create(Application, [
+        Application(
+            name=f'Заявитель {i}',
+            phone=f'+7701{i:07d}',
+            phone_normalized=f'7701{i:07d}', # bulk_create не вызывает save()
+            student_class=str(rnd.randint(1, 11)),
+            subject=rnd.choice(SUBJECTS),
+            comment='Хочу записаться на курс.',
+            status=rnd.choice(statuses),
+        )
+        for i in range(scaled('applications', scale))
+    ])
+
+    bulk_create(Category, [
+        Category(name=f'Категория {i}', slug=f'category-{i}') for i in range(scaled('categories', scale))
+    ])
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+    bulk_create(Post, [
+        Post(
+            title=f'Пост {i}',
+            excerpt='Краткое описание поста.',
+            content='Текст поста. ' * 200,
+            author_id=teacher_ids[i % len(teacher_ids)],
+            category_id=category_ids[i % len(category_ids)],
+        )
+        for i in range(scaled('posts', scale))
+    ])
+
+    bulk_create(Review, [
+        Review(author=f'Ученик {i}, 11 класс', text='Отличная школа!', score_info='ЕНТ: 120', is_published=i % 2 == 0)
+        for i in range(scaled('reviews', scale))
+    ])
+
+    # bulk_create не вызывает сигналы: производные данные строим так же, как после импорта в продакшене
+    reconcile_stats()
+    rebuild_search_index()
+
+    return {
+        'users': User.objects.count(),
+        'courses': len(course_ids),
+        'lessons': Lesson.objects.count(),
+        'enrollments': Enrollment.objects.count(),
+        'applications': Application.objects.count(),
+        'posts': Post.objects.count(),
+        'reviews': Review.objects.count(),
+    }
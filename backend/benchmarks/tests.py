@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from reviews.models import Review
+from . import explain, loadtest, rendering, runner, seed
+
+
+# Быстрый хешер, чтобы логин и смена пароля не доминировали во времени тестов
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchmarkSuiteTests(TestCase):
+    def test_every_api_url_is_benchmarked(self):
+        covered = {spec['name'] for spec in runner.ENDPOINTS}
+        self.assertEqual(runner.api_url_names() - covered, set())
+
+    def test_small_scale_run_produces_report(self):
+        seed.seed(scale=0.001)
+        report = runner.run(repeat=2, scale=0.001)
+        self.assertEqual(len(report['endpoints']), len(runner.ENDPOINTS))
+        for label, result in report['endpoints'].items():
+            self.assertLess(result['status'], 400, label)
+            self.assertGreaterEqual(result['p95_ms'], result['p50_ms'], label)
+        self.assertGreater(report['endpoints']['user-list']['queries'], 0)
+        self.assertEqual(runner.compare(report, report), [])
+
+    def test_compare_flags_query_growth(self):
+        baseline = {'endpoints': {'post-list': {'queries': 1, 'p95_ms': 10.0}}}
+        report = {'endpoints': {'post-list': {'queries': 3, 'p95_ms': 10.0}}}
+        self.assertEqual(len(runner.compare(report, baseline)), 1)
+
+    def test_renderers_produce_identical_output(self):
+        seed.seed(scale=0.001)
+        report = rendering.run(limit=20, repeat=1)
+        self.assertEqual(set(report), {'users', 'posts', 'lessons', 'courses'})
+        for name, result in report.items():
+            self.assertTrue(result['identical'], name)
+
+
+# Запросы нагрузочного теста идут из других потоков, поэтому данные должны быть закоммичены
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoadTestTests(TransactionTestCase):
+    def test_every_mode_runs_without_errors(self):
+        seed.seed(scale=0.001)
+        report = loadtest.run(clients=3, total=16, threads=2)
+        self.assertEqual(set(report['modes']), set(loadtest.MODES))
+        for mode, result in report['modes'].items():
+            self.assertEqual(result['requests'], 16, mode)
+            self.assertEqual(result['errors'], 0, mode)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ExplainTests(TestCase):
+    def test_seq_scan_is_flagged(self):
+        if connection.vendor == 'sqlite':
+            plan = ['SCAN reviews_review', 'SEARCH users_user USING INTEGER PRIMARY KEY (rowid=?)',
+                    'SCAN reviews_review USING INDEX review_published_idx', 'SCAN search_fts VIRTUAL TABLE INDEX 0:M2']
+        else:
+            plan = ['Seq Scan on reviews_review  (cost=0.00..1.01 rows=1 width=4)',
+                    'Index Scan using users_user_pkey on users_user  (cost=0.15..8.17 rows=1 width=4)']
+        self.assertEqual(explain.seq_scans(plan), ['reviews_review'])
+
+    def test_published_reviews_use_partial_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Выбор индекса PostgreSQL зависит от статистики таблицы')
+        queryset = Review.objects.filter(is_published=True).order_by('-id')
+        plan = explain.explain(str(queryset.query))
+        self.assertTrue(any('review_published_idx' in line for line in plan), plan)
+        self.assertEqual(explain.seq_scans(plan), [])
+
+    def test_small_scale_run_explains_every_endpoint(self):
+        seed.seed(scale=0.001)
+        report = explain.run()
+        self.assertEqual(len(report), len(runner.ENDPOINTS))
+        for label, result in report.items():
+            for query in result['queries']:
+                self.assertNotIn('error', query, f"{label}: {query['sql']}")
+        self.assertTrue(report['review-list']['queries'])
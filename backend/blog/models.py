@@ -19,6 +19,12 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     image_url = models.URLField(blank=True, null=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
-    
+
+    class Meta:
+        indexes = [
+            # Поддерживает сортировку и пагинацию по курсору в ленте постов
+            models.Index(fields=['created_at'], name='post_created_at_idx'),
+        ]
+
     def __str__(self):
         return self.title
\ No newline at end of file
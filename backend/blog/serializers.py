@@ -1,6 +1,7 @@
 # backend/blog/serializers.py
 
 from rest_framework import serializers
+from backend.mixins import EagerLoadingSerializerMixin, SparseFieldsSerializerMixin
 from .models import Category, Post
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -8,11 +9,35 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name', 'slug']
 
-class PostSerializer(serializers.ModelSerializer):
+class PostListSerializer(SparseFieldsSerializerMixin, EagerLoadingSerializerMixin, serializers.ModelSerializer):
+    """Пост в ленте: без полного текста, колонка content из БД не читается."""
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    author_name = serializers.CharField(source='author.get_full_name', read_only=True)
+
+    select_related_fields = ('category', 'author')
+    query_fields = {
+        'category_name': ('category__name',),
+        'author_name': ('author__first_name', 'author__last_name'),
+    }
+
+    class Meta:
+        model = Post
+        fields = [
+            'id', 'title', 'excerpt', 'author_name',
+            'category', 'category_name', 'created_at', 'image_url'
+        ]
+
+class PostSerializer(SparseFieldsSerializerMixin, EagerLoadingSerializerMixin, serializers.ModelSerializer):
     # Для удобства фронтенда сразу отдаем имя категории и автора
     category_name = serializers.CharField(source='category.name', read_only=True)
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
 
+    select_related_fields = ('category', 'author')
+    query_fields = {
+        'category_name': ('category__name',),
+        'author_name': ('author__first_name', 'author__last_name'),
+    }
+
     class Meta:
         model = Post
         fields = [
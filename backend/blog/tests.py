@@ -1,3 +1,55 @@
-from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from backend.testing import QueryCountTestMixin
+from users.models import User
+from .models import Category, Post
+
+
+class PostQueryCountTests(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Новости', slug='news')
+        self.add_posts(2)
+
+    def add_posts(self, count):
+        start = Post.objects.count()
+        for i in range(start, start + count):
+            author = User.objects.create_user(username=f'author{i}', first_name='Автор', last_name=str(i))
+            Post.objects.create(title=f'Пост {i}', content='Текст', author=author, category=self.category)
+
+    def test_post_list_is_constant(self):
+        self.assertConstantQueries(reverse('post-list'), lambda: self.add_posts(10), budget=1)
+
+
+class PostRepresentationTests(APITestCase):
+    def setUp(self):
+        author = User.objects.create_user(username='author', first_name='Анна', last_name='Ли')
+        category = Category.objects.create(name='Новости', slug='news')
+        self.post = Post.objects.create(title='Пост', excerpt='Кратко', content='Длинный текст', author=author, category=category)
+
+    def test_list_never_reads_content(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('post-list'))
+        item = response.data['results'][0]
+        self.assertNotIn('content', item)
+        self.assertEqual((item['author_name'], item['category_name']), ('Анна Ли', 'Новости'))
+        self.assertNotIn('"content"', ctx.captured_queries[0]['sql'])
+
+    def test_detail_keeps_full_text(self):
+        response = self.client.get(reverse('post-detail', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.data['content'], 'Длинный текст')
+
+    def test_sparse_fieldset_narrows_output_and_sql(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('post-list'), {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"excerpt"', sql)
+
+    def test_categories_are_a_plain_list(self):
+        response = self.client.get(reverse('category-list'))
+        self.assertEqual([item['slug'] for item in response.data], ['news'])
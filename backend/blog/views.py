@@ -2,16 +2,28 @@
 
 from rest_framework import viewsets, permissions
 from .models import Post, Category
-from .serializers import PostSerializer, CategorySerializer
+from .serializers import PostSerializer, PostListSerializer, CategorySerializer
+from backend.mixins import CompiledListMixin, EagerLoadingMixin, ReplicaReadMixin
+from httpcache.mixins import ConditionalGetMixin
+from search.filters import FullTextSearchFilter
 
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(ReplicaReadMixin, ConditionalGetMixin, CompiledListMixin, EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     """Показывает посты блога. Доступно всем."""
-    queryset = Post.objects.all().select_related('category', 'author')
+    queryset = Post.objects.all()
     serializer_class = PostSerializer
+    serializer_action_classes = {'list': PostListSerializer} # В ленте без полного текста
     permission_classes = [permissions.AllowAny] # Разрешаем доступ всем
+    ordering = '-created_at'
+    filter_backends = [FullTextSearchFilter]
+    search_kind = 'post'
+    version_models = ('blog.Post', 'blog.Category', 'users.User')
+    response_cache = True
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Показывает категории блога. Доступно всем."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
-    permission_classes = [permissions.AllowAny]
\ No newline at end of file
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None # Короткий справочник для фильтра: отдается одним списком
+    ordering = 'name'
+    version_models = ('blog.Category',)
\ No newline at end of file
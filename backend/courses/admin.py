@@ -1,6 +1,17 @@
 from django.contrib import admin
-from .models import Course, Lesson # Убираем импорт Subject и TestQuestion
+from .models import Course, Lesson, ScheduleSlot # Убираем импорт Subject и TestQuestion
 
 # Регистрируем только те модели, которые реально существуют
 admin.site.register(Course)
-admin.site.register(Lesson)
\ No newline at end of file
+
+
+@admin.register(Lesson)
+class LessonAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course', 'start', 'end')
+    list_filter = ('course',)
+
+
+@admin.register(ScheduleSlot)
+class ScheduleSlotAdmin(admin.ModelAdmin):
+    list_display = ('course', 'weekday', 'start_time', 'duration', 'valid_from', 'valid_until')
+    list_filter = ('weekday',)
\ No newline at end of file
@@ -1,8 +1,12 @@
 from django.urls import path
-from .views import my_courses, upcoming_lessons
+from .views import my_courses, upcoming_lessons, my_dashboard, my_timetable, reset_timetable_feed, timetable_feed
 
 # Здесь только кастомные URL, которые не создаются роутером автоматически
 urlpatterns = [
     path('courses/my/', my_courses, name='my-courses'),
     path('courses/upcoming-lessons/', upcoming_lessons, name='upcoming-lessons'),
+    path('courses/dashboard/', my_dashboard, name='dashboard'),
+    path('courses/timetable/', my_timetable, name='timetable'),
+    path('courses/timetable/reset-feed/', reset_timetable_feed, name='timetable-reset-feed'),
+    path('courses/timetable/<str:token>.ics', timetable_feed, name='timetable-feed'),
 ]
\ No newline at end of file
@@ -0,0 +1,84 @@
+# backend/courses/dashboard.py
+#
+# Стартовые данные кабинета ученика одним запросом: то же, что отдают /api/users/me/,
+# /api/courses/my/ и /api/courses/upcoming-lessons/, собранное за 4 SQL-запроса
+# (пользователь с профилем, курсы с преподавателями, записи преподавателей, уроки).
+# Результат хранится в кеше по пользователю и сбрасывается сигналами (courses/signals.py):
+# изменение записей на курсы, курса, урока, самого пользователя или преподавателя его курса.
+# Без изменений запись живет до конца ближайшего урока из списка — тогда список меняется.
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from users.models import User
+from users.serializers import UserSerializer
+from .models import Course
+from .schedule import upcoming_lessons
+from .serializers import CourseSerializer, UpcomingLessonSerializer
+
+KEY = 'dashboard:{}'
+# Даже без изменений запись пересобирается раз в час: в окно ближайших уроков входят новые
+TIMEOUT = 60 * 60
+
+Enrollment = Course.enrolled_student_profiles.through
+
+
+def build(user_id, now=None):
+    """(данные, сколько секунд их можно хранить)."""
+    now = now or timezone.now()
+    courses = CourseSerializer.setup_eager_loading(Course.objects.order_by('id'))
+    user = (
+        User.objects.select_related('profile')
+        .prefetch_related(Prefetch('profile__enrolled_courses', queryset=courses))
+        .get(pk=user_id)
+    )
+    profile = getattr(user, 'profile', None)
+    lessons = list(upcoming_lessons(profile, now=now)) if profile is not None else []
+
+    data = {
+        'user': UserSerializer(user).data,
+        'courses': CourseSerializer(profile.enrolled_courses.all(), many=True).data if profile is not None else [],
+        'upcoming_lessons': UpcomingLessonSerializer(lessons, many=True).data,
+    }
+    # Урок уходит из списка, когда заканчивается (урок без окончания — когда начинается)
+    changes_at = [lesson.end or lesson.start for lesson in lessons]
+    timeout = TIMEOUT
+    if changes_at:
+        timeout = max(1, min(TIMEOUT, int((min(changes_at) - now).total_seconds()) + 1))
+    return data, timeout
+
+
+def get_dashboard(user_id):
+    data = cache.get(KEY.format(user_id))
+    if data is None:
+        data, timeout = build(user_id)
+        cache.set(KEY.format(user_id), data, timeout=timeout)
+    return data
+
+
+# --- Сброс ---
+
+def forget_users(user_ids):
+    keys = [KEY.format(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def forget_profiles(profile_ids):
+    forget_users(list(User.objects.filter(profile__in=profile_ids).values_list('pk', flat=True)))
+
+
+def forget_courses(course_ids):
+    """Ученики курсов: в их кабинете курс или его уроки."""
+    forget_users(list(
+        Enrollment.objects.filter(course_id__in=course_ids).values_list('profile__user_id', flat=True).distinct()
+    ))
+
+
+def forget_teacher(user_id):
+    """Данные преподавателя выводятся в курсах его учеников."""
+    forget_users(list(
+        Enrollment.objects.filter(course__teacher_id=user_id).values_list('profile__user_id', flat=True).distinct()
+    ))
@@ -0,0 +1,16 @@
+# backend/courses/management/commands/generate_lessons.py
+
+from django.core.management.base import BaseCommand
+
+from courses.schedule import HORIZON_WEEKS, generate_lessons
+
+
+class Command(BaseCommand):
+    help = 'Создает уроки по еженедельным слотам расписания на несколько недель вперед (запускать раз в день).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=HORIZON_WEEKS, help='Горизонт в неделях')
+
+    def handle(self, *args, **options):
+        created = generate_lessons(weeks=options['weeks'])
+        self.stdout.write(self.style.SUCCESS(f'Создано уроков: {created}.'))
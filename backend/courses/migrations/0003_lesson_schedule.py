@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_alter_course_subject_remove_testquestion_subject_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='end',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Окончание'),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='meeting_url',
+            field=models.URLField(blank=True, null=True, verbose_name='Ссылка на занятие'),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='start',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Начало'),
+        ),
+        migrations.CreateModel(
+            name='ScheduleSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Понедельник'), (1, 'Вторник'), (2, 'Среда'), (3, 'Четверг'), (4, 'Пятница'), (5, 'Суббота'), (6, 'Воскресенье')], verbose_name='День недели')),
+                ('start_time', models.TimeField(verbose_name='Время начала')),
+                ('duration', models.PositiveSmallIntegerField(default=90, verbose_name='Длительность, мин')),
+                ('valid_from', models.DateField(blank=True, null=True, verbose_name='Действует с')),
+                ('valid_until', models.DateField(blank=True, null=True, verbose_name='Действует до')),
+                ('meeting_url', models.URLField(blank=True, null=True, verbose_name='Ссылка на занятие')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_slots', to='courses.course', verbose_name='Курс')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='slot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lessons', to='courses.scheduleslot', verbose_name='Слот расписания'),
+        ),
+        migrations.AddConstraint(
+            model_name='lesson',
+            constraint=models.UniqueConstraint(fields=('course', 'start'), name='lesson_course_start_uniq'),
+        ),
+    ]
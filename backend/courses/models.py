@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 class Course(models.Model):
@@ -24,6 +24,54 @@ class Course(models.Model):
     def __str__(self):
         return self.title
 
+class ScheduleSlotQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        QuerySet.update (и bulk_update, который идет через него) не шлет post_save:
+        будущие уроки измененных слотов пересчитываем здесь же, в одной транзакции.
+        """
+        from .schedule import reschedule_slot
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            for slot in ScheduleSlot.objects.using(self.db).filter(pk__in=pks).select_related('course'):
+                reschedule_slot(slot)
+        return rows
+
+
+class ScheduleSlot(models.Model):
+    """
+    Еженедельный слот расписания курса: день недели и время начала в часовом поясе школы.
+    По слотам заранее создаются уроки (courses.schedule.generate_lessons); при изменении
+    слота будущие уроки обновляются на месте (courses.schedule.reschedule_slot), при
+    удалении — будущие уроки слота удаляются. Это делают сигналы (courses/signals.py),
+    поэтому работают и QuerySet.delete, и массовое удаление в админке; QuerySet.update
+    обрабатывает ScheduleSlotQuerySet. bulk_create уроки не создает — после него
+    вызывается generate_lessons (или команда generate_lessons).
+    """
+    WEEKDAY_CHOICES = (
+        (0, 'Понедельник'),
+        (1, 'Вторник'),
+        (2, 'Среда'),
+        (3, 'Четверг'),
+        (4, 'Пятница'),
+        (5, 'Суббота'),
+        (6, 'Воскресенье'),
+    )
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='schedule_slots', verbose_name="Курс")
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES, verbose_name="День недели")
+    start_time = models.TimeField(verbose_name="Время начала")
+    duration = models.PositiveSmallIntegerField(default=90, verbose_name="Длительность, мин")
+    valid_from = models.DateField(null=True, blank=True, verbose_name="Действует с")
+    valid_until = models.DateField(null=True, blank=True, verbose_name="Действует до")
+    meeting_url = models.URLField(blank=True, null=True, verbose_name="Ссылка на занятие")
+
+    objects = ScheduleSlotQuerySet.as_manager()
+
+    def __str__(self):
+        return f'{self.course} — {self.get_weekday_display()} {self.start_time:%H:%M}'
+
+
 class Lesson(models.Model):
     """
     Модель для урока внутри курса.
@@ -31,6 +79,23 @@ class Lesson(models.Model):
     title = models.CharField(max_length=255, verbose_name="Название урока")
     content = models.TextField(blank=True, null=True, verbose_name="Содержание/материалы")
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='lessons', verbose_name="Курс")
+    start = models.DateTimeField(null=True, blank=True, verbose_name="Начало")
+    end = models.DateTimeField(null=True, blank=True, verbose_name="Окончание")
+    meeting_url = models.URLField(blank=True, null=True, verbose_name="Ссылка на занятие")
+    # Слот, по которому урок создан автоматически; у уроков, добавленных вручную, пусто
+    slot = models.ForeignKey(
+        ScheduleSlot, on_delete=models.SET_NULL, null=True, blank=True, related_name='lessons', verbose_name="Слот расписания"
+    )
+
+    class Meta:
+        constraints = [
+            # Составной индекс для ближайших уроков курса; уникальность не дает создать урок по слоту дважды
+            models.UniqueConstraint(fields=['course', 'start'], name='lesson_course_start_uniq'),
+        ]
+        indexes = [
+            # Уроки всех курсов в ближайшие часы — для напоминаний (jobs/tasks.py)
+            models.Index(fields=['start'], name='lesson_start_idx'),
+        ]
 
     def __str__(self):
         return self.title
\ No newline at end of file
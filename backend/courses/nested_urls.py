@@ -1,5 +1,5 @@
 from rest_framework_nested import routers
-from .views import CourseViewSet, LessonViewSet
+from .views import CourseViewSet, LessonViewSet, ScheduleSlotViewSet
 
 # Этот роутер нужен только для того, чтобы на его основе построить вложенный
 # Он не будет генерировать URL-ы сам по себе в данном файле
@@ -9,6 +9,7 @@ router.register(r'courses', CourseViewSet, basename='course')
 # Создаем вложенный роутер для уроков
 courses_router = routers.NestedSimpleRouter(router, r'courses', lookup='course')
 courses_router.register(r'lessons', LessonViewSet, basename='course-lessons')
+courses_router.register(r'schedule', ScheduleSlotViewSet, basename='course-schedule')
 
 # Экспортируем только вложенные URL
 urlpatterns = courses_router.urls
\ No newline at end of file
@@ -0,0 +1,158 @@
+# backend/courses/schedule.py
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from system_settings.cache import get_settings
+from .models import Course, Lesson, ScheduleSlot
+
+# На сколько недель вперед создаются уроки по слотам; окно сдвигает команда generate_lessons
+HORIZON_WEEKS = 8
+
+# Урок, начавшийся не раньше этого, еще может идти: нижняя граница диапазона по индексу (course, start)
+MAX_LESSON_LENGTH = timedelta(hours=4)
+
+
+def school_timezone():
+    """Часовой пояс из системных настроек; время слотов задается в нем."""
+    try:
+        return ZoneInfo(get_settings().timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.TIME_ZONE)
+
+
+def occurrences(slot, start_date, end_date, tz):
+    """Даты начала занятий слота в промежутке [start_date, end_date)."""
+    if slot.valid_from and slot.valid_from > start_date:
+        start_date = slot.valid_from
+    if slot.valid_until and slot.valid_until < end_date:
+        end_date = slot.valid_until + timedelta(days=1)
+    day = start_date + timedelta(days=(slot.weekday - start_date.weekday()) % 7)
+    while day < end_date:
+        yield datetime.combine(day, slot.start_time, tzinfo=tz)
+        day += timedelta(weeks=1)
+
+
+@transaction.atomic
+def generate_lessons(slots=None, weeks=HORIZON_WEEKS, now=None):
+    """
+    Создает уроки по слотам на weeks недель вперед. Уже созданные уроки
+    (та же пара курс — начало) не трогаются, поэтому вызов можно повторять.
+    Возвращает количество созданных уроков.
+    """
+    now = now or timezone.now()
+    tz = school_timezone()
+    today = now.astimezone(tz).date()
+    slots = ScheduleSlot.objects.select_related('course') if slots is None else slots
+
+    planned = {}
+    for slot in slots:
+        for start in occurrences(slot, today, today + timedelta(weeks=weeks), tz):
+            if start > now:
+                planned.setdefault((slot.course_id, start), slot)
+    if not planned:
+        return 0
+
+    course_ids = {course_id for course_id, start in planned}
+    starts = [start for course_id, start in planned]
+    existing = set(
+        Lesson.objects.filter(course_id__in=course_ids, start__gte=min(starts), start__lte=max(starts))
+        .values_list('course_id', 'start')
+    )
+    lessons = [
+        Lesson(
+            course_id=course_id, slot=slot, title=slot.course.title, meeting_url=slot.meeting_url,
+            start=start, end=start + timedelta(minutes=slot.duration),
+        )
+        for (course_id, start), slot in planned.items() if (course_id, start) not in existing
+    ]
+    Lesson.objects.bulk_create(lessons, batch_size=1000)
+
+    # bulk_create не вызывает сигналы — расписания учеников обновляем сами
+    from .timetable import rebuild_course
+    for course_id in {lesson.course_id for lesson in lessons}:
+        rebuild_course(course_id)
+    return len(lessons)
+
+
+def remove_future_lessons(slot, now=None):
+    """Удаляет еще не начавшиеся уроки, созданные по слоту."""
+    return Lesson.objects.filter(slot=slot, start__gt=now or timezone.now()).delete()[0]
+
+
+@transaction.atomic
+def reschedule_slot(slot, now=None):
+    """
+    После изменения слота приводит его будущие уроки к новому расписанию. Урок, чья дата
+    осталась в расписании, обновляется на месте (начало, окончание, ссылка): материалы,
+    добавленные преподавателем, и id сохраняются. Уроки на выпавшие даты удаляются,
+    на новые — создаются. Возвращает количество созданных уроков.
+    """
+    now = now or timezone.now()
+    tz = school_timezone()
+    today = now.astimezone(tz).date()
+    lessons, removed, changed = {}, [], []
+    for lesson in Lesson.objects.filter(slot=slot, start__gt=now).order_by('start'):
+        # Второй урок слота на ту же дату (после смены часового пояса школы) лишний
+        if lessons.setdefault(lesson.start.astimezone(tz).date(), lesson) is not lesson:
+            removed.append(lesson.pk)
+    # Уроки могли быть созданы с горизонтом больше HORIZON_WEEKS: сверяем и их
+    end_date = max([today + timedelta(weeks=HORIZON_WEEKS), *(day + timedelta(days=1) for day in lessons)])
+    planned = {
+        start.date(): start for start in occurrences(slot, today, end_date, tz) if start > now
+    }
+
+    # Начало уже занято другим уроком курса (добавленным вручную или по другому слоту)
+    taken = set(
+        Lesson.objects.filter(course_id=slot.course_id, start__in=list(planned.values()))
+        .exclude(slot=slot).values_list('start', flat=True)
+    )
+    starts = {lesson.pk: lesson.start for lesson in lessons.values()}
+    for day, lesson in lessons.items():
+        start = planned.get(day)
+        if start is None or start in taken:
+            removed.append(lesson.pk)
+            continue
+        end = start + timedelta(minutes=slot.duration)
+        if (lesson.start, lesson.end, lesson.meeting_url) != (start, end, slot.meeting_url):
+            lesson.start, lesson.end, lesson.meeting_url = start, end, slot.meeting_url
+            changed.append(lesson)
+
+    if removed:
+        Lesson.objects.filter(pk__in=removed).delete()
+    if changed:
+        # UNIQUE (course, start) проверяется построчно внутри UPDATE: если два урока
+        # обмениваются временем, новое начало одного еще занято другим. Сначала
+        # освобождаем начала сдвигаемых уроков (NULL в уникальности не участвует)
+        moved = [lesson.pk for lesson in changed if lesson.start != starts[lesson.pk]]
+        if moved:
+            Lesson.objects.filter(pk__in=moved).update(start=None)
+        Lesson.objects.bulk_update(changed, ['start', 'end', 'meeting_url'])
+        # bulk_update не вызывает сигналы — расписания учеников обновляем сами
+        from .timetable import rebuild_course
+        rebuild_course(slot.course_id)
+    return generate_lessons([slot], now=now)
+
+
+def upcoming_lessons(profile, now=None, days=14, limit=20):
+    """
+    Ближайшие уроки ученика: идущие сейчас и начинающиеся в ближайшие days дней,
+    по времени начала, не больше limit. Один запрос: курсы ученика — подзапросом,
+    по каждому курсу читается только диапазон индекса (course, start), поэтому
+    прошедшие уроки не влияют на время ответа.
+    """
+    now = now or timezone.now()
+    course_ids = Course.enrolled_student_profiles.through.objects.filter(profile=profile).values('course_id')
+    return (
+        Lesson.objects
+        .filter(course_id__in=course_ids, start__gte=now - MAX_LESSON_LENGTH, start__lt=now + timedelta(days=days))
+        .filter(Q(end__gt=now) | Q(end__isnull=True, start__gte=now))
+        .select_related('course__teacher')
+        .defer('content', 'course__description')
+        .order_by('start', 'id')[:limit]
+    )
@@ -1,23 +1,94 @@
 from rest_framework import serializers
-from .models import Course, Lesson
+from .models import Course, Lesson, ScheduleSlot
+from backend.mixins import EagerLoadingSerializerMixin, SparseFieldsSerializerMixin
+from users.models import User
 from users.serializers import UserSerializer
 
 class LessonSerializer(serializers.ModelSerializer):
     """Сериализатор для модели Урока."""
     class Meta:
         model = Lesson
-        fields = ('id', 'title', 'content', 'course')
+        fields = ('id', 'title', 'content', 'course', 'start', 'end', 'meeting_url', 'slot')
         # --- ИЗМЕНЕНИЕ ЗДЕСЬ ---
         # Делаем поле 'course' доступным только для чтения.
         # Это означает, что мы не ожидаем его в POST/PATCH запросах,
         # т.к. оно подставляется автоматически из URL.
+        read_only_fields = ('course', 'slot')
+
+    def validate(self, attrs):
+        start = attrs.get('start', getattr(self.instance, 'start', None))
+        end = attrs.get('end', getattr(self.instance, 'end', None))
+        if start and end and end <= start:
+            raise serializers.ValidationError({'end': 'Окончание должно быть позже начала.'})
+        # Курс берется из URL (/courses/<course_pk>/lessons/), а не из тела запроса
+        course_id = self.instance.course_id if self.instance else self.context['view'].kwargs.get('course_pk')
+        if start and course_id and 'start' in attrs:
+            duplicates = Lesson.objects.filter(course_id=course_id, start=start)
+            if self.instance:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError({'start': 'У курса уже есть урок с этим временем начала.'})
+        return attrs
+
+
+class UpcomingLessonSerializer(serializers.ModelSerializer):
+    """Урок в расписании ученика: с названием курса и именем преподавателя, без материалов."""
+    course_title = serializers.CharField(source='course.title', read_only=True)
+    teacher_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Lesson
+        fields = ('id', 'title', 'course', 'course_title', 'teacher_name', 'start', 'end', 'meeting_url')
+
+    def get_teacher_name(self, obj):
+        teacher = obj.course.teacher
+        return teacher.get_full_name() if teacher else None
+
+
+class ScheduleSlotSerializer(serializers.ModelSerializer):
+    """Еженедельный слот расписания курса."""
+    class Meta:
+        model = ScheduleSlot
+        fields = ('id', 'course', 'weekday', 'start_time', 'duration', 'valid_from', 'valid_until', 'meeting_url')
         read_only_fields = ('course',)
 
+    def validate(self, attrs):
+        valid_from = attrs.get('valid_from', getattr(self.instance, 'valid_from', None))
+        valid_until = attrs.get('valid_until', getattr(self.instance, 'valid_until', None))
+        if valid_from and valid_until and valid_until < valid_from:
+            raise serializers.ValidationError({'valid_until': 'Дата окончания раньше даты начала.'})
+        return attrs
+
 
-class CourseSerializer(serializers.ModelSerializer):
+class TeacherBriefSerializer(serializers.ModelSerializer):
+    """Преподаватель в списке курсов: только имя и аватар, без профиля."""
+    class Meta:
+        model = User
+        fields = ('id', 'first_name', 'last_name', 'avatar')
+
+
+class CourseListSerializer(SparseFieldsSerializerMixin, EagerLoadingSerializerMixin, serializers.ModelSerializer):
+    """Курс в списке: без описания и с кратким преподавателем."""
+    teacher_details = TeacherBriefSerializer(source='teacher', read_only=True)
+
+    select_related_fields = ('teacher',)
+    query_fields = {
+        'teacher_details': ('teacher__id', 'teacher__first_name', 'teacher__last_name', 'teacher__avatar'),
+    }
+
+    class Meta:
+        model = Course
+        fields = ('id', 'title', 'subject', 'price', 'teacher', 'teacher_details')
+
+
+class CourseSerializer(SparseFieldsSerializerMixin, EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Курса."""
     teacher_details = UserSerializer(source='teacher', read_only=True)
 
+    # Связи вложенного UserSerializer, но относительно курса
+    select_related_fields = ('teacher__profile',)
+    prefetch_related_fields = ('teacher__profile__enrolled_courses',)
+
     class Meta:
         model = Course
         fields = ('id', 'title', 'description', 'subject', 'price', 'teacher', 'teacher_details')
\ No newline at end of file
@@ -0,0 +1,98 @@
+# backend/courses/signals.py
+#
+# Инкрементальное обновление материализованного расписания (courses.timetable),
+# уроков по слотам (courses.schedule) и сброс кеша кабинета ученика (courses.dashboard).
+
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from users.models import Profile, User
+from users.signals import enrollments_bulk_changed, students_imported
+from . import dashboard
+from .models import Course, Lesson, ScheduleSlot
+from .schedule import remove_future_lessons, reschedule_slot
+from .timetable import forget_course, forget_profiles, forget_students, rebuild_course
+
+
+# --- Уроки по слотам расписания ---
+
+@receiver(post_save, sender=ScheduleSlot)
+def slot_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reschedule_slot(instance)
+
+
+@receiver(pre_delete, sender=ScheduleSlot)
+def slot_deleted(sender, instance, **kwargs):
+    # pre_delete приходит и при QuerySet.delete / массовом удалении в админке
+    remove_future_lessons(instance)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def lesson_changed(sender, instance, **kwargs):
+    rebuild_course(instance.course_id)
+    dashboard.forget_courses([instance.course_id])
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, **kwargs):
+    rebuild_course(instance.pk) # Название курса входит в расписание
+    dashboard.forget_courses([instance.pk])
+
+
+@receiver(pre_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    # Строки записей на курс удаляются каскадом без m2m_changed
+    user_ids = list(instance.enrolled_student_profiles.values_list('user_id', flat=True))
+    forget_students(user_ids)
+    dashboard.forget_users(user_ids)
+    forget_course(instance.pk)
+
+
+@receiver(m2m_changed, sender=Profile.enrolled_courses.through)
+def enrollments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            forget_students([instance.user_id])
+            dashboard.forget_users([instance.user_id])
+    elif action == 'pre_clear':
+        profile_ids = list(instance.enrolled_student_profiles.values_list('pk', flat=True))
+        forget_profiles(profile_ids)
+        dashboard.forget_profiles(profile_ids)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        forget_profiles(pk_set)
+        dashboard.forget_profiles(pk_set)
+
+
+@receiver(enrollments_bulk_changed)
+def enrollments_bulk_changed_handler(sender, changes, **kwargs):
+    forget_profiles(list(changes))
+    dashboard.forget_profiles(list(changes))
+
+
+@receiver(students_imported)
+def students_imported_handler(sender, user_ids, **kwargs):
+    forget_students(user_ids)
+    dashboard.forget_users(user_ids)
+
+
+# --- Кабинет: данные самого пользователя и преподавателей его курсов ---
+
+# Поля пользователя, которых нет в кабинете (ни у ученика, ни у преподавателя курса)
+IGNORED_USER_FIELDS = {'last_login', 'password', 'feed_secret'}
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= IGNORED_USER_FIELDS:
+        return # Например, обновление last_login при входе: без запроса учеников преподавателя
+    dashboard.forget_users([instance.pk])
+    if instance.role == 'teacher':
+        dashboard.forget_teacher(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, **kwargs):
+    dashboard.forget_users([instance.user_id])
+    dashboard.forget_teacher(instance.user_id)
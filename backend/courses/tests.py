@@ -1,3 +1,342 @@
-from django.test import TestCase
+from datetime import time, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import quote_etag
+from rest_framework.test import APITestCase
+
+from backend.testing import QueryCountTestMixin
+from system_settings import cache as settings_cache
+from users.models import User
+from . import dashboard, timetable
+from .models import Course, Lesson, ScheduleSlot
+from .schedule import HORIZON_WEEKS, generate_lessons, upcoming_lessons
+
+
+class CourseQueryCountTests(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', role='student')
+        self.add_courses(2)
+
+    def add_courses(self, count):
+        start = Course.objects.count()
+        for i in range(start, start + count):
+            teacher = User.objects.create_user(username=f'teacher{i}', role='teacher')
+            course = Course.objects.create(title=f'Курс {i}', subject='Физика', price=1000, teacher=teacher)
+            teacher.profile.enrolled_courses.add(course)
+            self.student.profile.enrolled_courses.add(course)
+
+    def test_course_list_is_constant(self):
+        self.assertConstantQueries(reverse('course-list'), lambda: self.add_courses(10), budget=2)
+
+    def test_my_courses_is_constant(self):
+        self.client.force_authenticate(self.student)
+        self.assertConstantQueries(reverse('my-courses'), lambda: self.add_courses(10), budget=3)
+
+    def test_list_is_light_and_detail_is_full(self):
+        course = Course.objects.first()
+        item = self.client.get(reverse('course-list')).data['results'][0]
+        self.assertNotIn('description', item)
+        self.assertEqual(set(item['teacher_details']), {'id', 'first_name', 'last_name', 'avatar'})
+
+        detail = self.client.get(reverse('course-detail', kwargs={'pk': course.pk}), {'fields': 'id,description'}).data
+        self.assertEqual(set(detail), {'id', 'description'})
+
+
+class ScheduleTests(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        settings_cache.reset_local()
+        self.now = timezone.now()
+        self.student = User.objects.create_user(username='student', role='student')
+        teacher = User.objects.create_user(username='teacher', first_name='Анна', last_name='Ли', role='teacher')
+        self.course = Course.objects.create(title='Алгебра', subject='Математика', price=1000, teacher=teacher)
+        self.other = Course.objects.create(title='Физика', subject='Физика', price=1000)
+        self.student.profile.enrolled_courses.add(self.course)
+
+    def lesson(self, course, hours, minutes=90):
+        start = self.now + timedelta(hours=hours)
+        return Lesson.objects.create(course=course, title='Урок', start=start, end=start + timedelta(minutes=minutes))
+
+    def test_slot_generates_weekly_lessons_in_school_timezone(self):
+        slot = ScheduleSlot.objects.create(course=self.course, weekday=2, start_time=time(18, 30), duration=60)
+        lessons = list(Lesson.objects.filter(slot=slot).order_by('start'))
+        self.assertIn(len(lessons), (HORIZON_WEEKS - 1, HORIZON_WEEKS))
+        local = lessons[0].start.astimezone(ZoneInfo('Asia/Almaty'))
+        self.assertEqual((local.weekday(), local.hour, local.minute), (2, 18, 30))
+        self.assertEqual(lessons[1].start - lessons[0].start, timedelta(weeks=1))
+        self.assertEqual(lessons[0].end - lessons[0].start, timedelta(minutes=60))
+        self.assertEqual(generate_lessons(), 0) # Повторный запуск ничего не дублирует
+
+        slot.start_time = time(10, 0)
+        slot.save()
+        starts = Lesson.objects.filter(slot=slot).values_list('start', flat=True)
+        self.assertTrue(all(start.astimezone(ZoneInfo('Asia/Almaty')).hour == 10 for start in starts))
+
+    def test_slot_change_keeps_lessons_in_place(self):
+        # Не сегодня: иначе сдвиг времени мог бы перенести сегодняшний урок в прошлое
+        weekday = (timezone.localdate(self.now, ZoneInfo('Asia/Almaty')).weekday() + 3) % 7
+        slot = ScheduleSlot.objects.create(course=self.course, weekday=weekday, start_time=time(18, 30), duration=60)
+        first = Lesson.objects.filter(slot=slot).order_by('start').first()
+        Lesson.objects.filter(pk=first.pk).update(title='Квадратные уравнения', content='Задачи 1-10')
+        ids = set(Lesson.objects.filter(slot=slot).values_list('id', flat=True))
+
+        slot.meeting_url = 'https://meet.example.com/algebra'
+        slot.save()
+        self.assertEqual(set(Lesson.objects.filter(slot=slot).values_list('id', flat=True)), ids)
+        first.refresh_from_db()
+        self.assertEqual((first.title, first.content), ('Квадратные уравнения', 'Задачи 1-10'))
+        self.assertEqual(first.meeting_url, 'https://meet.example.com/algebra')
+
+        # Сдвиг времени — те же уроки с новым началом
+        slot.start_time, slot.duration = time(10, 0), 90
+        slot.save()
+        self.assertEqual(set(Lesson.objects.filter(slot=slot).values_list('id', flat=True)), ids)
+        first.refresh_from_db()
+        self.assertEqual(first.start.astimezone(ZoneInfo('Asia/Almaty')).hour, 10)
+        self.assertEqual(first.end - first.start, timedelta(minutes=90))
+        self.assertEqual(first.content, 'Задачи 1-10')
+
+        # Окончание действия слота — уроки на выпавшие даты удаляются
+        slot.valid_until = first.start.astimezone(ZoneInfo('Asia/Almaty')).date()
+        slot.save()
+        self.assertEqual(list(Lesson.objects.filter(slot=slot).values_list('id', flat=True)), [first.pk])
+
+    def test_bulk_slot_changes_regenerate_lessons(self):
+        slot = ScheduleSlot.objects.create(course=self.course, weekday=2, start_time=time(18, 30), duration=60)
+        ScheduleSlot.objects.filter(pk=slot.pk).update(start_time=time(10, 0))
+        starts = Lesson.objects.filter(slot=slot).values_list('start', flat=True)
+        self.assertTrue(starts)
+        self.assertTrue(all(start.astimezone(ZoneInfo('Asia/Almaty')).hour == 10 for start in starts))
+
+        ScheduleSlot.objects.filter(pk=slot.pk).delete()
+        self.assertFalse(Lesson.objects.filter(course=self.course, start__gt=timezone.now()).exists())
+
+    def test_duplicate_lesson_start_is_rejected(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        url = reverse('course-lessons-list', kwargs={'course_pk': self.course.pk})
+        start = (self.now + timedelta(days=1)).replace(microsecond=0)
+        data = {'title': 'Урок', 'start': start.isoformat(), 'end': (start + timedelta(hours=1)).isoformat()}
+        self.assertEqual(self.client.post(url, data).status_code, 201)
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('start', response.data)
+        # В другом курсе то же время свободно
+        other_url = reverse('course-lessons-list', kwargs={'course_pk': self.other.pk})
+        self.assertEqual(self.client.post(other_url, data).status_code, 201)
+        # Правка урока без смены начала не считается дубликатом
+        lesson = Lesson.objects.get(course=self.course)
+        detail = reverse('course-lessons-detail', kwargs={'course_pk': self.course.pk, 'pk': lesson.pk})
+        self.assertEqual(self.client.patch(detail, {'title': 'Новое', 'start': data['start']}).status_code, 200)
+
+    def test_upcoming_window_is_ordered_and_bounded(self):
+        self.lesson(self.course, -48) # прошедший
+        ongoing = self.lesson(self.course, -1)
+        later = self.lesson(self.course, 72)
+        soon = self.lesson(self.course, 2)
+        self.lesson(self.course, 24 * 30) # за пределами окна
+        self.lesson(self.other, 3) # чужой курс
+
+        with self.assertNumQueries(1):
+            lessons = list(upcoming_lessons(self.student.profile, now=self.now))
+        self.assertEqual([lesson.pk for lesson in lessons], [ongoing.pk, soon.pk, later.pk])
+
+        self.client.force_authenticate(self.student)
+        response = self.client.get(reverse('upcoming-lessons'), {'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['course_title'], 'Алгебра')
+        self.assertEqual(response.data[0]['teacher_name'], 'Анна Ли')
+
+    def test_dashboard_does_not_grow_with_history(self):
+        self.client.force_authenticate(self.student)
+        self.lesson(self.course, 5)
+
+        def add_history():
+            for week in range(1, 30):
+                self.lesson(self.course, -24 * 7 * week)
+
+        self.assertConstantQueries(reverse('upcoming-lessons'), add_history)
+
+
+class TimetableTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        settings_cache.reset_local()
+        self.student = User.objects.create_user(username='student', role='student')
+        self.course = Course.objects.create(title='Алгебра', subject='Математика', price=1000)
+        self.other = Course.objects.create(title='Физика', subject='Физика', price=1000)
+        self.lesson = self.add_lesson(self.course, 24)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.profile.enrolled_courses.add(self.course)
+        self.client.force_authenticate(self.student)
+
+    def add_lesson(self, course, hours):
+        start = timezone.now() + timedelta(hours=hours)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Lesson.objects.create(course=course, title='Урок', start=start, end=start + timedelta(hours=1))
+
+    def test_json_and_conditional_get_from_cache(self):
+        response = self.client.get(reverse('timetable'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([lesson['id'] for lesson in data['lessons']], [self.lesson.pk])
+        self.assertIn('.ics', data['feed_url'])
+
+        with self.assertNumQueries(0):
+            cached = timetable.get_timetable(self.student.pk)
+        self.assertEqual(quote_etag('json-' + cached[0]), response['ETag'])
+        self.assertEqual(self.client.get(reverse('timetable'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_rebuilt_on_lesson_and_enrollment_changes(self):
+        etag = self.client.get(reverse('timetable'))['ETag']
+        other_lesson = self.add_lesson(self.other, 2)
+        self.assertEqual(self.client.get(reverse('timetable'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.profile.enrolled_courses.add(self.other)
+        response = self.client.get(reverse('timetable'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([lesson['id'] for lesson in response.json()['lessons']], [other_lesson.pk, self.lesson.pk])
+
+        etag = response['ETag']
+        self.add_lesson(self.course, 48)
+        self.assertEqual(len(self.client.get(reverse('timetable'), HTTP_IF_NONE_MATCH=etag).json()['lessons']), 3)
+
+    def test_stale_reader_does_not_overwrite_committed_enrollment(self):
+        cache.clear()
+        original = timetable.read_student_courses
+        expected = sorted([self.course.pk, self.other.pk])
+
+        def read(user_ids):
+            if read.stale:
+                return original(user_ids)
+            # Читатель прочитал записи, а до записи в кеш успел закоммититься параллельный запрос
+            read.stale = original(user_ids)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.student.profile.enrolled_courses.add(self.other)
+            return read.stale
+        read.stale = None
+
+        with mock.patch.object(timetable, 'read_student_courses', read):
+            self.assertEqual(timetable.student_courses(self.student.pk), expected)
+        self.assertEqual(read.stale, {self.student.pk: [self.course.pk]})
+        self.assertEqual(cache.get(timetable.student_key(self.student.pk)), expected)
+
+    def test_ical_feed_by_signed_token(self):
+        self.client.force_authenticate(None)
+        url = reverse('timetable-feed', kwargs={'token': timetable.feed_token(self.student.pk)})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn(f'UID:lesson-{self.lesson.pk}@munificent-school', body)
+        self.assertIn('SUMMARY:Алгебра: Урок', body)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        forged = reverse('timetable-feed', kwargs={'token': f'{self.student.pk}:forged'})
+        self.assertEqual(self.client.get(forged).status_code, 404)
+
+    def test_feed_link_is_per_user_secret_and_can_be_reset(self):
+        old_url = self.client.get(reverse('timetable')).json()['feed_url']
+        other = User.objects.create_user(username='other', role='student')
+        # Подпись зависит от секрета пользователя, а не только от id
+        self.assertNotEqual(timetable.feed_token(other.pk).split(':')[1], old_url.split(':')[-1])
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+        with self.assertNumQueries(0): # Секрет берется из кеша
+            self.assertEqual(timetable.user_from_feed_token(old_url.rsplit('/', 1)[1][:-4]), self.student.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('timetable-reset-feed'))
+        self.assertEqual(response.status_code, 200)
+        new_url = response.data['feed_url']
+        self.assertNotEqual(new_url, old_url)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+        self.assertEqual(self.client.post(reverse('timetable-reset-feed')).status_code, 401)
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        settings_cache.reset_local()
+        self.teacher = User.objects.create_user(username='teacher', first_name='Анна', last_name='Ли', role='teacher')
+        self.student = User.objects.create_user(username='student', role='student')
+        self.course = Course.objects.create(title='Алгебра', subject='Математика', price=1000, teacher=self.teacher)
+        self.other = Course.objects.create(title='Физика', subject='Физика', price=1000)
+        start = timezone.now() + timedelta(hours=2)
+        self.lesson = Lesson.objects.create(course=self.course, title='Дроби', start=start, end=start + timedelta(hours=1))
+        self.student.profile.enrolled_courses.add(self.course)
+        self.client.force_authenticate(self.student)
+
+    def get(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(ctx.captured_queries)
+
+    def change(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            action()
+
+    def test_same_data_as_separate_endpoints_then_cached(self):
+        data, queries = self.get()
+        self.assertEqual(data['user'], self.client.get(reverse('current-user')).data)
+        self.assertEqual(data['courses'], self.client.get(reverse('my-courses')).data)
+        self.assertEqual(data['upcoming_lessons'], self.client.get(reverse('upcoming-lessons')).data)
+        self.assertLessEqual(queries, 4)
+        self.assertEqual(self.get()[1], 0)
+
+    def test_queries_do_not_grow_with_courses(self):
+        before = self.get()[1]
+        cache.clear()
+        for i in range(5):
+            course = Course.objects.create(title=f'Курс {i}', subject='Физика', price=1000, teacher=self.teacher)
+            course.lessons.create(title='Урок', start=self.lesson.start + timedelta(hours=i + 1))
+            self.student.profile.enrolled_courses.add(course)
+        data, after = self.get()
+        self.assertEqual(len(data['courses']), 6)
+        self.assertEqual(before, after)
+
+    def test_invalidated_by_enrollment_course_lesson_and_teacher(self):
+        self.get()
+        self.change(lambda: self.student.profile.enrolled_courses.add(self.other))
+        self.assertEqual([course['title'] for course in self.get()[0]['courses']], ['Алгебра', 'Физика'])
+
+        self.other.title = 'Физика 9'
+        self.change(self.other.save)
+        self.assertEqual(self.get()[0]['courses'][1]['title'], 'Физика 9')
+
+        start = timezone.now() + timedelta(hours=1)
+        self.change(lambda: Lesson.objects.create(course=self.other, title='Оптика', start=start))
+        self.assertEqual(self.get()[0]['upcoming_lessons'][0]['title'], 'Оптика')
+
+        self.teacher.first_name = 'Анастасия'
+        self.change(self.teacher.save)
+        self.assertEqual(self.get()[0]['courses'][0]['teacher_details']['first_name'], 'Анастасия')
+
+    def test_login_does_not_touch_dashboards(self):
+        self.get()
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            self.teacher.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+
+    def test_expires_when_first_lesson_ends(self):
+        now = timezone.now()
+        self.assertEqual(dashboard.build(self.student.pk, now=now)[1], dashboard.TIMEOUT) # Урок кончится позже
+        data, timeout = dashboard.build(self.student.pk, now=self.lesson.start)
+        self.assertEqual(len(data['upcoming_lessons']), 1)
+        self.assertEqual(timeout, dashboard.TIMEOUT) # Не дольше TIMEOUT
+        self.lesson.end = self.lesson.start + timedelta(minutes=30)
+        self.lesson.save()
+        self.assertEqual(dashboard.build(self.student.pk, now=self.lesson.start)[1], 30 * 60 + 1)
+        self.lesson.delete()
+        self.assertEqual(dashboard.build(self.student.pk, now=self.lesson.start)[1], dashboard.TIMEOUT)
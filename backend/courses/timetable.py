@@ -0,0 +1,266 @@
+# backend/courses/timetable.py
+#
+# Материализованное расписание ученика. Хранится в кеше из двух частей:
+# - фрагмент курса: его уроки в окне расписания, уже в виде словарей, с версией;
+# - список курсов ученика.
+# Изменение урока пересобирает фрагмент одного курса, изменение записей на курсы —
+# только список курсов затронутых учеников. Расписание ученика складывается
+# из фрагментов без ORM, а ETag считается по их версиям.
+#
+# Пересборка идет после коммита и перезаписывает запись (cache.set). Читатель,
+# не нашедший запись, кладет свою через cache.add: если он прочитал данные до
+# коммита, а пересборка уже прошла, его устаревшая копия не затрет свежую.
+# У всех записей конечный срок жизни — расхождение с БД не может жить дольше.
+
+import hashlib
+import json
+import secrets
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import Profile, User
+from .models import Course, Lesson
+from .schedule import HORIZON_WEEKS
+
+KEY_PREFIX = 'timetable:'
+# Фрагмент пересобирается не реже раза в сутки, чтобы окно расписания сдвигалось
+FRAGMENT_TIMEOUT = 24 * 60 * 60
+# Список курсов ученика пересобирается после каждого изменения записей; срок — страховка
+STUDENT_TIMEOUT = 24 * 60 * 60
+HISTORY_DAYS = 30
+FEED_SALT = 'courses.timetable.feed'
+# Секрет ссылки на календарь читается из кеша: календари опрашивают ее часто
+FEED_SECRET_TIMEOUT = 24 * 60 * 60
+
+Enrollment = Course.enrolled_student_profiles.through
+
+
+def course_key(course_id):
+    return f'{KEY_PREFIX}course:{course_id}'
+
+
+def student_key(user_id):
+    return f'{KEY_PREFIX}student:{user_id}'
+
+
+# --- Фрагменты курсов ---
+
+def build_fragment(course_id, now=None, replace=True):
+    """Фрагмент курса из БД. replace=False — заполнение читателем: не затирает уже лежащий в кеше."""
+    now = now or timezone.now()
+    lessons = (
+        Lesson.objects
+        .filter(course_id=course_id, start__gte=now - timedelta(days=HISTORY_DAYS),
+                start__lt=now + timedelta(weeks=HORIZON_WEEKS + 1))
+        .order_by('start', 'id')
+        .values('id', 'title', 'course_id', 'course__title', 'start', 'end', 'meeting_url')
+    )
+    fragment = {
+        'version': time.time_ns(),
+        'lessons': [
+            {
+                'id': lesson['id'],
+                'title': lesson['title'],
+                'course': lesson['course_id'],
+                'course_title': lesson['course__title'],
+                'start': lesson['start'].isoformat(),
+                'end': lesson['end'].isoformat() if lesson['end'] else None,
+                'meeting_url': lesson['meeting_url'],
+            }
+            for lesson in lessons
+        ],
+    }
+    if replace:
+        cache.set(course_key(course_id), fragment, timeout=FRAGMENT_TIMEOUT)
+    elif not cache.add(course_key(course_id), fragment, timeout=FRAGMENT_TIMEOUT):
+        return cache.get(course_key(course_id)) or fragment
+    return fragment
+
+
+def rebuild_course(course_id):
+    """Пересобирает фрагмент курса после коммита — из уже сохраненных данных."""
+    transaction.on_commit(lambda: build_fragment(course_id))
+
+
+def forget_course(course_id):
+    transaction.on_commit(lambda: cache.delete(course_key(course_id)))
+
+
+# --- Курсы ученика ---
+
+def read_student_courses(user_ids):
+    courses = {user_id: [] for user_id in user_ids}
+    rows = Enrollment.objects.filter(profile__user_id__in=user_ids).values_list('profile__user_id', 'course_id')
+    for user_id, course_id in rows:
+        courses[user_id].append(course_id)
+    return {user_id: sorted(course_ids) for user_id, course_ids in courses.items()}
+
+
+def refresh_students(user_ids):
+    courses = read_student_courses(user_ids)
+    cache.set_many({student_key(user_id): course_ids for user_id, course_ids in courses.items()}, timeout=STUDENT_TIMEOUT)
+
+
+def forget_students(user_ids):
+    """Пересобирает списки курсов учеников после коммита — одним запросом на всех."""
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: refresh_students(user_ids))
+
+
+def forget_profiles(profile_ids):
+    forget_students(list(Profile.objects.filter(pk__in=profile_ids).values_list('user_id', flat=True)))
+
+
+def student_courses(user_id):
+    key = student_key(user_id)
+    course_ids = cache.get(key)
+    if course_ids is None:
+        course_ids = read_student_courses([user_id])[user_id]
+        if not cache.add(key, course_ids, timeout=STUDENT_TIMEOUT):
+            course_ids = cache.get(key, course_ids)
+    return course_ids
+
+
+# --- Расписание ученика ---
+
+def get_timetable(user_id):
+    """(ETag, фрагменты курсов ученика). На теплом кеше — только обращения к кешу."""
+    course_ids = student_courses(user_id)
+    cached = cache.get_many([course_key(course_id) for course_id in course_ids])
+    fragments = [
+        cached.get(course_key(course_id)) or build_fragment(course_id, replace=False) for course_id in course_ids
+    ]
+    return fragments_etag(course_ids, fragments), fragments
+
+
+def fragments_etag(course_ids, fragments):
+    versions = ','.join(f'{course_id}:{fragment["version"]}' for course_id, fragment in zip(course_ids, fragments))
+    return hashlib.md5(versions.encode()).hexdigest()
+
+
+def merge(fragments):
+    lessons = [lesson for fragment in fragments for lesson in fragment['lessons']]
+    return sorted(lessons, key=lambda lesson: (lesson['start'], lesson['id']))
+
+
+def render_json(fragments):
+    return json.dumps(merge(fragments), ensure_ascii=False).encode()
+
+
+def rendered(file_format, etag, fragments, school_name=''):
+    """Готовые байты расписания ('json' — массив уроков, 'ics' — календарь), кешируются по ETag."""
+    name_hash = hashlib.md5(school_name.encode()).hexdigest()[:8]
+    key = f'{KEY_PREFIX}render:{file_format}:{etag}:{name_hash}'
+    body = cache.get(key)
+    if body is None:
+        body = render_ical(fragments, school_name) if file_format == 'ics' else render_json(fragments)
+        cache.set(key, body, timeout=FRAGMENT_TIMEOUT)
+    return body
+
+
+# --- iCalendar ---
+
+def ical_escape(text):
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def ical_time(value):
+    return datetime.fromisoformat(value).astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def fold(line):
+    # RFC 5545: строки не длиннее 75 октетов, продолжение начинается с пробела
+    data = line.encode()
+    if len(data) <= 75:
+        return line
+    parts, current = [], b''
+    for char in line:
+        encoded = char.encode()
+        if len(current) + len(encoded) > (75 if not parts else 74):
+            parts.append(current.decode())
+            current = b''
+        current += encoded
+    parts.append(current.decode())
+    return '\r\n '.join(parts)
+
+
+def render_ical(fragments, school_name):
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+    lines = [
+        'BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Munificent School//Timetable//RU',
+        'CALSCALE:GREGORIAN', f'X-WR-CALNAME:{ical_escape(school_name)}',
+    ]
+    for lesson in merge(fragments):
+        end = lesson['end'] or lesson['start']
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:lesson-{lesson["id"]}@munificent-school',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{ical_time(lesson["start"])}',
+            f'DTEND:{ical_time(end)}',
+            f'SUMMARY:{ical_escape(lesson["course_title"])}: {ical_escape(lesson["title"])}',
+        ]
+        if lesson['meeting_url']:
+            lines.append(f'URL:{lesson["meeting_url"]}')
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(fold(line) for line in lines) + '\r\n').encode()
+
+
+def feed_secret_key(user_id):
+    return f'{KEY_PREFIX}feed-secret:{user_id}'
+
+
+def feed_secret(user_id):
+    """Секрет ссылки на календарь пользователя; создается при первом обращении. None — пользователя нет."""
+    key = feed_secret_key(user_id)
+    secret = cache.get(key)
+    if secret is None:
+        users = User.objects.filter(pk=user_id)
+        # Пустой секрет заполняется один раз, даже если параллельных запросов несколько
+        users.filter(feed_secret='').update(feed_secret=secrets.token_hex(16))
+        secret = users.values_list('feed_secret', flat=True).first()
+        if secret is None:
+            return None
+        cache.set(key, secret, timeout=FEED_SECRET_TIMEOUT)
+    return secret
+
+
+def reset_feed_secret(user_id):
+    """Новый секрет: все выданные ссылки на календарь пользователя перестают работать. Возвращает его."""
+    secret = secrets.token_hex(16)
+    User.objects.filter(pk=user_id).update(feed_secret=secret)
+    key = feed_secret_key(user_id)
+    transaction.on_commit(lambda: cache.set(key, secret, timeout=FEED_SECRET_TIMEOUT))
+    return secret
+
+
+def feed_signer(secret):
+    return signing.Signer(salt=f'{FEED_SALT}:{secret}')
+
+
+def feed_token(user_id, secret=None):
+    """
+    Подписанный токен ссылки на календарь: id пользователя, подписанный с его секретом.
+    Проверяется по кешу без обращения к БД; после reset_feed_secret прежние токены недействительны.
+    """
+    return feed_signer(secret or feed_secret(user_id)).sign(str(user_id))
+
+
+def user_from_feed_token(token):
+    user_id, _, _ = token.partition(':')
+    if not user_id.isdigit():
+        return None
+    secret = feed_secret(int(user_id))
+    if secret is None:
+        return None
+    try:
+        return int(feed_signer(secret).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
@@ -1,28 +1,73 @@
-from rest_framework import viewsets, filters, status
+import json
+
+from rest_framework import viewsets, status
 from rest_framework.permissions import IsAdminUser, AllowAny, IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.utils import timezone
-from .models import Course, Lesson
-from .serializers import CourseSerializer, LessonSerializer
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotFound
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from system_settings.cache import get_settings
+from users.models import Profile
+from . import dashboard, timetable
+from .models import Course, Lesson, ScheduleSlot
+from .schedule import upcoming_lessons as get_upcoming_lessons
+from .serializers import (
+    CourseSerializer, CourseListSerializer, LessonSerializer, ScheduleSlotSerializer, UpcomingLessonSerializer,
+)
 from backend.permissions import IsAdminOrReadOnly
+from backend.compiled import compile_serializer
+from backend.mixins import CompiledListMixin, EagerLoadingMixin
+from search.filters import FullTextSearchFilter
+from httpcache.mixins import ConditionalGetMixin
 
 # ViewSet для курсов (остается без изменений)
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.select_related('teacher').all()
+class CourseViewSet(ConditionalGetMixin, CompiledListMixin, EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.all()
     serializer_class = CourseSerializer
+    serializer_action_classes = {'list': CourseListSerializer} # В списке без описания и профиля преподавателя
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'subject', 'teacher__first_name', 'teacher__last_name']
+    filter_backends = [FullTextSearchFilter] # ?search= по индексу: название, предмет, преподаватель, описание
+    search_kind = 'course'
+    ordering = 'id'
+    offset_pagination = True
+    # Запись — только администратор; list и retrieve отдаются с ETag (ConditionalGetMixin)
+    version_models = ('courses.Course', 'users.User', 'users.Profile')
+    response_cache = True
 
 # ViewSet для уроков (остается без изменений)
 class LessonViewSet(viewsets.ModelViewSet):
     queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = None # Уроки курса отдаются одним списком
+
+    def get_queryset(self):
+        # По расписанию; уроки без даты — в конце
+        return Lesson.objects.filter(course_id=self.kwargs['course_pk']).order_by(F('start').asc(nulls_last=True), 'id')
+
+    def perform_create(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save(course_id=self.kwargs['course_pk'])
+        except IntegrityError:
+            # Тот же урок создан параллельным запросом после проверки в сериализаторе
+            raise ValidationError({'start': 'У курса уже есть урок с этим временем начала.'})
+
+
+# ViewSet для еженедельных слотов расписания курса
+class ScheduleSlotViewSet(viewsets.ModelViewSet):
+    """Слоты расписания. При сохранении слота его будущие уроки обновляются (courses/schedule.py)."""
+    serializer_class = ScheduleSlotSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = None
 
     def get_queryset(self):
-        return Lesson.objects.filter(course_id=self.kwargs['course_pk'])
+        return ScheduleSlot.objects.filter(course_id=self.kwargs['course_pk']).order_by('weekday', 'start_time')
 
     def perform_create(self, serializer):
         serializer.save(course_id=self.kwargs['course_pk'])
@@ -39,36 +84,127 @@ def my_courses(request):
     if not hasattr(request.user, 'profile'):
         return Response([], status=status.HTTP_200_OK)
         
-    enrolled_courses = request.user.profile.enrolled_courses.all()
-    serializer = CourseSerializer(enrolled_courses, many=True)
-    return Response(serializer.data)
+    # Тот же вывод, что у CourseSerializer, без создания моделей (backend/compiled.py)
+    compiled = compile_serializer(CourseSerializer)
+    return Response(compiled.serialize(compiled.values(request.user.profile.enrolled_courses.all())))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def upcoming_lessons(request):
     """
-    Возвращает список предстоящих уроков для текущего студента.
-    Считаем, что у модели Lesson есть поле 'date' типа DateField или DateTimeField.
+    Ближайшие уроки текущего студента по времени начала.
+    ?days= — окно в днях (по умолчанию 14, не больше 60), ?limit= — не больше 100 уроков.
     """
     if not hasattr(request.user, 'profile'):
         return Response([], status=status.HTTP_200_OK)
 
-    # Находим все курсы студента
-    student_courses = request.user.profile.enrolled_courses.all()
-    
-    # Находим все предстоящие уроки для этих курсов
-    # Для этого в модели Lesson должно быть поле 'date' или 'start_time'
-    # Предположим, что оно называется 'date'
-    # upcoming = Lesson.objects.filter(
-    #     course__in=student_courses,
-    #     date__gte=timezone.now() # Фильтруем по дате, которая больше или равна текущей
-    # ).order_by('date')
-    
-    # ВРЕМЕННАЯ ЗАГЛУШКА: так как в модели Lesson нет поля date,
-    # вернем пока все уроки студента, чтобы не было ошибки.
-    # TODO: Добавить поле 'date' в модель Lesson и раскомментировать код выше.
-    upcoming = Lesson.objects.filter(course__in=student_courses)
-
-    serializer = LessonSerializer(upcoming, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    try:
+        days, limit = lessons_window(request)
+    except ValueError:
+        return Response({'error': 'days и limit должны быть числами.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    upcoming = get_upcoming_lessons(request.user.profile, days=days, limit=limit)
+    serializer = UpcomingLessonSerializer(upcoming, many=True)
+    return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_dashboard(request):
+    """
+    Все данные для открытия кабинета ученика одним запросом: user (как /users/me/),
+    courses (как /courses/my/) и upcoming_lessons (как /courses/upcoming-lessons/
+    без параметров). Из кеша по пользователю, см. courses/dashboard.py.
+    """
+    return Response(dashboard.get_dashboard(request.user.pk))
+
+
+def lessons_window(request):
+    days = min(max(int(request.query_params.get('days', 14)), 1), 60)
+    limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    return days, limit
+
+
+# --- Async-версии для ASGI (backend/asgi_urls.py): те же ответы, запросы через async ORM ---
+
+async def get_profile_id(user):
+    return await Profile.objects.filter(user_id=user.pk).values_list('pk', flat=True).afirst()
+
+
+async def amy_courses(view, request):
+    profile_id = await get_profile_id(request.user)
+    if profile_id is None:
+        return Response([], status=status.HTTP_200_OK)
+
+    compiled = compile_serializer(CourseSerializer)
+    enrolled_courses = compiled.values(Course.objects.filter(enrolled_student_profiles=profile_id))
+    return Response(await compiled.aserialize(enrolled_courses))
+
+
+async def aupcoming_lessons(view, request):
+    profile_id = await get_profile_id(request.user)
+    if profile_id is None:
+        return Response([], status=status.HTTP_200_OK)
+
+    try:
+        days, limit = lessons_window(request)
+    except ValueError:
+        return Response({'error': 'days и limit должны быть числами.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    upcoming = get_upcoming_lessons(profile_id, days=days, limit=limit)
+    serializer = UpcomingLessonSerializer([lesson async for lesson in upcoming], many=True)
+    return Response(serializer.data)
+
+
+def timetable_response(request, user_id, file_format, content_type, wrap=None):
+    """Расписание из кеша с ETag: на совпадающий If-None-Match — 304 без сборки тела."""
+    digest, fragments = timetable.get_timetable(user_id)
+    etag = quote_etag(f'{file_format}-{digest}')
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        school_name = get_settings().school_name if file_format == 'ics' else ''
+        body = timetable.rendered(file_format, digest, fragments, school_name)
+        response = HttpResponse(wrap(body) if wrap else body, content_type=content_type)
+    response['ETag'] = etag
+    # Ответ личный; клиент каждый раз сверяется по ETag, а это только обращения к кешу
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_timetable(request):
+    """
+    Расписание текущего ученика из материализованной проекции: уроки его курсов
+    за последние 30 дней и на 8 недель вперед, плюс ссылка на календарь для подписки.
+    """
+    prefix = b'{"feed_url": ' + json.dumps(feed_url(request)).encode() + b', "lessons": '
+    return timetable_response(
+        request._request, request.user.pk, 'json', 'application/json', wrap=lambda body: prefix + body + b'}',
+    )
+
+
+def feed_url(request, secret=None):
+    return request.build_absolute_uri(
+        reverse('timetable-feed', kwargs={'token': timetable.feed_token(request.user.pk, secret)})
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reset_timetable_feed(request):
+    """Отзывает прежнюю ссылку на календарь (например, если она попала к посторонним) и выдает новую."""
+    secret = timetable.reset_feed_secret(request.user.pk)
+    return Response({'feed_url': feed_url(request, secret)})
+
+
+@api_view(['GET'])
+@authentication_classes([]) # Календари не умеют отправлять JWT: доступ по подписанному токену в ссылке
+@permission_classes([AllowAny])
+def timetable_feed(request, token):
+    """Календарь ученика в формате iCalendar для подписки из Google/Apple/Outlook."""
+    user_id = timetable.user_from_feed_token(token)
+    if user_id is None:
+        return HttpResponseNotFound()
+    return timetable_response(request._request, user_id, 'ics', 'text/calendar; charset=utf-8')
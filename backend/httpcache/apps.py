@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HttpCacheConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'httpcache'
+
+    def ready(self):
+        import httpcache.signals # noqa
@@ -0,0 +1,91 @@
+# backend/httpcache/mixins.py
+
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .responses import acached_response, cached_response
+from .versions import get_versions
+
+
+class ConditionalGetMixin:
+    """
+    Mixin для публичных ViewSet: ETag и Last-Modified для list/retrieve строятся
+    по версиям моделей из version_models, без запросов к БД и без сериализации.
+    Если клиент прислал совпадающий If-None-Match / If-Modified-Since, сразу отдается 304.
+    Cache-Control разрешает обратному прокси хранить ответ cache_max_age секунд.
+
+    При response_cache = True готовый JSON для анонимных запросов еще и хранится
+    на сервере (httpcache.responses) под тем же ключом, что и ETag.
+    """
+    version_models = () # Метки моделей, от которых зависит ответ, например ('blog.Post', 'users.User')
+    cache_max_age = 60
+    response_cache = False
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, request):
+        versions = get_versions(self.version_models)
+        if versions is None:
+            return None, None # Без общего кеша версий (backend/caches.py) ответ не кешируется
+        # В ETag входит все, от чего зависит тело: адрес с параметрами, формат ответа и версии
+        source = '|'.join([
+            self.__class__.__name__, request.get_full_path(), request.accepted_renderer.format,
+            *map(str, versions),
+        ])
+        return hashlib.md5(source.encode()).hexdigest(), max(versions) // 10**9
+
+    def use_response_cache(self, request):
+        # Браузерный API рендерит форму входа и CSRF, поэтому кешируется только JSON
+        return (
+            self.response_cache and settings.RESPONSE_CACHE['ENABLED']
+            and not request.user.is_authenticated and request.accepted_renderer.format == 'json'
+        )
+
+    def render_response(self, response):
+        # То же, что делает finalize_response, но здесь: в кеш нужны уже готовые байты
+        response.accepted_renderer = self.request.accepted_renderer
+        response.accepted_media_type = self.request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        return response.render()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        digest, last_modified = self.get_validators(request)
+        if digest is None:
+            return handler(request, *args, **kwargs)
+        etag = quote_etag(digest)
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None and self.use_response_cache(request):
+            response = cached_response(digest, lambda: self.render_response(handler(request, *args, **kwargs)))
+        elif response is None:
+            response = handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        """conditional_response для async-view (backend/asyncviews.py); handler — корутина."""
+        digest, last_modified = self.get_validators(request)
+        if digest is None:
+            return await handler(request, *args, **kwargs)
+        etag = quote_etag(digest)
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None and self.use_response_cache(request):
+            async def build():
+                return self.render_response(await handler(request, *args, **kwargs))
+            response = await acached_response(digest, build)
+        elif response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=self.cache_max_age)
+            patch_vary_headers(response, ['Accept'])
+        return response
@@ -0,0 +1,120 @@
+# backend/httpcache/responses.py
+#
+# Кеш готовых JSON-ответов для анонимных запросов. Ключ строится из ETag
+# (адрес с параметрами, формат и версии моделей из общего кеша, httpcache/versions.py),
+# поэтому после изменения данных в любом воркере старые записи перестают читаться
+# и истекают не позже чем через MAX_TIMEOUT. Сами байты могут лежать в кеше процесса.
+
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from backend.caches import shared_cache
+
+KEY_PREFIX = 'httpcache:response:'
+POLL_INTERVAL = 0.05
+# Ответ не хранится дольше часа, даже если RESPONSE_CACHE['TIMEOUT'] не задан или больше
+MAX_TIMEOUT = 60 * 60
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE['ALIAS']]
+
+
+def entry_timeout():
+    timeout = settings.RESPONSE_CACHE['TIMEOUT']
+    return MAX_TIMEOUT if timeout is None or timeout <= 0 else min(timeout, MAX_TIMEOUT)
+
+
+def to_entry(response):
+    return {'content': response.content, 'content_type': response['Content-Type']}
+
+
+def from_entry(entry, cache_status):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['X-Cache'] = cache_status
+    return response
+
+
+def cached_response(key, build):
+    """
+    Ответ из кеша по key или результат build() — отрендеренного ответа.
+    При промахе ответ строит только запрос, захвативший блокировку (cache.add атомарен
+    и в locmem, и в общих бэкендах); остальные ждут его результат не дольше WAIT
+    секунд и лишь потом строят ответ сами. Кешируются только ответы 200.
+    key должен включать версии моделей из httpcache.versions; без общего кеша версий
+    ответ строится без кеширования.
+    """
+    if shared_cache() is None:
+        return build()
+    config = settings.RESPONSE_CACHE
+    cache = get_cache()
+    key = KEY_PREFIX + key
+    entry = cache.get(key)
+    if entry is not None:
+        return from_entry(entry, 'HIT')
+
+    lock = key + ':lock'
+    if not cache.add(lock, 1, timeout=config['LOCK_TIMEOUT']):
+        deadline = time.monotonic() + config['WAIT']
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return from_entry(entry, 'HIT')
+            if cache.get(lock) is None: # Владелец блокировки завершился без результата
+                break
+        response = build()
+        response['X-Cache'] = 'MISS'
+        return response
+
+    try:
+        response = build()
+        if response.status_code == 200:
+            cache.set(key, to_entry(response), timeout=entry_timeout())
+    finally:
+        cache.delete(lock)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+async def acached_response(key, build):
+    """
+    cached_response для async-view: build — корутина, ожидание блокировки не занимает поток.
+    Кеш вызывается напрямую: async API кеша в Django — это те же вызовы через sync_to_async,
+    а переключение потока дороже обращения к locmem или Redis.
+    """
+    if shared_cache() is None:
+        return await build()
+    config = settings.RESPONSE_CACHE
+    cache = get_cache()
+    key = KEY_PREFIX + key
+    entry = cache.get(key)
+    if entry is not None:
+        return from_entry(entry, 'HIT')
+
+    lock = key + ':lock'
+    if not cache.add(lock, 1, timeout=config['LOCK_TIMEOUT']):
+        deadline = time.monotonic() + config['WAIT']
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return from_entry(entry, 'HIT')
+            if cache.get(lock) is None:
+                break
+        response = await build()
+        response['X-Cache'] = 'MISS'
+        return response
+
+    try:
+        response = await build()
+        if response.status_code == 200:
+            cache.set(key, to_entry(response), timeout=entry_timeout())
+    finally:
+        cache.delete(lock)
+    response['X-Cache'] = 'MISS'
+    return response
@@ -0,0 +1,49 @@
+# backend/httpcache/signals.py
+#
+# Смена версий моделей, от которых зависят публичные ответы API.
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from blog.models import Post, Category
+from courses.models import Course
+from reviews.models import Review
+from users.models import User, Profile
+from users.signals import enrollments_bulk_changed, students_imported
+from .versions import bump
+
+TRACKED_MODELS = (Post, Category, Review, User, Profile, Course)
+
+# Служебные поля пользователя, которых нет в публичных ответах
+IGNORED_USER_FIELDS = {'last_login', 'password'}
+
+
+@receiver(post_save)
+def model_saved(sender, instance, update_fields=None, **kwargs):
+    if sender not in TRACKED_MODELS:
+        return
+    if sender is User and update_fields is not None and set(update_fields) <= IGNORED_USER_FIELDS:
+        return # Например, обновление last_login при входе
+    bump(sender._meta.label)
+
+
+@receiver(post_delete)
+def model_deleted(sender, instance, **kwargs):
+    if sender in TRACKED_MODELS:
+        bump(sender._meta.label)
+
+
+@receiver(m2m_changed, sender=Profile.enrolled_courses.through)
+def enrollments_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump(Profile._meta.label)
+
+
+@receiver(enrollments_bulk_changed)
+def enrollments_bulk_changed_handler(sender, **kwargs):
+    bump(Profile._meta.label)
+
+
+@receiver(students_imported)
+def students_imported_handler(sender, **kwargs):
+    bump(User._meta.label, Profile._meta.label)
@@ -0,0 +1,160 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Category, Post
+from courses.models import Course
+from reviews.models import Review
+from users.models import User
+from backend.caches import shared_cache
+from . import responses, versions
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        responses.get_cache().clear()
+        self.teacher = User.objects.create_user(username='teacher', first_name='Анна', role='teacher')
+        self.category = Category.objects.create(name='Новости', slug='news')
+        self.post = Post.objects.create(title='Пост', content='Текст', author=self.teacher, category=self.category)
+        self.course = Course.objects.create(title='Алгебра', subject='Математика', price=1000, teacher=self.teacher)
+
+    def get(self, name, etag=None, **kwargs):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse(name, kwargs=kwargs or None), **headers)
+
+    def test_not_modified_without_queries(self):
+        response = self.get('post-list')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.get('post-list', response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changes_after_commit(self):
+        etag = self.get('post-list')['ETag']
+        self.assertNotEqual(self.get('post-detail', pk=self.post.pk)['ETag'], etag)
+
+        self.category.name = 'Статьи'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(self.get('post-list', etag).status_code, 200)
+
+    def test_login_does_not_invalidate_but_enrollment_does(self):
+        etag = self.get('course-list')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.save(update_fields=['last_login'])
+        self.assertEqual(self.get('course-list', etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.profile.enrolled_courses.add(self.course)
+        self.assertEqual(self.get('course-list', etag).status_code, 200)
+
+    def test_versions_are_per_model(self):
+        teachers_etag = self.get('public-teacher-list')['ETag']
+        reviews_etag = self.get('review-list')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(author='Ученик', text='Спасибо!', is_published=True)
+        self.assertEqual(self.get('public-teacher-list', teachers_etag).status_code, 304)
+        self.assertEqual(self.get('review-list', reviews_etag).status_code, 200)
+
+    def test_writes_are_not_conditional(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        response = self.client.patch(reverse('course-detail', kwargs={'pk': self.course.pk}), {'price': 2000})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_versions_live_in_shared_cache_with_ttl(self):
+        etag = self.get('post-list')['ETag']
+        cache.clear() # Кеш по умолчанию версии не хранит
+        self.assertEqual(self.get('post-list', etag).status_code, 304)
+        # Другой воркер сменил версию в общем кеше
+        shared_cache().set(versions.key('blog.Post'), 1, timeout=versions.TIMEOUT)
+        self.assertEqual(self.get('post-list', etag).status_code, 200)
+        # Версия, записанная bump при создании поста, не бессрочная
+        shared = shared_cache()
+        self.assertIsNotNone(shared._expire_info[shared.make_key(versions.key('blog.Category'))])
+
+    def test_no_etags_without_shared_cache(self):
+        caches = {alias: config for alias, config in settings.CACHES.items() if alias != 'shared'}
+        with override_settings(CACHES=caches):
+            response = self.get('post-list')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('ETag', response)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.category.save() # bump без общего кеша ничего не делает
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        responses.get_cache().clear()
+        self.review = Review.objects.create(author='Аня', text='Спасибо!', is_published=True)
+
+    def test_anonymous_hit_serves_bytes_without_queries(self):
+        first = self.client.get(reverse('review-list'))
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('review-list'))
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get(reverse('review-list'))
+        self.assertEqual(self.client.get(reverse('review-list'), {'page_size': 1})['X-Cache'], 'MISS')
+
+    def test_invalidated_by_signals(self):
+        self.client.get(reverse('review-list'))
+        self.review.text = 'Очень понравилось!'
+        self.review.save()
+        response = self.client.get(reverse('review-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['text'], 'Очень понравилось!')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(User.objects.create_user(username='student'))
+        self.client.get(reverse('review-list'))
+        self.assertNotIn('X-Cache', self.client.get(reverse('review-list')))
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': True, 'ALIAS': 'responses', 'TIMEOUT': 60, 'LOCK_TIMEOUT': 10, 'WAIT': 2})
+    def test_waiter_reuses_result_of_lock_holder(self):
+        key = 'stampede'
+        store = responses.get_cache()
+        store.add(responses.KEY_PREFIX + key + ':lock', 1)
+        entry = {'content': b'[]', 'content_type': 'application/json'}
+        timer = threading.Timer(0.1, store.set, [responses.KEY_PREFIX + key, entry])
+        timer.start()
+
+        def build():
+            raise AssertionError('Ответ должен был прийти из кеша')
+
+        response = responses.cached_response(key, build)
+        timer.join()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, b'[]')
+
+    def test_entries_have_finite_ttl(self):
+        for timeout, expected in ((60, 60), (None, responses.MAX_TIMEOUT), (0, responses.MAX_TIMEOUT), (10**6, responses.MAX_TIMEOUT)):
+            with override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'TIMEOUT': timeout}):
+                self.assertEqual(responses.entry_timeout(), expected)
+        self.client.get(reverse('review-list'))
+        store = responses.get_cache()
+        self.assertTrue(store._expire_info)
+        self.assertTrue(all(expires is not None for expires in store._expire_info.values()))
+
+    def test_not_cached_without_shared_versions(self):
+        caches = {alias: config for alias, config in settings.CACHES.items() if alias != 'shared'}
+        with override_settings(CACHES=caches):
+            response = responses.cached_response('no-shared', lambda: HttpResponse(b'[]'))
+            self.assertNotIn('X-Cache', response)
+        self.assertIsNone(responses.get_cache().get(responses.KEY_PREFIX + 'no-shared'))
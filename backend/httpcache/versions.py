@@ -0,0 +1,56 @@
+# backend/httpcache/versions.py
+#
+# Версии моделей для условных GET-запросов. Версия — метка времени в наносекундах,
+# которая меняется после каждого изменения строк модели. Хранится в общем кеше
+# (backend/caches.py): версия из кеша одного процесса не увидела бы изменений,
+# сделанных другими воркерами. Без общего кеша версий нет, и ETag не выдаются.
+
+import time
+
+from django.db import transaction
+
+from backend.caches import shared_cache
+
+KEY_PREFIX = 'httpcache:version:'
+# Истекшая версия создается заново с текущим временем, то есть только становится новее:
+# клиенты один раз получат полный ответ. Бессрочно хранить ее незачем
+TIMEOUT = 7 * 24 * 60 * 60
+
+
+def key(label):
+    return KEY_PREFIX + label
+
+
+def get_versions(labels):
+    """
+    Версии моделей по меткам вида 'blog.Post' в порядке labels — одним обращением к кешу.
+    None, если общего кеша нет: тогда изменения в других процессах не отследить.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return None
+    keys = [key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for missing in set(keys) - versions.keys():
+        # Кеш очищен, версия истекла или еще не создавалась: клиенты один раз получат полный ответ
+        cache.add(missing, time.time_ns(), timeout=TIMEOUT)
+        versions[missing] = cache.get(missing) or time.time_ns()
+    return [versions[k] for k in keys]
+
+
+def bump(*labels):
+    """
+    Меняет версии моделей сразу и еще раз после коммита транзакции. Первая смена нужна,
+    чтобы сама транзакция больше не получала старые ответы; но пока она не закоммичена,
+    другой запрос может закешировать старые данные под новой версией — вторая смена
+    после коммита делает такую запись недостижимой.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return
+
+    def publish():
+        now = time.time_ns()
+        cache.set_many({key(label): now for label in labels}, timeout=TIMEOUT)
+    publish()
+    transaction.on_commit(publish)
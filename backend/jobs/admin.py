@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    readonly_fields = ('locked_by', 'locked_until', 'last_error', 'created_at', 'finished_at')
@@ -0,0 +1,69 @@
+# backend/jobs/management/commands/run_jobs.py
+
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs import queue
+from jobs.tasks import enqueue_class_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер фоновых задач (jobs/queue.py): забирает готовые задачи пачками, раз в минуту '
+        'ставит напоминания о ближайших занятиях и удаляет старые выполненные задачи.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Сколько процессов-воркеров запустить')
+        parser.add_argument('--batch', type=int, default=settings.JOBS['BATCH_SIZE'], help='Задач за один цикл')
+        parser.add_argument('--poll', type=float, default=settings.JOBS['POLL_INTERVAL'],
+                            help='Пауза, когда очередь пуста, сек')
+        parser.add_argument('--once', action='store_true', help='Выполнить готовые задачи и выйти')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            enqueue_class_reminders()
+            processed = queue.work_until_empty(limit=options['batch'])
+            self.stdout.write(f'Выполнено задач: {processed}')
+            return
+
+        if options['processes'] == 1:
+            self.loop(options['batch'], options['poll'])
+            return
+        # Соединения с БД нельзя делить между процессами: каждый откроет свое
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=self.loop, args=(options['batch'], options['poll']))
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        # SIGTERM родителю передается воркерам: каждый доработает свою пачку
+        signal.signal(signal.SIGTERM, lambda *args: [worker.terminate() for worker in workers])
+        for worker in workers:
+            worker.join()
+
+    def loop(self, batch, poll):
+        stopping = []
+        # SIGTERM (остановка сервиса): дорабатываем текущую пачку и выходим
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        worker = queue.worker_name()
+        self.stdout.write(f'Воркер {worker} запущен')
+        next_reminders = next_purge = 0.0
+        while not stopping:
+            close_old_connections()
+            now = time.monotonic()
+            if now >= next_reminders:
+                enqueue_class_reminders()
+                next_reminders = now + settings.JOBS['REMINDER_INTERVAL']
+            if now >= next_purge:
+                queue.purge()
+                next_purge = now + 60 * 60
+            if not queue.work(worker, batch):
+                time.sleep(poll)
+        self.stdout.write(f'Воркер {worker} остановлен')
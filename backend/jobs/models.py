@@ -0,0 +1,39 @@
+# backend/jobs/models.py
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Фоновая задача в очереди (см. jobs/queue.py)."""
+    STATUS_CHOICES = (
+        ('queued', 'В очереди'),
+        ('running', 'Выполняется'),
+        ('done', 'Выполнена'),
+        ('failed', 'Ошибка'),
+    )
+    kind = models.CharField(max_length=50, verbose_name='Тип')
+    payload = models.JSONField(default=dict, verbose_name='Данные')
+    # Задачи с одинаковым ключом ставятся в очередь один раз (напоминание об уроке)
+    key = models.CharField(max_length=100, unique=True, null=True, blank=True, verbose_name='Ключ')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', verbose_name='Статус')
+    run_at = models.DateTimeField(default=timezone.now, verbose_name='Выполнить не раньше')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name='Максимум попыток')
+    # Воркер, взявший задачу, и срок, после которого ее может забрать другой (воркер упал)
+    locked_by = models.CharField(max_length=64, blank=True, verbose_name='Воркер')
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name='Заблокирована до')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создана')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Завершена')
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        indexes = [
+            # Выборка готовых к запуску задач воркером
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.get_status_display()})'
@@ -0,0 +1,183 @@
+# backend/jobs/queue.py
+#
+# Очередь фоновых задач в таблице jobs_job. Задача ставится в очередь в той же
+# транзакции, что и изменение данных (заявка и уведомление о ней сохраняются вместе
+# или не сохраняются вовсе), а выполняют ее воркеры `python manage.py run_jobs`.
+#
+# Воркер забирает пачку готовых задач: в PostgreSQL через SELECT ... FOR UPDATE SKIP LOCKED,
+# поэтому несколько воркеров не берут одно и то же. Взятая задача помечается токеном
+# воркера и сроком аренды (LEASE): если воркер упал, после этого срока задачу заберет
+# другой. Задачи одного типа передаются обработчику пачкой до batch_size штук.
+# Неудачная попытка повторяется с экспоненциальной задержкой, после max_attempts
+# задача остается в статусе failed.
+
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+@dataclass(frozen=True)
+class Task:
+    kind: str
+    handler: Callable
+    batch_size: int
+    max_attempts: int
+
+
+def task(kind, batch_size=1, max_attempts=5):
+    """
+    Регистрирует обработчик задач типа kind. Обработчик получает список payload
+    (не больше batch_size) и возвращает {индекс: ошибка} для тех, что не удались,
+    или None. Исключение считается ошибкой всей пачки.
+    """
+    def register(handler):
+        TASKS[kind] = Task(kind, handler, batch_size, max_attempts)
+        return handler
+    return register
+
+
+def enqueue(kind, payload, run_at=None, key=None):
+    """
+    Ставит задачу в очередь. С key задача создается один раз: повторный вызов
+    с тем же ключом возвращает существующую.
+    """
+    fields = {
+        'kind': kind,
+        'payload': payload,
+        'run_at': run_at or timezone.now(),
+        'max_attempts': TASKS[kind].max_attempts if kind in TASKS else 5,
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(key=key, **fields)
+    except IntegrityError:
+        return Job.objects.get(key=key)
+
+
+def backoff(attempts):
+    """Задержка перед следующей попыткой: BACKOFF_BASE * 2^(n-1), не больше BACKOFF_MAX, плюс до 25% случайно."""
+    config = settings.JOBS
+    delay = min(config['BACKOFF_MAX'], config['BACKOFF_BASE'] * 2 ** max(0, attempts - 1))
+    return timedelta(seconds=delay * (1 + random.random() / 4))
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# --- Воркер ---
+
+def due(now):
+    # Готовые к запуску и взятые упавшим воркером (аренда истекла)
+    return Job.objects.filter(Q(status='queued', run_at__lte=now) | Q(status='running', locked_until__lt=now))
+
+
+def claim(worker, limit, now=None):
+    """Забирает до limit готовых задач и возвращает их."""
+    now = now or timezone.now()
+    token = f'{worker}:{uuid.uuid4().hex[:8]}'[-64:]
+    with transaction.atomic():
+        ids = list(
+            due(now).order_by('run_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        # Условие due() повторяется: в SQLite нет FOR UPDATE, задачу мог забрать другой процесс
+        due(now).filter(id__in=ids).update(
+            status='running', locked_by=token, attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=settings.JOBS['LEASE']),
+        )
+    return list(Job.objects.filter(locked_by=token, status='running').order_by('run_at', 'id'))
+
+
+def complete(jobs):
+    if not jobs:
+        return
+    # Все задачи пачки взяты одним claim() с одним токеном
+    Job.objects.filter(id__in=[job.id for job in jobs], locked_by=jobs[0].locked_by).update(
+        status='done', finished_at=timezone.now(), locked_until=None, last_error='',
+    )
+
+
+def fail(job, error):
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        changes = {'status': 'failed', 'finished_at': now}
+        logger.error('Задача %s #%s не выполнена после %s попыток: %s', job.kind, job.id, job.attempts, error)
+    else:
+        changes = {'status': 'queued', 'run_at': now + backoff(job.attempts)}
+    # Если аренда истекла и задачу уже взял другой воркер, его результат важнее
+    Job.objects.filter(id=job.id, locked_by=job.locked_by).update(locked_until=None, last_error=error, **changes)
+
+
+def run_task(task, jobs):
+    try:
+        errors = task.handler([job.payload for job in jobs]) or {}
+    except Exception:
+        errors = dict.fromkeys(range(len(jobs)), traceback.format_exc())
+    complete([job for index, job in enumerate(jobs) if index not in errors])
+    for index, error in errors.items():
+        fail(jobs[index], str(error))
+
+
+def run(jobs):
+    """Выполняет взятые задачи: по типам, пачками до batch_size."""
+    by_kind = {}
+    for job in jobs:
+        if job.attempts > job.max_attempts:
+            # Воркеры падали на этой задаче раньше, чем успевали записать ошибку
+            fail(job, job.last_error or 'Аренда задачи истекла')
+            continue
+        by_kind.setdefault(job.kind, []).append(job)
+    for kind, group in by_kind.items():
+        task = TASKS.get(kind)
+        if task is None:
+            for job in group:
+                job.attempts = job.max_attempts # Повторять бессмысленно
+                fail(job, f'Неизвестный тип задачи: {kind}')
+            continue
+        for start in range(0, len(group), task.batch_size):
+            run_task(task, group[start:start + task.batch_size])
+
+
+def work(worker=None, limit=None):
+    """Один цикл воркера: забрать и выполнить пачку задач. Возвращает число задач."""
+    jobs = claim(worker or worker_name(), limit or settings.JOBS['BATCH_SIZE'])
+    run(jobs)
+    return len(jobs)
+
+
+def work_until_empty(worker=None, limit=None):
+    """Выполняет задачи, пока готовые не закончатся (тесты, `run_jobs --once`)."""
+    total = 0
+    while processed := work(worker, limit):
+        total += processed
+    return total
+
+
+def purge(days=None):
+    """Удаляет выполненные задачи старше KEEP_DONE_DAYS дней."""
+    days = settings.JOBS['KEEP_DONE_DAYS'] if days is None else days
+    deleted, _ = Job.objects.filter(status='done', finished_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
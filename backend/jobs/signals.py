@@ -0,0 +1,21 @@
+# backend/jobs/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from applications.models import Application
+from system_settings.cache import get_settings
+from .queue import enqueue
+from .tasks import APPLICATION_CREATED
+
+
+@receiver(post_save, sender=Application)
+def application_created(sender, instance, created, raw=False, **kwargs):
+    # Задача пишется в той же транзакции, что и заявка: отправка не задерживает ответ формы,
+    # а заявка без уведомления (или уведомление без заявки) не появится.
+    # Объединенные повторные заявки (applications/intake.py) сохраняются без created и не уведомляют
+    if not created or raw:
+        return
+    system = get_settings()
+    if system.email_notifications or system.sms_notifications:
+        enqueue(APPLICATION_CREATED, {'application_id': instance.pk})
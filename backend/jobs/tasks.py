@@ -0,0 +1,182 @@
+# backend/jobs/tasks.py
+#
+# Уведомления: о новых заявках — администраторам, о ближайших занятиях — ученикам
+# и родителям. Флаги SystemSettings (email_notifications, sms_notifications,
+# class_reminders) проверяются при постановке в очередь и еще раз при отправке:
+# выключенный канал не отправляет и то, что уже стоит в очереди.
+# Задача считается неудачной и повторяется, только если не ушло ни одного ее
+# сообщения: повтор после частичной отправки продублировал бы уведомление тем,
+# кто его уже получил. Ошибки отдельных получателей пишутся в лог.
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from applications.models import Application
+from courses.models import Course, Lesson
+from courses.schedule import school_timezone
+from system_settings.cache import get_settings
+from users.models import User
+from .models import Job
+from .queue import task
+from .transports import send_emails, send_sms
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_CREATED = 'application_created'
+CLASS_REMINDER = 'class_reminder'
+
+Enrollment = Course.enrolled_student_profiles.through
+
+
+def collect_errors(owners, errors, sent, failed):
+    """Раскладывает ошибки отправки (по индексу сообщения) по задачам-владельцам сообщений."""
+    for index, owner in enumerate(owners):
+        if index in errors:
+            failed[owner].append(errors[index])
+        else:
+            sent[owner] += 1
+
+
+def batch_errors(count, sent, failed):
+    result = {}
+    for index in range(count):
+        if not failed[index]:
+            continue
+        if sent[index]:
+            logger.warning('Уведомление отправлено не всем получателям: %s', '; '.join(failed[index]))
+        else:
+            result[index] = '; '.join(failed[index])
+    return result
+
+
+# --- Новые заявки ---
+
+def application_line(application):
+    details = ', '.join(filter(None, [application.subject, application.student_class and f'{application.student_class} класс']))
+    return f'{application.name}, {application.phone}' + (f' — {details}' if details else '')
+
+
+@task(APPLICATION_CREATED, batch_size=50)
+def notify_new_applications(payloads):
+    """Одно письмо и одно SMS каждому администратору на всю пачку заявок."""
+    system = get_settings()
+    if not (system.email_notifications or system.sms_notifications):
+        return None
+    applications = list(
+        Application.objects.filter(id__in=[payload['application_id'] for payload in payloads]).order_by('created_at')
+    )
+    if not applications:
+        return None
+
+    admins = list(
+        User.objects.filter(Q(role='admin') | Q(is_staff=True), is_active=True).values('email', 'profile__phone')
+    )
+    if len(applications) == 1:
+        subject = f'Новая заявка: {applications[0].name}'
+        short = f'{system.school_name}: новая заявка — {application_line(applications[0])}'
+    else:
+        subject = f'Новые заявки: {len(applications)}'
+        short = f'{system.school_name}: новых заявок — {len(applications)}'
+
+    errors, delivered = [], 0
+    if system.email_notifications:
+        emails = sorted({admin['email'] for admin in admins if admin['email']})
+        if emails:
+            body = '\n'.join(application_line(application) for application in applications)
+            failed = send_emails([(subject, body, emails)])
+            errors += failed.values()
+            delivered += 1 - len(failed)
+    if system.sms_notifications:
+        phones = sorted({admin['profile__phone'] for admin in admins if admin['profile__phone']})
+        failed = send_sms([(phone, short) for phone in phones])
+        errors += failed.values()
+        delivered += len(phones) - len(failed)
+
+    sent = dict.fromkeys(range(len(payloads)), delivered)
+    return batch_errors(len(payloads), sent, {index: list(errors) for index in range(len(payloads))})
+
+
+# --- Напоминания о занятиях ---
+
+def reminder_text(lesson, tz):
+    start = timezone.localtime(lesson.start, tz)
+    text = f'Напоминание: {lesson.course.title}, «{lesson.title}» — {start:%d.%m в %H:%M}.'
+    return f'{text} {lesson.meeting_url}' if lesson.meeting_url else text
+
+
+@task(CLASS_REMINDER, batch_size=100)
+def send_class_reminders(payloads):
+    """Каждому ученику курса — письмо, ему и родителю — SMS. Все письма пачки идут по одному соединению."""
+    system = get_settings()
+    if not system.class_reminders or not (system.email_notifications or system.sms_notifications):
+        return None
+    # Урок удален или уже начался (воркер долго стоял) — напоминать поздно
+    lessons = {
+        lesson.id: lesson
+        for lesson in Lesson.objects.filter(
+            id__in=[payload['lesson_id'] for payload in payloads], start__gt=timezone.now(),
+        ).select_related('course')
+    }
+    students = defaultdict(list)
+    for row in (
+        Enrollment.objects
+        .filter(course_id__in={lesson.course_id for lesson in lessons.values()}, profile__user__is_active=True)
+        .values('course_id', 'profile__user__email', 'profile__phone', 'profile__parent_phone')
+    ):
+        students[row['course_id']].append(row)
+
+    tz = school_timezone()
+    emails, email_owners, sms, sms_owners = [], [], [], []
+    for index, payload in enumerate(payloads):
+        lesson = lessons.get(payload['lesson_id'])
+        if lesson is None:
+            continue
+        text = reminder_text(lesson, tz)
+        for student in students[lesson.course_id]:
+            if system.email_notifications and student['profile__user__email']:
+                emails.append((f'Занятие {lesson.course.title}', text, [student['profile__user__email']]))
+                email_owners.append(index)
+            if system.sms_notifications:
+                for phone in {student['profile__phone'], student['profile__parent_phone']} - {None, ''}:
+                    sms.append((phone, text))
+                    sms_owners.append(index)
+
+    sent, failed = defaultdict(int), defaultdict(list)
+    collect_errors(email_owners, send_emails(emails), sent, failed)
+    collect_errors(sms_owners, send_sms(sms), sent, failed)
+    return batch_errors(len(payloads), sent, failed)
+
+
+def enqueue_class_reminders(now=None):
+    """
+    Ставит в очередь напоминания об уроках, которые начнутся в ближайшие
+    JOBS['CLASS_REMINDER_AHEAD'] секунд. Ключ задачи включает время начала: урок,
+    перенесенный на другое время, получит новое напоминание. Возвращает число новых задач.
+    """
+    if not get_settings().class_reminders:
+        return 0
+    now = now or timezone.now()
+    lessons = (
+        Lesson.objects
+        .filter(start__gt=now, start__lte=now + timedelta(seconds=settings.JOBS['CLASS_REMINDER_AHEAD']))
+        .filter(course__in=Enrollment.objects.values('course_id'))
+        .values_list('id', 'start')
+    )
+    jobs = {
+        f'{CLASS_REMINDER}:{lesson_id}:{start:%Y%m%d%H%M}': Job(kind=CLASS_REMINDER, payload={'lesson_id': lesson_id})
+        for lesson_id, start in lessons
+    }
+    existing = set(Job.objects.filter(key__in=list(jobs)).values_list('key', flat=True))
+    new = []
+    for key, job in jobs.items():
+        if key not in existing:
+            job.key = key
+            new.append(job)
+    # ignore_conflicts: то же напоминание мог одновременно поставить другой воркер
+    Job.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from courses.models import Course, Lesson
+from system_settings import cache as settings_cache
+from system_settings.models import SystemSettings
+from users.models import User
+from . import queue, transports
+from .models import Job
+from .tasks import APPLICATION_CREATED, CLASS_REMINDER, enqueue_class_reminders
+
+calls = []
+
+
+@queue.task('test_echo', batch_size=3, max_attempts=2)
+def echo(payloads):
+    calls.append([payload['n'] for payload in payloads])
+    # Нечетные n — ошибка отдельной задачи, n < 0 — ошибка всей пачки
+    if any(payload['n'] < 0 for payload in payloads):
+        raise RuntimeError('пачка')
+    return {index: 'нечетное' for index, payload in enumerate(payloads) if payload['n'] % 2}
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_batches_and_per_job_errors(self):
+        for n in (2, 3, 4, 6):
+            queue.enqueue('test_echo', {'n': n})
+        self.assertEqual(queue.work_until_empty(), 4)
+        self.assertEqual(calls, [[2, 3, 4], [6]])
+
+        failed = Job.objects.get(payload__n=3)
+        self.assertEqual((failed.status, failed.attempts, failed.last_error), ('queued', 1, 'нечетное'))
+        self.assertGreater(failed.run_at, timezone.now() + timedelta(seconds=29))
+        self.assertEqual(Job.objects.filter(status='done').count(), 3)
+
+    def test_retries_until_max_attempts(self):
+        job = queue.enqueue('test_echo', {'n': -1})
+        with override_settings(JOBS={**settings.JOBS, 'BACKOFF_BASE': 0}), self.assertLogs('jobs.queue', 'ERROR'):
+            queue.work_until_empty()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIn('RuntimeError: пачка', job.last_error)
+        self.assertEqual(calls, [[-1], [-1]])
+
+    def test_key_enqueues_once_and_unknown_kind_fails(self):
+        first = queue.enqueue('test_echo', {'n': 2}, key='once')
+        self.assertEqual(queue.enqueue('test_echo', {'n': 4}, key='once').pk, first.pk)
+        unknown = queue.enqueue('no_such_task', {})
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.work_until_empty()
+        unknown.refresh_from_db()
+        self.assertEqual(unknown.status, 'failed')
+        self.assertEqual(calls, [[2]])
+
+    def test_expired_lease_is_reclaimed(self):
+        job = queue.enqueue('test_echo', {'n': 2})
+        self.assertEqual(len(queue.claim('crashed', 10)), 1)
+        self.assertEqual(queue.claim('other', 10), []) # Аренда еще действует
+        later = timezone.now() + timedelta(seconds=settings.JOBS['LEASE'] + 1)
+        reclaimed = queue.claim('other', 10, now=later)
+        self.assertEqual([item.pk for item in reclaimed], [job.pk])
+        queue.run(reclaimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('done', 2))
+
+
+@override_settings(SMS_BACKEND='jobs.transports.LocmemSMSBackend')
+class NotificationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        settings_cache.reset_local()
+        transports.outbox.clear()
+        admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True, role='admin')
+        admin.profile.phone = '+77010000000'
+        admin.profile.save()
+
+    def set_flags(self, **flags):
+        system = SystemSettings.load()
+        for name, value in flags.items():
+            setattr(system, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            system.save()
+
+    def apply(self, phone='+77011234567'):
+        return self.client.post(reverse('application-list'), {'name': 'Айгуль', 'phone': phone, 'subject': 'Физика'})
+
+    def test_new_applications_are_sent_in_one_digest(self):
+        self.assertEqual(self.apply().status_code, 201)
+        self.assertEqual(self.apply(phone='87011234567').status_code, 200) # Объединена — без уведомления
+        self.assertEqual(self.apply(phone='+77017654321').status_code, 201)
+        self.assertEqual(len(mail.outbox), 0) # Ответ формы не ждет отправки
+        self.assertEqual(Job.objects.filter(kind=APPLICATION_CREATED).count(), 2)
+
+        queue.work_until_empty()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Новые заявки: 2')
+        self.assertEqual(mail.outbox[0].to, ['admin@example.com'])
+        self.assertIn('Айгуль, +77011234567 — Физика', mail.outbox[0].body)
+        self.assertEqual(transports.outbox, [('+77010000000', 'Munificent School: новых заявок — 2')])
+
+    def test_disabled_channels_are_respected(self):
+        self.set_flags(email_notifications=False)
+        self.apply()
+        queue.work_until_empty()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(len(transports.outbox), 1)
+
+        self.set_flags(sms_notifications=False)
+        self.apply(phone='+77017654321')
+        self.assertFalse(Job.objects.filter(kind=APPLICATION_CREATED, status='queued').exists())
+
+    def test_class_reminders(self):
+        student = User.objects.create_user(username='student', email='student@example.com', role='student')
+        student.profile.phone = '+77020000001'
+        student.profile.parent_phone = '+77020000002'
+        student.profile.save()
+        course = Course.objects.create(title='Алгебра', subject='Математика', price=1000)
+        student.profile.enrolled_courses.add(course)
+        start = timezone.now() + timedelta(hours=1)
+        Lesson.objects.create(course=course, title='Дроби', start=start, end=start + timedelta(hours=1))
+        later = start + timedelta(days=1)
+        Lesson.objects.create(course=course, title='Степени', start=later, end=later + timedelta(hours=1))
+        Course.objects.create(title='Без учеников', subject='Физика', price=1000).lessons.create(
+            title='Урок', start=start, end=start + timedelta(hours=1),
+        )
+
+        self.assertEqual(enqueue_class_reminders(), 1)
+        self.assertEqual(enqueue_class_reminders(), 0) # Уже в очереди
+        queue.work_until_empty()
+        self.assertEqual(Job.objects.get(kind=CLASS_REMINDER).status, 'done')
+        self.assertEqual(mail.outbox[0].to, ['student@example.com'])
+        self.assertIn('«Дроби»', mail.outbox[0].body)
+        self.assertEqual(sorted(phone for phone, text in transports.outbox), ['+77020000001', '+77020000002'])
+
+        self.set_flags(class_reminders=False)
+        self.assertEqual(enqueue_class_reminders(now=later - timedelta(hours=1)), 0)
@@ -0,0 +1,59 @@
+# backend/jobs/transports.py
+#
+# Отправка писем и SMS пачкой. Письма идут через EMAIL_BACKEND Django по одному
+# соединению на пачку; SMS — через SMS_BACKEND. Шлюз SMS подключается своим классом
+# с методом send_messages; в комплекте только локальные заменители:
+# ConsoleSMSBackend (печатает в stdout) и LocmemSMSBackend (копит в outbox, для тестов).
+
+import sys
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+
+# Отправленные LocmemSMSBackend сообщения: [(телефон, текст), ...]
+outbox = []
+
+
+def send_emails(messages):
+    """messages: [(тема, текст, [адреса]), ...]. Возвращает {индекс: ошибка} для неотправленных."""
+    errors = {}
+    if not messages:
+        return errors
+    with get_connection() as connection:
+        for index, (subject, body, recipients) in enumerate(messages):
+            try:
+                EmailMessage(subject, body, to=recipients, connection=connection).send()
+            except Exception as exc:
+                errors[index] = f'email {recipients}: {exc}'
+    return errors
+
+
+def send_sms(messages):
+    """messages: [(телефон, текст), ...]. Возвращает {индекс: ошибка} для неотправленных."""
+    if not messages:
+        return {}
+    return import_string(settings.SMS_BACKEND)().send_messages(messages)
+
+
+class BaseSMSBackend:
+    def send_messages(self, messages):
+        raise NotImplementedError
+
+
+class ConsoleSMSBackend(BaseSMSBackend):
+    lock = threading.Lock()
+
+    def send_messages(self, messages):
+        with self.lock:
+            for phone, text in messages:
+                sys.stdout.write(f'SMS {phone}: {text}\n')
+            sys.stdout.flush()
+        return {}
+
+
+class LocmemSMSBackend(BaseSMSBackend):
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        return {}
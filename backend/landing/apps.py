@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class LandingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'landing'
+    verbose_name = 'Главная страница'
+
+    def ready(self):
+        import landing.signals # noqa
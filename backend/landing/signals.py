@@ -0,0 +1,57 @@
+# backend/landing/signals.py
+#
+# Пересборка документа главной страницы после изменения данных, которые в нем выводятся.
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from blog.models import Post, Category
+from courses.models import Course
+from httpcache.signals import IGNORED_USER_FIELDS
+from reviews.models import Review
+from system_settings.models import SystemSettings
+from users.models import User, Profile
+from users.signals import enrollments_bulk_changed
+from .snapshot import schedule_rebuild
+
+# Category — название категории в постах, User и Profile — преподаватели и преподаватель в курсах
+LANDING_MODELS = (SystemSettings, Course, Review, Post, Category, User, Profile)
+
+
+@receiver(post_save)
+def model_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if sender not in LANDING_MODELS or raw:
+        return
+    if sender is User and update_fields is not None and set(update_fields) <= IGNORED_USER_FIELDS:
+        return
+    schedule_rebuild()
+
+
+@receiver(post_delete)
+def model_deleted(sender, instance, **kwargs):
+    if sender in LANDING_MODELS:
+        schedule_rebuild()
+
+
+def teaches(profile_ids):
+    return Profile.objects.filter(pk__in=profile_ids, user__role='teacher').exists()
+
+
+@receiver(m2m_changed, sender=Profile.enrolled_courses.through)
+def enrollments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Курсы выводятся в профиле преподавателя; записи учеников документ не меняют
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        changed = instance.user.role == 'teacher'
+    else:
+        # post_clear у курса приходит без pk_set — очищенных профилей уже не найти
+        changed = pk_set is None or teaches(pk_set)
+    if changed:
+        schedule_rebuild()
+
+
+@receiver(enrollments_bulk_changed)
+def enrollments_bulk_changed_handler(sender, changes, **kwargs):
+    if teaches(list(changes)):
+        schedule_rebuild()
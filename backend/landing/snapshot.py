@@ -0,0 +1,111 @@
+# backend/landing/snapshot.py
+#
+# Данные главной страницы одним документом: публичные настройки школы, курсы,
+# опубликованные отзывы, преподаватели и последние посты — то же, что отдают
+# /api/settings/, /api/courses/, /api/reviews/, /api/public-teachers/ и /api/posts/.
+# Документ собирается фоновой задачей (jobs) после изменения любой из этих моделей
+# (landing/signals.py) и хранится в общем кеше уже готовыми байтами: JSON и его gzip.
+# Запрос страницы только читает кеш — без ORM и сериализаторов.
+#
+# Ссылки на файлы (аватары) в документе относительные: он не зависит от адреса запроса.
+# Если воркер не запущен, документ, помеченный устаревшим, пересобирает сам запрос —
+# не раньше чем через LANDING['REBUILD_AFTER'] секунд после изменения.
+
+import gzip
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from backend.renderers import dumps
+from blog.models import Post
+from blog.serializers import PostListSerializer
+from courses.models import Course
+from courses.serializers import CourseListSerializer
+from jobs.models import Job
+from jobs.queue import enqueue, task
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from system_settings.models import SystemSettings
+from users.models import User
+from users.serializers import TeacherPublicSerializer
+
+KEY = 'landing:snapshot'
+# Время первого изменения, которого еще нет в документе
+DIRTY_KEY = 'landing:dirty'
+LOCK_KEY = 'landing:lock'
+LOCK_TIMEOUT = 30
+
+REBUILD = 'landing_snapshot'
+
+SETTINGS_FIELDS = ('school_name', 'address', 'phone', 'email', 'currency')
+
+
+def collect():
+    limits = settings.LANDING
+    # Настройки из БД, а не из копии процесса (system_settings.cache): она может отставать на LOCAL_TTL
+    system, _ = SystemSettings.objects.get_or_create(pk=1)
+    courses = CourseListSerializer.setup_eager_loading(Course.objects.order_by('id'))
+    teachers = TeacherPublicSerializer.setup_eager_loading(
+        User.objects.filter(role='teacher', is_active=True).order_by('id')
+    )
+    posts = PostListSerializer.setup_eager_loading(Post.objects.order_by('-created_at'))
+    return {
+        'settings': {name: getattr(system, name) for name in SETTINGS_FIELDS},
+        'courses': CourseListSerializer(courses[:limits['COURSES']], many=True).data,
+        'reviews': ReviewSerializer(Review.objects.filter(is_published=True).order_by('-id')[:limits['REVIEWS']], many=True).data,
+        'teachers': TeacherPublicSerializer(teachers[:limits['TEACHERS']], many=True).data,
+        'posts': PostListSerializer(posts[:limits['POSTS']], many=True).data,
+    }
+
+
+def build():
+    """Собирает документ и кладет его в кеш. Возвращает запись кеша."""
+    dirty = cache.get(DIRTY_KEY)
+    content = dumps(collect())
+    entry = {
+        'etag': '"%s"' % hashlib.sha256(content).hexdigest()[:32],
+        'json': content,
+        'gzip': gzip.compress(content, compresslevel=9, mtime=0),
+        'built_at': timezone.now(),
+    }
+    cache.set(KEY, entry, timeout=None)
+    # Изменение во время сборки оставляет отметку: документ мог его не увидеть
+    if dirty is not None and cache.get(DIRTY_KEY) == dirty:
+        cache.delete(DIRTY_KEY)
+    return entry
+
+
+def get_snapshot():
+    """Запись кеша с документом; собирает ее, только если документа нет или он давно устарел."""
+    found = cache.get_many([KEY, DIRTY_KEY])
+    entry, dirty = found.get(KEY), found.get(DIRTY_KEY)
+    if entry is not None and (dirty is None or time.time() - dirty < settings.LANDING['REBUILD_AFTER']):
+        return entry
+    # Собирает один запрос; остальные пока отдают старый документ
+    if entry is not None and not cache.add(LOCK_KEY, 1, timeout=LOCK_TIMEOUT):
+        return entry
+    try:
+        return build()
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+@task(REBUILD)
+def rebuild(payloads):
+    # Несколько изменений подряд — одна сборка
+    build()
+
+
+def schedule_rebuild():
+    """Помечает документ устаревшим и ставит сборку в очередь после коммита."""
+    def schedule():
+        cache.add(DIRTY_KEY, time.time(), timeout=None)
+        if not Job.objects.filter(kind=REBUILD, status='queued').exists():
+            # Задержка собирает серию изменений (например, правки в админке) в одну сборку
+            enqueue(REBUILD, {}, run_at=timezone.now() + timedelta(seconds=settings.LANDING['DEBOUNCE']))
+    transaction.on_commit(schedule)
@@ -0,0 +1,108 @@
+import gzip
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Category, Post
+from courses.models import Course
+from jobs import queue
+from jobs.models import Job
+from reviews.models import Review
+from system_settings.models import SystemSettings
+from users.models import User
+from . import snapshot
+
+
+@override_settings(LANDING={**settings.LANDING, 'DEBOUNCE': 0})
+class LandingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', first_name='Анна', role='teacher')
+        category = Category.objects.create(name='Новости', slug='news')
+        Post.objects.create(title='Пост', content='Текст', author=self.teacher, category=category)
+        self.course = Course.objects.create(title='Алгебра', subject='Математика', price=1000, teacher=self.teacher)
+        Review.objects.create(author='Мама ученика', text='Спасибо', is_published=True)
+        Review.objects.create(author='Скрытый', text='Черновик', is_published=False)
+
+    def get(self, **headers):
+        return self.client.get(reverse('landing'), **headers)
+
+    def data(self):
+        return json.loads(self.get().content)
+
+    def change(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            action()
+
+    def test_document_and_compression(self):
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('public', response['Cache-Control'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(set(data), {'settings', 'courses', 'reviews', 'teachers', 'posts'})
+        self.assertEqual([review['author'] for review in data['reviews']], ['Мама ученика'])
+        self.assertEqual(data['courses'][0]['teacher_details']['first_name'], 'Анна')
+        self.assertEqual([teacher['id'] for teacher in data['teachers']], [self.teacher.pk])
+
+        plain = self.get()
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(json.loads(plain.content), data)
+        self.assertEqual(plain['ETag'], response['ETag'])
+
+        for header in ('gzip;q=0, deflate', 'br, *;q=0', 'identity', '*;q=0.5, gzip; q=0'):
+            self.assertNotIn('Content-Encoding', self.get(HTTP_ACCEPT_ENCODING=header), header)
+        for header in ('GZIP;q=0.5', 'br, *', 'identity;q=1, gzip;q=0.1'):
+            self.assertEqual(self.get(HTTP_ACCEPT_ENCODING=header)['Content-Encoding'], 'gzip', header)
+
+    def test_warm_requests_skip_orm_and_serializers(self):
+        etag = self.get()['ETag']
+        with self.assertNumQueries(0), mock.patch.object(snapshot, 'collect') as collect:
+            self.assertEqual(self.get(HTTP_ACCEPT_ENCODING='gzip').status_code, 200)
+            self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        collect.assert_not_called()
+
+    def test_changes_rebuild_in_background(self):
+        etag = self.get()['ETag']
+        self.change(lambda: Course.objects.create(title='Физика', subject='Физика', price=2000))
+        review = Review.objects.get(is_published=False)
+        review.is_published = True
+        self.change(review.save)
+        self.assertEqual(Job.objects.filter(kind=snapshot.REBUILD).count(), 1) # Серия изменений — одна сборка
+        self.assertEqual(self.get()['ETag'], etag) # До сборки — прежний документ
+
+        queue.work_until_empty()
+        data = self.data()
+        self.assertEqual([course['title'] for course in data['courses']], ['Алгебра', 'Физика'])
+        self.assertEqual(len(data['reviews']), 2)
+        self.assertIsNone(cache.get(snapshot.DIRTY_KEY))
+
+        system = SystemSettings.load()
+        system.school_name = 'Новая школа'
+        self.change(system.save)
+        queue.work_until_empty()
+        self.assertEqual(self.data()['settings']['school_name'], 'Новая школа')
+
+    def test_ignored_changes(self):
+        self.get()
+        student = User.objects.create_user(username='student', role='student')
+        Job.objects.all().delete()
+        self.change(lambda: User.objects.filter(pk=self.teacher.pk).first().save(update_fields=['last_login']))
+        self.change(lambda: student.profile.enrolled_courses.add(self.course))
+        self.assertFalse(Job.objects.filter(kind=snapshot.REBUILD).exists())
+
+        self.change(lambda: self.teacher.profile.enrolled_courses.add(self.course))
+        self.assertTrue(Job.objects.filter(kind=snapshot.REBUILD).exists())
+
+    def test_request_rebuilds_when_worker_lags(self):
+        self.get()
+        self.change(lambda: Course.objects.create(title='Физика', subject='Физика', price=2000))
+        self.assertEqual(len(self.data()['courses']), 1)
+        with override_settings(LANDING={**settings.LANDING, 'REBUILD_AFTER': 0}):
+            self.assertEqual(len(self.data()['courses']), 2)
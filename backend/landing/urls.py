@@ -0,0 +1,8 @@
+# backend/landing/urls.py
+
+from django.urls import path
+from .views import landing_view
+
+urlpatterns = [
+    path('', landing_view, name='landing'),
+]
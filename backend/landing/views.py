@@ -0,0 +1,44 @@
+# backend/landing/views.py
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import parse_header_parameters
+from django.views.decorators.http import require_GET
+
+from .snapshot import get_snapshot
+
+# Столько секунд браузер и прокси не перепроверяют документ
+MAX_AGE = 60
+
+
+def accepts_gzip(header):
+    """Разрешает ли Accept-Encoding gzip: явно или через *, с q больше 0 (gzip;q=0 — запрет)."""
+    weights = {}
+    for item in header.split(','):
+        coding, params = parse_header_parameters(item)
+        try:
+            weights[coding] = float(params.get('q', 1))
+        except ValueError:
+            weights[coding] = 0
+    return weights.get('gzip', weights.get('*', 0)) > 0
+
+
+@require_GET
+def landing_view(request):
+    """
+    Документ главной страницы (landing/snapshot.py). Обычный view Django, а не DRF:
+    ни аутентификации, ни согласования формата — ответ отдается готовыми байтами,
+    сжатыми заранее, если клиент принимает gzip.
+    """
+    entry = get_snapshot()
+    response = get_conditional_response(request, etag=entry['etag'])
+    if response is None:
+        if accepts_gzip(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(entry['gzip'], content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(entry['json'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=MAX_AGE)
+    return response
@@ -12,6 +12,10 @@ class Review(models.Model):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ['-id']
+        indexes = [
+            # Частичный индекс: на сайте читаются только опубликованные отзывы, новые сверху
+            models.Index(fields=['-id'], condition=models.Q(is_published=True), name='review_published_idx'),
+        ]
 
     def __str__(self):
         return f'Отзыв от {self.author}'
\ No newline at end of file
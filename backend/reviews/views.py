@@ -1,8 +1,13 @@
 from rest_framework import viewsets, permissions
 from .models import Review
 from .serializers import ReviewSerializer
+from backend.mixins import CompiledListMixin, ReplicaReadMixin
+from httpcache.mixins import ConditionalGetMixin
 
-class ReviewViewSet(viewsets.ReadOnlyModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin, CompiledListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Review.objects.filter(is_published=True)
     serializer_class = ReviewSerializer
-    permission_classes = [permissions.AllowAny] # Отзывы доступны всем
\ No newline at end of file
+    permission_classes = [permissions.AllowAny] # Отзывы доступны всем
+    ordering = '-id'
+    version_models = ('reviews.Review',)
+    response_cache = True
\ No newline at end of file
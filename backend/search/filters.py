@@ -0,0 +1,19 @@
+# backend/search/filters.py
+
+from rest_framework import filters
+
+from .index import matching_ids
+
+
+class FullTextSearchFilter(filters.BaseFilterBackend):
+    """
+    Замена SearchFilter: ?search= ищет по полнотекстовому индексу (search.SearchEntry)
+    вместо ILIKE '%q%' по колонкам. Тип записей берется из атрибута ViewSet `search_kind`.
+    """
+    search_param = filters.SearchFilter.search_param
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return queryset.filter(pk__in=matching_ids(view.search_kind, text))
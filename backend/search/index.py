@@ -0,0 +1,184 @@
+# backend/search/index.py
+
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from blog.models import Post
+from courses.models import Course, Lesson
+from users.models import User
+from .models import SearchEntry
+
+SEARCH_CONFIG = 'russian'
+MARK_START, MARK_END = '<mark>', '</mark>'
+
+
+# --- Построение документов ---
+
+def course_document(course):
+    teacher = course.teacher.get_full_name() if course.teacher else ''
+    return {'title': course.title, 'body': ' '.join(filter(None, [course.subject, teacher, course.description]))}
+
+
+def lesson_document(lesson):
+    return {'title': lesson.title, 'body': lesson.content or '', 'course_id': lesson.course_id}
+
+
+def post_document(post):
+    return {'title': post.title, 'body': ' '.join(filter(None, [post.excerpt, post.content]))}
+
+
+def teacher_document(user):
+    profile = getattr(user, 'profile', None)
+    parts = [profile.public_subjects, profile.public_description] if profile else []
+    return {'title': user.get_full_name() or user.username, 'body': ' '.join(filter(None, parts))}
+
+
+def is_public_teacher(user):
+    # Те же условия, что у TeacherPublicViewSet
+    return user.role == 'teacher' and user.is_active
+
+
+DOCUMENTS = {
+    'course': course_document,
+    'lesson': lesson_document,
+    'post': post_document,
+    'teacher': teacher_document,
+}
+
+
+# --- Обновление индекса ---
+
+def update_vector(queryset):
+    if connection.vendor == 'postgresql':
+        queryset.update(
+            search_vector=SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('body', weight='B', config=SEARCH_CONFIG)
+        )
+
+
+def index_object(kind, obj):
+    document = DOCUMENTS[kind](obj)
+    SearchEntry.objects.update_or_create(kind=kind, object_id=obj.pk, defaults=document)
+    update_vector(SearchEntry.objects.filter(kind=kind, object_id=obj.pk))
+
+
+def unindex_object(kind, pk):
+    SearchEntry.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(batch_size=1000):
+    """Полностью перестраивает индекс. Возвращает количество записей по типам."""
+    SearchEntry.objects.all().delete()
+    querysets = {
+        'course': Course.objects.select_related('teacher'),
+        'lesson': Lesson.objects.all(),
+        'post': Post.objects.all(),
+        'teacher': User.objects.filter(role='teacher', is_active=True).select_related('profile'),
+    }
+    counts = {}
+    for kind, queryset in querysets.items():
+        build = DOCUMENTS[kind]
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(SearchEntry(kind=kind, object_id=obj.pk, **build(obj)))
+            if len(batch) >= batch_size:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        counts[kind] = SearchEntry.objects.filter(kind=kind).count()
+    update_vector(SearchEntry.objects.all())
+    return counts
+
+
+# --- Поиск ---
+
+def visible_entries(user):
+    """Уроки видны только администраторам и ученикам, записанным на курс."""
+    entries = SearchEntry.objects.all()
+    if user is not None and user.is_authenticated and user.is_staff:
+        return entries
+    lessons = Q(kind='lesson')
+    if user is not None and user.is_authenticated and hasattr(user, 'profile'):
+        lessons &= ~Q(course__in=user.profile.enrolled_courses.values('pk'))
+    return entries.exclude(lessons)
+
+
+def fts5_query(text):
+    # Каждое слово — префиксный запрос: в FTS5 нет русского стеммера, префикс заменяет его
+    words = re.findall(r'\w+', text)
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def search(text, kinds=None, user=None, limit=20):
+    """
+    Ранжированный поиск по индексу. Возвращает список словарей
+    с полями kind, object_id, title, title_highlight и highlight (фрагмент текста) с <mark>, rank.
+    """
+    entries = visible_entries(user)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    if not text.strip():
+        return []
+
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        rows = (
+            entries.filter(search_vector=query)
+            .annotate(
+                rank=SearchRank(F('search_vector'), query),
+                title_highlight=SearchHeadline(
+                    'title', query, config=SEARCH_CONFIG, start_sel=MARK_START, stop_sel=MARK_END, highlight_all=True,
+                ),
+                highlight=SearchHeadline(
+                    'body', query, config=SEARCH_CONFIG, start_sel=MARK_START, stop_sel=MARK_END, max_words=30,
+                ),
+            )
+            .order_by('-rank', 'pk')
+            .values('kind', 'object_id', 'title', 'title_highlight', 'highlight', 'rank')[:limit]
+        )
+        return list(rows)
+
+    if connection.vendor == 'sqlite':
+        match = fts5_query(text)
+        if not match:
+            return []
+        # bm25: чем меньше, тем релевантнее; заголовок весит в 10 раз больше текста
+        visible_sql, visible_params = entries.values('pk').query.sql_with_params()
+        rows = SearchEntry.objects.raw(
+            'SELECT e.id, e.kind, e.object_id, e.title, bm25(search_fts, 10.0, 1.0) AS rank, '
+            'highlight(search_fts, 0, %s, %s) AS title_highlight, '
+            "snippet(search_fts, 1, %s, %s, '…', 30) AS highlight "
+            'FROM search_fts JOIN search_searchentry e ON e.id = search_fts.rowid '
+            f'WHERE search_fts MATCH %s AND e.id IN ({visible_sql}) ORDER BY rank LIMIT %s',
+            [MARK_START, MARK_END, MARK_START, MARK_END, match, *visible_params, limit],
+        )
+        return [
+            {'kind': row.kind, 'object_id': row.object_id, 'title': row.title,
+             'title_highlight': row.title_highlight, 'highlight': row.highlight, 'rank': -row.rank}
+            for row in rows
+        ]
+
+    # Прочие СУБД: без индекса, только чтобы поиск не падал
+    rows = entries.filter(Q(title__icontains=text) | Q(body__icontains=text)).values('kind', 'object_id', 'title')
+    return [{**row, 'title_highlight': row['title'], 'highlight': '', 'rank': 0.0} for row in rows[:limit]]
+
+
+def matching_ids(kind, text):
+    """ID объектов одного типа, подходящих под запрос, — для фильтра в ViewSet."""
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        return SearchEntry.objects.filter(kind=kind, search_vector=query).values('object_id')
+    if connection.vendor == 'sqlite':
+        match = fts5_query(text)
+        if not match:
+            return SearchEntry.objects.none().values('object_id')
+        return SearchEntry.objects.filter(
+            kind=kind, pk__in=RawSQL('SELECT rowid FROM search_fts WHERE search_fts MATCH %s', [match]),
+        ).values('object_id')
+    return SearchEntry.objects.filter(kind=kind).filter(
+        Q(title__icontains=text) | Q(body__icontains=text)
+    ).values('object_id')
@@ -0,0 +1,15 @@
+# backend/search/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Полностью перестраивает поисковый индекс по курсам, урокам, постам и преподавателям.'
+
+    def handle(self, *args, **options):
+        counts = rebuild()
+        for kind, count in counts.items():
+            self.stdout.write(f'{kind}: {count}')
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+# Полнотекстовый индекс зависит от СУБД, поэтому создается вручную:
+# PostgreSQL — GIN по search_vector, SQLite — виртуальная таблица FTS5 с триггерами синхронизации.
+# На SQLite любое изменение схемы SearchEntry пересоздает таблицу и удаляет триггеры —
+# такая миграция должна создать их заново.
+
+POSTGRESQL_FORWARD = [
+    'CREATE INDEX search_entry_vector_gin ON search_searchentry USING gin (search_vector)',
+]
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS search_entry_vector_gin',
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE search_fts USING fts5("
+    "title, body, content='search_searchentry', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER search_fts_insert AFTER INSERT ON search_searchentry BEGIN '
+    'INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END',
+    'CREATE TRIGGER search_fts_delete AFTER DELETE ON search_searchentry BEGIN '
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    'CREATE TRIGGER search_fts_update AFTER UPDATE ON search_searchentry BEGIN '
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    'INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END',
+    "INSERT INTO search_fts(search_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS search_fts_insert',
+    'DROP TRIGGER IF EXISTS search_fts_delete',
+    'DROP TRIGGER IF EXISTS search_fts_update',
+    'DROP TABLE IF EXISTS search_fts',
+]
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': POSTGRESQL_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run({'postgresql': POSTGRESQL_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
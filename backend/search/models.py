@@ -0,0 +1,37 @@
+# backend/search/models.py
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from courses.models import Course
+
+
+class SearchEntry(models.Model):
+    """
+    Запись поискового индекса: курс, урок, пост или публичный преподаватель.
+    - PostgreSQL: поле search_vector (русская морфология) с GIN-индексом;
+    - SQLite: виртуальная таблица FTS5 search_fts, синхронизируется триггерами.
+    Индексы создаются в миграции 0002 в зависимости от СУБД.
+    """
+    KIND_CHOICES = (
+        ('course', 'Курс'),
+        ('lesson', 'Урок'),
+        ('post', 'Пост'),
+        ('teacher', 'Преподаватель'),
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name='Тип')
+    object_id = models.BigIntegerField(verbose_name='ID объекта')
+    # Для уроков: курс, по которому проверяется доступ
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    title = models.CharField(max_length=255, verbose_name='Заголовок')
+    body = models.TextField(blank=True, verbose_name='Текст')
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = 'Запись поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}: {self.title}'
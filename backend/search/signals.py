@@ -0,0 +1,68 @@
+# backend/search/signals.py
+#
+# Инкрементальное обновление поискового индекса при сохранении и удалении объектов.
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from blog.models import Post
+from courses.models import Course, Lesson
+from users.models import User, Profile
+from .index import index_object, unindex_object, is_public_teacher
+
+# Поля пользователя, от которых зависят документы преподавателя и его курсов
+TEACHER_FIELDS = {'first_name', 'last_name', 'role', 'is_active'}
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, **kwargs):
+    index_object('course', instance)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    unindex_object('course', instance.pk)
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_saved(sender, instance, **kwargs):
+    index_object('lesson', instance)
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_deleted(sender, instance, **kwargs):
+    unindex_object('lesson', instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, **kwargs):
+    index_object('post', instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    unindex_object('post', instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not TEACHER_FIELDS & set(update_fields):
+        return # Например, обновление last_login при входе
+    if is_public_teacher(instance):
+        index_object('teacher', instance)
+    else:
+        unindex_object('teacher', instance.pk)
+    # Имя преподавателя входит в документ курса
+    for course in instance.teaching_courses.select_related('teacher'):
+        index_object('course', course)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    unindex_object('teacher', instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, **kwargs):
+    if is_public_teacher(instance.user):
+        index_object('teacher', instance.user)
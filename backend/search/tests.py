@@ -0,0 +1,66 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Post
+from courses.models import Course, Lesson
+from users.models import User
+from .index import rebuild
+from .models import SearchEntry
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', first_name='Айгерим', last_name='Садыкова', role='teacher')
+        self.teacher.profile.public_subjects = 'Физика'
+        self.teacher.profile.save()
+        self.course = Course.objects.create(title='Подготовка к ЕНТ по физике', subject='Физика', price=30000, teacher=self.teacher)
+        self.lesson = Lesson.objects.create(course=self.course, title='Законы Ньютона', content='Динамика и законы движения')
+        self.post = Post.objects.create(title='Как готовиться к олимпиаде', content='Советы по физике и математике', author=self.teacher)
+
+    def search(self, **params):
+        response = self.client.get(reverse('search'), params)
+        self.assertEqual(response.status_code, 200)
+        return {(row['type'], row['id']) for row in response.data['results']}
+
+    def test_results_span_kinds_and_are_highlighted(self):
+        found = self.search(q='физике')
+        self.assertIn(('course', self.course.pk), found)
+        self.assertIn(('post', self.post.pk), found)
+        response = self.client.get(reverse('search'), {'q': 'олимпиаде'})
+        self.assertEqual(response.data['results'][0]['title_highlight'], 'Как готовиться к <mark>олимпиаде</mark>')
+        response = self.client.get(reverse('search'), {'q': 'математике', 'type': 'post'})
+        self.assertIn('<mark>математике</mark>', response.data['results'][0]['highlight'])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.course.title = 'Астрономия'
+        self.course.save()
+        self.assertIn(('course', self.course.pk), self.search(q='Астрономия'))
+        self.post.delete()
+        self.assertEqual(self.search(q='олимпиаде'), set())
+        self.teacher.last_name = 'Нурланова'
+        self.teacher.save()
+        self.assertIn(('teacher', self.teacher.pk), self.search(q='Нурланова'))
+        self.assertIn(('course', self.course.pk), self.search(q='Нурланова', type='course'))
+
+    def test_lessons_visible_only_to_enrolled_students_and_staff(self):
+        self.assertEqual(self.search(q='Ньютона'), set())
+        student = User.objects.create_user(username='student')
+        student.profile.enrolled_courses.add(self.course)
+        self.client.force_authenticate(student)
+        self.assertEqual(self.search(q='Ньютона'), {('lesson', self.lesson.pk)})
+
+    def test_viewset_search_param_uses_index(self):
+        Course.objects.create(title='Химия', subject='Химия', price=1000)
+        response = self.client.get(reverse('course-list'), {'search': 'Садыкова'})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.course.pk])
+        response = self.client.get(reverse('post-list'), {'search': 'олимпиаде'})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.post.pk])
+
+    def test_rebuild_restores_index(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(rebuild(), {'course': 1, 'lesson': 1, 'post': 1, 'teacher': 1})
+        self.assertIn(('course', self.course.pk), self.search(q='физике'))
+
+    def test_unknown_type_is_rejected(self):
+        response = self.client.get(reverse('search'), {'q': 'физика', 'type': 'users'})
+        self.assertEqual(response.status_code, 400)
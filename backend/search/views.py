@@ -0,0 +1,47 @@
+# backend/search/views.py
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from .index import search
+from .models import SearchEntry
+
+KINDS = {kind for kind, _ in SearchEntry.KIND_CHOICES}
+MAX_LIMIT = 50
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_view(request):
+    """
+    Единый поиск по курсам, урокам, постам и публичным преподавателям.
+    Параметры: q — запрос, type — типы через запятую, limit — до 50 результатов.
+    Уроки в выдаче только для администраторов и записанных на курс учеников.
+    """
+    text = request.query_params.get('q', '').strip()
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    if set(kinds) - KINDS:
+        return Response({'error': f'Неизвестный тип. Допустимые: {", ".join(sorted(KINDS))}.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), MAX_LIMIT))
+    except ValueError:
+        return Response({'error': 'limit должен быть числом.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = search(text, kinds=kinds, user=request.user, limit=limit)
+    return Response({
+        'query': text,
+        'results': [
+            {
+                'type': row['kind'],
+                'id': row['object_id'],
+                'title': row['title'],
+                'title_highlight': row['title_highlight'],
+                'highlight': row['highlight'],
+                'rank': round(float(row['rank']), 4),
+            }
+            for row in results
+        ],
+    })
@@ -0,0 +1,119 @@
+# backend/stats/counters.py
+
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, DateField, F
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import Counter, DailyApplicationStat, CourseEnrollmentStat, WeeklyStudentStat
+
+ROLE_COUNTERS = {'student': 'students', 'teacher': 'teachers'}
+# Все ключи Counter: без любого из них счетчики неполные и пересчитываются
+COUNTER_KEYS = frozenset({'students', 'teachers', 'courses', 'applications', 'reviews', 'published_reviews'})
+
+
+def bump(model, delta, **lookup):
+    """
+    Атомарно прибавляет delta к полю count строки lookup.
+    Строка создается только при положительном delta: уменьшать несуществующий
+    счетчик незачем, а строка удаленного курса не должна появиться заново.
+    """
+    if not delta:
+        return
+    if model.objects.filter(**lookup).update(count=F('count') + delta) or delta < 0:
+        return
+    model.objects.get_or_create(**lookup)
+    model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def day_of(value):
+    return timezone.localdate(value)
+
+
+def week_of(value):
+    day = timezone.localdate(value)
+    return day - timedelta(days=day.weekday())
+
+
+@transaction.atomic
+def reconcile(apps=global_apps):
+    """
+    Полностью пересчитывает все счетчики по исходным таблицам.
+    Нужен после массовых операций в обход сигналов (bulk_create, queryset.update/delete).
+    apps — реестр моделей: в миграции передается исторический.
+    """
+    User = apps.get_model('users', 'User')
+    Profile = apps.get_model('users', 'Profile')
+    Course = apps.get_model('courses', 'Course')
+    Application = apps.get_model('applications', 'Application')
+    Review = apps.get_model('reviews', 'Review')
+    Counter = apps.get_model('stats', 'Counter')
+    DailyApplicationStat = apps.get_model('stats', 'DailyApplicationStat')
+    CourseEnrollmentStat = apps.get_model('stats', 'CourseEnrollmentStat')
+    WeeklyStudentStat = apps.get_model('stats', 'WeeklyStudentStat')
+
+    counters = {
+        'students': User.objects.filter(role='student').count(),
+        'teachers': User.objects.filter(role='teacher').count(),
+        'courses': Course.objects.count(),
+        'applications': Application.objects.count(),
+        'reviews': Review.objects.count(),
+        'published_reviews': Review.objects.filter(is_published=True).count(),
+    }
+    Counter.objects.all().delete()
+    Counter.objects.bulk_create(Counter(key=key, count=count) for key, count in counters.items())
+
+    DailyApplicationStat.objects.all().delete()
+    DailyApplicationStat.objects.bulk_create(
+        DailyApplicationStat(date=row['date'], status=row['status'], count=row['count'])
+        for row in Application.objects.annotate(date=TruncDate('created_at'))
+        .values('date', 'status').annotate(count=Count('id')).order_by()
+    )
+
+    CourseEnrollmentStat.objects.all().delete()
+    CourseEnrollmentStat.objects.bulk_create(
+        CourseEnrollmentStat(course_id=row['course_id'], count=row['count'])
+        for row in Profile.enrolled_courses.through.objects
+        .values('course_id').annotate(count=Count('id')).order_by()
+    )
+
+    WeeklyStudentStat.objects.all().delete()
+    WeeklyStudentStat.objects.bulk_create(
+        WeeklyStudentStat(week=row['week'], count=row['count'])
+        for row in User.objects.filter(role='student').annotate(week=TruncWeek('date_joined', output_field=DateField()))
+        .values('week').annotate(count=Count('id')).order_by()
+    )
+    return counters
+
+
+def dashboard_stats(days=30, weeks=12):
+    """Готовая статистика для дашборда администратора — только чтение маленьких таблиц."""
+    counters = dict(Counter.objects.values_list('key', 'count'))
+    if not COUNTER_KEYS <= counters.keys():
+        # Часть счетчиков создана сигналами без полного пересчета: цифры неверны
+        counters = reconcile()
+
+    today = timezone.localdate()
+    return {
+        'students_count': counters.get('students', 0),
+        'teachers_count': counters.get('teachers', 0),
+        'courses_count': counters.get('courses', 0),
+        'applications_count': counters.get('applications', 0),
+        'reviews_count': counters.get('reviews', 0),
+        'published_reviews_count': counters.get('published_reviews', 0),
+        'applications_by_day': list(
+            DailyApplicationStat.objects.filter(date__gt=today - timedelta(days=days), count__gt=0)
+            .order_by('date', 'status').values('date', 'status', 'count')
+        ),
+        'enrollments_by_course': list(
+            CourseEnrollmentStat.objects.filter(count__gt=0).order_by('-count', 'course_id')
+            .values('course_id', 'count', course_title=F('course__title'))
+        ),
+        'new_students_by_week': list(
+            WeeklyStudentStat.objects.filter(week__gt=today - timedelta(weeks=weeks), count__gt=0)
+            .order_by('week').values('week', 'count')
+        ),
+    }
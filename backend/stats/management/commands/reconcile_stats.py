@@ -0,0 +1,15 @@
+# backend/stats/management/commands/reconcile_stats.py
+
+from django.core.management.base import BaseCommand
+
+from stats.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересчитывает счетчики дашборда по исходным таблицам.'
+
+    def handle(self, *args, **options):
+        counters = reconcile()
+        for key, count in counters.items():
+            self.stdout.write(f'{key}: {count}')
+        self.stdout.write(self.style.SUCCESS('Счетчики пересчитаны.'))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0002_alter_course_subject_remove_testquestion_subject_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True, verbose_name='Ключ')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Значение')),
+            ],
+            options={
+                'verbose_name': 'Счетчик',
+                'verbose_name_plural': 'Счетчики',
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyStudentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(unique=True, verbose_name='Начало недели')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество')),
+            ],
+            options={
+                'verbose_name': 'Новые ученики за неделю',
+                'verbose_name_plural': 'Новые ученики по неделям',
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseEnrollmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество')),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_stat', to='courses.course', verbose_name='Курс')),
+            ],
+            options={
+                'verbose_name': 'Записи на курс',
+                'verbose_name_plural': 'Записи на курсы',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('status', models.CharField(max_length=10, verbose_name='Статус')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество')),
+            ],
+            options={
+                'verbose_name': 'Заявки за день',
+                'verbose_name_plural': 'Заявки по дням',
+                'constraints': [models.UniqueConstraint(fields=('date', 'status'), name='unique_daily_application_stat')],
+            },
+        ),
+    ]
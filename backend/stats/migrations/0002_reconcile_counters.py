@@ -0,0 +1,25 @@
+# Заполняет счетчики на существующей базе. Без этого первая же запись после деплоя
+# создает сигналами лишь часть счетчиков, и дашборд показывает неверные итоги.
+
+from django.db import migrations
+
+from stats.counters import reconcile
+
+
+def reconcile_counters(apps, schema_editor):
+    reconcile(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0001_initial'),
+        ('users', '0005_role_indexes'),
+        ('courses', '0004_lesson_start_index'),
+        ('applications', '0004_phone_dedup'),
+        ('reviews', '0003_published_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# backend/stats/models.py
+
+from django.db import models
+from courses.models import Course
+
+
+class Counter(models.Model):
+    """Общие счетчики для дашборда: students, teachers, courses, applications, reviews."""
+    key = models.CharField(max_length=50, unique=True, verbose_name='Ключ')
+    count = models.BigIntegerField(default=0, verbose_name='Значение')
+
+    class Meta:
+        verbose_name = 'Счетчик'
+        verbose_name_plural = 'Счетчики'
+
+    def __str__(self):
+        return f'{self.key}: {self.count}'
+
+
+class DailyApplicationStat(models.Model):
+    """Заявки, созданные в этот день, по их текущему статусу."""
+    date = models.DateField(verbose_name='Дата')
+    status = models.CharField(max_length=10, verbose_name='Статус')
+    count = models.IntegerField(default=0, verbose_name='Количество')
+
+    class Meta:
+        verbose_name = 'Заявки за день'
+        verbose_name_plural = 'Заявки по дням'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'status'], name='unique_daily_application_stat'),
+        ]
+
+
+class CourseEnrollmentStat(models.Model):
+    """Количество учеников, записанных на курс."""
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, related_name='enrollment_stat', verbose_name='Курс')
+    count = models.IntegerField(default=0, verbose_name='Количество')
+
+    class Meta:
+        verbose_name = 'Записи на курс'
+        verbose_name_plural = 'Записи на курсы'
+
+
+class WeeklyStudentStat(models.Model):
+    """Новые ученики за неделю (неделя начинается с понедельника)."""
+    week = models.DateField(unique=True, verbose_name='Начало недели')
+    count = models.IntegerField(default=0, verbose_name='Количество')
+
+    class Meta:
+        verbose_name = 'Новые ученики за неделю'
+        verbose_name_plural = 'Новые ученики по неделям'
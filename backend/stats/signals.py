@@ -0,0 +1,174 @@
+# backend/stats/signals.py
+#
+# Инкрементальное обновление счетчиков дашборда. Массовые операции в обход
+# сигналов (bulk_create, queryset.update/delete) здесь не видны — после них
+# нужно запускать `python manage.py reconcile_stats`.
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from applications.models import Application
+from courses.models import Course
+from reviews.models import Review
+from users.models import User, Profile
+from users.signals import enrollments_bulk_changed, students_imported
+from .counters import ROLE_COUNTERS, bump, day_of, week_of
+from .models import Counter, DailyApplicationStat, CourseEnrollmentStat, WeeklyStudentStat
+
+
+def remember_previous(instance, fields, update_fields):
+    """Сохраняет на экземпляре прежние значения полей, чтобы post_save мог посчитать разницу."""
+    instance._stats_previous = None
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    instance._stats_previous = type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+
+
+# --- Пользователи ---
+
+@receiver(pre_save, sender=User)
+def user_pre_save(sender, instance, update_fields=None, **kwargs):
+    remember_previous(instance, ['role'], update_fields)
+
+
+@receiver(post_save, sender=User)
+def user_post_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if created:
+        old_role = None
+    elif previous is not None and previous['role'] != instance.role:
+        old_role = previous['role']
+    else:
+        return
+    if old_role in ROLE_COUNTERS:
+        bump(Counter, -1, key=ROLE_COUNTERS[old_role])
+    if instance.role in ROLE_COUNTERS:
+        bump(Counter, 1, key=ROLE_COUNTERS[instance.role])
+    # Неделя регистрации считается для тех, кто сейчас ученик
+    if old_role == 'student':
+        bump(WeeklyStudentStat, -1, week=week_of(instance.date_joined))
+    if instance.role == 'student':
+        bump(WeeklyStudentStat, 1, week=week_of(instance.date_joined))
+
+
+@receiver(post_delete, sender=User)
+def user_post_delete(sender, instance, **kwargs):
+    if instance.role in ROLE_COUNTERS:
+        bump(Counter, -1, key=ROLE_COUNTERS[instance.role])
+    if instance.role == 'student':
+        bump(WeeklyStudentStat, -1, week=week_of(instance.date_joined))
+
+
+@receiver(students_imported)
+def students_imported_handler(sender, user_ids, date_joined, **kwargs):
+    bump(Counter, len(user_ids), key='students')
+    bump(WeeklyStudentStat, len(user_ids), week=week_of(date_joined))
+
+
+# --- Курсы и записи на курсы ---
+
+@receiver(post_save, sender=Course)
+def course_post_save(sender, instance, created, **kwargs):
+    if created:
+        bump(Counter, 1, key='courses')
+
+
+@receiver(post_delete, sender=Course)
+def course_post_delete(sender, instance, **kwargs):
+    bump(Counter, -1, key='courses')
+
+
+@receiver(m2m_changed, sender=Profile.enrolled_courses.through)
+def enrollments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # После clear() состав уже не узнать, поэтому запоминаем его заранее
+        if reverse:
+            instance._stats_cleared = {instance.pk: instance.enrolled_student_profiles.count()}
+        else:
+            instance._stats_cleared = dict.fromkeys(instance.enrolled_courses.values_list('pk', flat=True), 1)
+        return
+    if action == 'post_clear':
+        for course_id, count in instance.__dict__.pop('_stats_cleared', {}).items():
+            bump(CourseEnrollmentStat, -count, course_id=course_id)
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    sign = 1 if action == 'post_add' else -1
+    if reverse:
+        # course.enrolled_student_profiles.add(...): instance — курс, pk_set — профили
+        bump(CourseEnrollmentStat, sign * len(pk_set), course_id=instance.pk)
+    else:
+        for course_id in pk_set:
+            bump(CourseEnrollmentStat, sign, course_id=course_id)
+
+
+@receiver(enrollments_bulk_changed)
+def enrollments_bulk_changed_handler(sender, changes, **kwargs):
+    deltas = {}
+    for added, removed in changes.values():
+        for course_id in added:
+            deltas[course_id] = deltas.get(course_id, 0) + 1
+        for course_id in removed:
+            deltas[course_id] = deltas.get(course_id, 0) - 1
+    for course_id, delta in deltas.items():
+        bump(CourseEnrollmentStat, delta, course_id=course_id)
+
+
+@receiver(pre_delete, sender=Profile)
+def profile_pre_delete(sender, instance, **kwargs):
+    # Строки связи удаляются каскадом без m2m_changed и без сигналов удаления
+    for course_id in instance.enrolled_courses.values_list('pk', flat=True):
+        bump(CourseEnrollmentStat, -1, course_id=course_id)
+
+
+# --- Заявки ---
+
+@receiver(pre_save, sender=Application)
+def application_pre_save(sender, instance, update_fields=None, **kwargs):
+    remember_previous(instance, ['status'], update_fields)
+
+
+@receiver(post_save, sender=Application)
+def application_post_save(sender, instance, created, **kwargs):
+    day = day_of(instance.created_at)
+    if created:
+        bump(Counter, 1, key='applications')
+        bump(DailyApplicationStat, 1, date=day, status=instance.status)
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is not None and previous['status'] != instance.status:
+        bump(DailyApplicationStat, -1, date=day, status=previous['status'])
+        bump(DailyApplicationStat, 1, date=day, status=instance.status)
+
+
+@receiver(post_delete, sender=Application)
+def application_post_delete(sender, instance, **kwargs):
+    bump(Counter, -1, key='applications')
+    bump(DailyApplicationStat, -1, date=day_of(instance.created_at), status=instance.status)
+
+
+# --- Отзывы ---
+
+@receiver(pre_save, sender=Review)
+def review_pre_save(sender, instance, update_fields=None, **kwargs):
+    remember_previous(instance, ['is_published'], update_fields)
+
+
+@receiver(post_save, sender=Review)
+def review_post_save(sender, instance, created, **kwargs):
+    if created:
+        bump(Counter, 1, key='reviews')
+        bump(Counter, int(instance.is_published), key='published_reviews')
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is not None and previous['is_published'] != instance.is_published:
+        bump(Counter, 1 if instance.is_published else -1, key='published_reviews')
+
+
+@receiver(post_delete, sender=Review)
+def review_post_delete(sender, instance, **kwargs):
+    bump(Counter, -1, key='reviews')
+    bump(Counter, -int(instance.is_published), key='published_reviews')
@@ -0,0 +1,82 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from applications.models import Application
+from courses.models import Course
+from reviews.models import Review
+from users.models import User
+from .counters import dashboard_stats, reconcile
+from .models import Counter
+
+
+class IncrementalCountersTests(APITestCase):
+    def test_signals_match_full_reconcile(self):
+        reconcile()
+        teacher = User.objects.create_user(username='teacher', role='teacher')
+        courses = [Course.objects.create(title=f'Курс {i}', subject='Химия', price=1000, teacher=teacher) for i in range(3)]
+        students = [User.objects.create_user(username=f'student{i}') for i in range(4)]
+
+        students[0].profile.enrolled_courses.set(courses)
+        students[1].profile.enrolled_courses.add(courses[0], courses[1])
+        students[1].profile.enrolled_courses.remove(courses[1])
+        students[2].profile.enrolled_courses.add(courses[2])
+        students[2].profile.enrolled_courses.clear()
+        courses[0].enrolled_student_profiles.add(students[3].profile)
+        students[0].profile.enrolled_courses.set([courses[0]])
+        students[3].delete()
+        courses[2].delete()
+
+        students[2].role = 'teacher'
+        students[2].save()
+        students[1].save(update_fields=['last_login'])
+
+        applications = [Application.objects.create(name=f'Заявка {i}', phone='+77000000000') for i in range(3)]
+        applications[0].status = 'contacted'
+        applications[0].save()
+        applications[1].delete()
+
+        reviews = [Review.objects.create(author='Аня', text='Спасибо', score_info='5') for i in range(2)]
+        reviews[0].is_published = True
+        reviews[0].save()
+        reviews[1].delete()
+
+        incremental = dashboard_stats()
+        reconcile()
+        self.assertEqual(incremental, dashboard_stats())
+        self.assertEqual(incremental['students_count'], 2)
+        self.assertEqual(incremental['teachers_count'], 2)
+        self.assertEqual(incremental['courses_count'], 2)
+        self.assertEqual(incremental['applications_count'], 2)
+        self.assertEqual(incremental['published_reviews_count'], 1)
+        self.assertEqual(
+            {row['course_id']: row['count'] for row in incremental['enrollments_by_course']},
+            {courses[0].pk: 2},
+        )
+
+    def test_dashboard_view_does_not_count_source_tables(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        reconcile()
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('admin-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['students_count'], 0)
+
+    def test_partial_counters_are_reconciled(self):
+        # База до появления счетчиков: заявки есть, строк Counter нет
+        Counter.objects.all().delete()
+        Application.objects.bulk_create(Application(name=f'Заявка {i}', phone='+77000000000') for i in range(5))
+        # Первая запись после деплоя создает только свой счетчик
+        Application.objects.create(name='Новая', phone='+77000000001')
+        self.assertEqual(list(Counter.objects.values_list('key', flat=True)), ['applications'])
+        self.assertEqual(dashboard_stats()['applications_count'], 6)
+        self.assertEqual(Counter.objects.get(key='applications').count, 6)
+
+    def test_migration_reconciles_with_historical_models(self):
+        Application.objects.bulk_create(Application(name=f'Заявка {i}', phone='+77000000000') for i in range(3))
+        state = MigrationExecutor(connection).loader.project_state(('stats', '0002_reconcile_counters'))
+        counters = reconcile(state.apps)
+        self.assertEqual(counters['applications'], 3)
+        self.assertEqual(Counter.objects.get(key='applications').count, 3)
@@ -0,0 +1,92 @@
+# backend/system_settings/cache.py
+
+import threading
+import time
+from dataclasses import dataclass, fields
+
+from django.core.cache import cache
+
+CACHE_KEY = 'system_settings:singleton'
+
+# Сколько секунд процесс доверяет своей копии, не сверяясь с общим кешем.
+# Через столько же секунд изменения из другого воркера становятся видны.
+LOCAL_TTL = 5
+
+# Срок жизни записи в общем кеше: даже если запись разошлась с БД,
+# через столько секунд ее перечитают из таблицы.
+SHARED_TTL = 60 * 60
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Неизменяемая копия системных настроек для чтения на горячих путях."""
+    school_name: str
+    address: str
+    phone: str
+    email: str
+    email_notifications: bool
+    sms_notifications: bool
+    payment_reminders: bool
+    class_reminders: bool
+    timezone: str
+    language: str
+    currency: str
+
+
+SNAPSHOT_FIELDS = [field.name for field in fields(SettingsSnapshot)]
+
+_local = {'version': None, 'data': None, 'checked_at': 0.0}
+_lock = threading.Lock()
+
+
+def _load_from_db():
+    from .models import SystemSettings
+    obj, created = SystemSettings.objects.get_or_create(pk=1)
+    return {field.attname: getattr(obj, field.attname) for field in SystemSettings._meta.concrete_fields}
+
+
+def publish(data, replace=True):
+    """
+    Кладет настройки в общий кеш с новой версией и обновляет копию процесса.
+    replace=False — холодная загрузка читателем: запись кладется через cache.add
+    и не затирает ту, что успел опубликовать save() после коммита (читатель мог
+    прочитать строку до этого коммита). Возвращает данные, оказавшиеся в кеше.
+    """
+    entry = {'version': time.time_ns(), 'data': data}
+    if replace:
+        cache.set(CACHE_KEY, entry, timeout=SHARED_TTL)
+    elif not cache.add(CACHE_KEY, entry, timeout=SHARED_TTL):
+        entry = cache.get(CACHE_KEY) or entry
+    with _lock:
+        _local.update(version=entry['version'], data=entry['data'], checked_at=time.monotonic())
+    return entry['data']
+
+
+def get_data():
+    """
+    Словарь значений полей SystemSettings.
+    - копия процесса, если она свежее LOCAL_TTL;
+    - иначе общий кеш (без БД), а в БД идем только если кеш пуст.
+    """
+    now = time.monotonic()
+    if _local['data'] is not None and now - _local['checked_at'] < LOCAL_TTL:
+        return _local['data']
+
+    entry = cache.get(CACHE_KEY)
+    if entry is None:
+        return publish(_load_from_db(), replace=False)
+
+    with _lock:
+        _local.update(version=entry['version'], data=entry['data'], checked_at=now)
+    return entry['data']
+
+
+def get_settings():
+    """Типизированный доступ к настройкам: SettingsSnapshot без обращения к БД."""
+    data = get_data()
+    return SettingsSnapshot(**{name: data[name] for name in SNAPSHOT_FIELDS})
+
+
+def reset_local():
+    with _lock:
+        _local.update(version=None, data=None, checked_at=0.0)
@@ -1,6 +1,7 @@
 # backend/system_settings/models.py
 
-from django.db import models
+from django.db import models, transaction
+from . import cache
 
 class SystemSettings(models.Model):
     """
@@ -29,12 +30,16 @@ class SystemSettings(models.Model):
     def save(self, *args, **kwargs):
         self.pk = 1
         super(SystemSettings, self).save(*args, **kwargs)
+        # Обновляем общий кеш после коммита — остальные воркеры увидят изменения через cache.LOCAL_TTL
+        data = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+        transaction.on_commit(lambda: cache.publish(data))
 
     @classmethod
     def load(cls):
-        # .get_or_create() возвращает кортеж (объект, создан_ли_он)
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+        # Берем значения из кеша; в БД (get_or_create) идем только при пустом кеше
+        data = cache.get_data()
+        names = [field.attname for field in cls._meta.concrete_fields]
+        return cls.from_db('default', names, [data[name] for name in names])
 
     class Meta:
         verbose_name = "Системные настройки"
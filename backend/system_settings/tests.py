@@ -1,3 +1,56 @@
-from django.test import TestCase
+from django.core.cache import cache as shared_cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from users.models import User
+from . import cache
+from .models import SystemSettings
+
+
+class SystemSettingsCacheTests(APITestCase):
+    def setUp(self):
+        SystemSettings.objects.create()
+        shared_cache.clear()
+        cache.reset_local()
+
+    def test_load_hits_db_only_on_cold_cache(self):
+        with self.assertNumQueries(1):
+            SystemSettings.load()
+        with self.assertNumQueries(0):
+            obj = SystemSettings.load()
+            snapshot = cache.get_settings()
+        self.assertEqual(obj.pk, 1)
+        self.assertEqual(snapshot.currency, 'KZT')
+
+    def test_other_worker_reads_shared_cache_without_db(self):
+        SystemSettings.load()
+        cache.reset_local() # Имитируем другой процесс с пустой локальной копией
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get_settings().school_name, 'Munificent School')
+
+    def test_save_invalidates_cache(self):
+        obj = SystemSettings.load()
+        obj.currency = 'USD'
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        cache.reset_local()
+        self.assertEqual(cache.get_settings().currency, 'USD')
+
+    def test_cold_load_does_not_overwrite_committed_save(self):
+        stale = cache._load_from_db() # Читатель прочитал строку до коммита save()
+        obj = SystemSettings.load()
+        obj.currency = 'USD'
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        self.assertEqual(cache.publish(stale, replace=False)['currency'], 'USD')
+        cache.reset_local()
+        self.assertEqual(cache.get_settings().currency, 'USD')
+
+    def test_patch_view_updates_cached_value(self):
+        admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('system-settings'), {'timezone': 'UTC'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse('system-settings')).data['timezone'], 'UTC')
+        self.assertEqual(cache.get_settings().timezone, 'UTC')
@@ -20,7 +20,8 @@ class SystemSettingsView(APIView):
         return Response(serializer.data)
 
     def patch(self, request, *args, **kwargs):
-        settings = SystemSettings.load()
+        # Для записи берем актуальную строку из БД, а не копию из кеша
+        settings, created = SystemSettings.objects.get_or_create(pk=1)
         serializer = SystemSettingsSerializer(settings, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import current_user_view, change_password_view, admin_dashboard_stats_view, enroll_student_to_courses
+from .views import current_user_view, change_password_view, admin_dashboard_stats_view, enroll_student_to_courses, bulk_enroll_students, import_students_view
 
 # Здесь только те URL, которые не создаются роутером автоматически
 urlpatterns = [
@@ -7,4 +7,6 @@ urlpatterns = [
     path('users/change-password/', change_password_view, name='change-password'),
     path('users/admin-stats/', admin_dashboard_stats_view, name='admin-stats'),
     path('users/students/<int:pk>/enroll/', enroll_student_to_courses, name='enroll-student'),
+    path('users/students/enroll/', bulk_enroll_students, name='bulk-enroll-students'),
+    path('users/students/import/', import_students_view, name='import-students'),
 ]
\ No newline at end of file
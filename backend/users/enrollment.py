@@ -0,0 +1,105 @@
+# backend/users/enrollment.py
+
+from django.db import transaction
+
+from courses.models import Course
+from .models import Profile
+from .signals import enrollments_bulk_changed
+
+Enrollment = Profile.enrolled_courses.through
+
+# Размер пачки для IN (...) и bulk_create
+CHUNK_SIZE = 1000
+
+
+def chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@transaction.atomic
+def bulk_enroll(items, mode='set'):
+    """
+    Массовая запись учеников на курсы.
+
+    items — список пар (student_id, course_ids), каждый ученик не больше одного раза; mode:
+    - 'set' — оставить ученику ровно эти курсы (как enrolled_courses.set());
+    - 'add' — добавить курсы; 'remove' — убрать курсы.
+
+    Текущие записи читаются одним запросом на пачку, изменения пишутся через
+    bulk_create и удаление по id строк таблицы связи. Профили учеников блокируются
+    до конца транзакции: параллельные запросы по тем же ученикам выполняются по очереди,
+    и в результат и сигнал попадают только действительно записанные строки.
+    Возвращает список результатов по каждому ученику в порядке items.
+    """
+    student_ids = {student_id for student_id, course_ids in items}
+    profiles = {}
+    for chunk in chunks(sorted(student_ids)):
+        profiles.update(
+            Profile.objects.select_for_update(of=('self',)).filter(user_id__in=chunk, user__role='student')
+            .order_by('pk').values_list('user_id', 'pk')
+        )
+
+    requested_courses = {course_id for student_id, course_ids in items for course_id in course_ids}
+    existing_courses = set()
+    for chunk in chunks(requested_courses):
+        existing_courses.update(Course.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+
+    current = {profile_id: {} for profile_id in profiles.values()}
+    for chunk in chunks(profiles.values()):
+        for row_id, profile_id, course_id in Enrollment.objects.filter(profile_id__in=chunk).values_list(
+            'pk', 'profile_id', 'course_id'
+        ):
+            current[profile_id][course_id] = row_id
+
+    results, planned, to_create, to_delete = [], {}, [], []
+    for student_id, course_ids in items:
+        profile_id = profiles.get(student_id)
+        if profile_id is None:
+            results.append({'student_id': student_id, 'status': 'error', 'error': 'Студент не найден.'})
+            continue
+        missing = sorted(set(course_ids) - existing_courses)
+        if missing:
+            results.append({'student_id': student_id, 'status': 'error', 'error': f'Курсы не найдены: {missing}.'})
+            continue
+
+        enrolled = current[profile_id]
+        wanted = set(course_ids)
+        added = set() if mode == 'remove' else wanted - enrolled.keys()
+        if mode == 'set':
+            removed = enrolled.keys() - wanted
+        elif mode == 'remove':
+            removed = wanted & enrolled.keys()
+        else:
+            removed = set()
+
+        to_create.extend(Enrollment(profile_id=profile_id, course_id=course_id) for course_id in added)
+        to_delete.extend(enrolled[course_id] for course_id in removed)
+        planned[profile_id] = (added, removed)
+        results.append({'student_id': student_id, 'status': 'ok', 'profile_id': profile_id})
+
+    for chunk in chunks(to_delete):
+        Enrollment.objects.filter(pk__in=chunk).delete()
+    # Строку могли записать в обход блокировки (например, enrolled_courses.add): вставка идемпотентна
+    Enrollment.objects.bulk_create(to_create, batch_size=CHUNK_SIZE, ignore_conflicts=True)
+
+    # Что записано на самом деле: пропущенные из-за конфликта строки не считаются
+    inserted = set()
+    for chunk in chunks({enrollment.profile_id for enrollment in to_create}):
+        inserted.update(Enrollment.objects.filter(profile_id__in=chunk).values_list('profile_id', 'course_id'))
+
+    changes = {}
+    for result in results:
+        profile_id = result.pop('profile_id', None)
+        if profile_id is None:
+            continue
+        added, removed = planned[profile_id]
+        added = {course_id for course_id in added if (profile_id, course_id) in inserted}
+        if added or removed:
+            changes[profile_id] = (added, removed)
+        result.update(added=len(added), removed=len(removed))
+
+    if changes:
+        enrollments_bulk_changed.send(sender=Enrollment, changes=changes)
+    return results
@@ -0,0 +1,170 @@
+# backend/users/importing.py
+
+import csv
+import io
+import re
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from courses.models import Course
+from .enrollment import Enrollment, chunks, CHUNK_SIZE
+from .models import User, Profile
+from .signals import enrollments_bulk_changed, students_imported
+
+DEFAULT_PASSWORD = '235689qW#'
+
+# Колонки CSV: обязательна только email; courses — ID курсов через «;», «,» или пробел
+COLUMNS = ['email', 'first_name', 'last_name', 'phone', 'school', 'student_class',
+           'parent_name', 'parent_phone', 'courses']
+USER_FIELDS = ['first_name', 'last_name']
+PROFILE_FIELDS = ['phone', 'school', 'student_class', 'parent_name', 'parent_phone']
+
+
+def read_rows(source):
+    """Читает CSV из файла (байты или текст) в список словарей с обрезанными пробелами."""
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig')
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    reader = csv.DictReader(source)
+    fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    reader.fieldnames = fieldnames
+    return fieldnames, [
+        {key: (value or '').strip() for key, value in row.items() if key in COLUMNS}
+        for row in reader
+    ]
+
+
+def max_lengths(model, names):
+    return {name: model._meta.get_field(name).max_length for name in names}
+
+
+def validate(fieldnames, rows):
+    """
+    Проверяет все строки до записи в БД. Возвращает (ошибки, разобранные строки).
+    Ошибка — {'row': номер строки в файле, 'errors': {поле: сообщение}}.
+    """
+    if 'email' not in fieldnames:
+        return [{'row': 1, 'errors': {'email': 'В файле нет колонки email.'}}], []
+    unknown = sorted(set(fieldnames) - set(COLUMNS))
+    if unknown:
+        return [{'row': 1, 'errors': {'columns': f'Неизвестные колонки: {", ".join(unknown)}.'}}], []
+
+    limits = {**max_lengths(User, USER_FIELDS), **max_lengths(Profile, PROFILE_FIELDS)}
+    # Email становится и username, а он короче поля email
+    email_limit = min(max_lengths(User, ['email', 'username']).values())
+    emails = [row.get('email', '').lower() for row in rows]
+
+    # Существующие аккаунты ищем без учета регистра: Foo@x.com и foo@x.com — один адрес
+    taken = set()
+    accounts = User.objects.annotate(username_lower=Lower('username'), email_lower=Lower('email'))
+    for chunk in chunks(set(filter(None, emails))):
+        for username, email in accounts.filter(Q(username_lower__in=chunk) | Q(email_lower__in=chunk)).values_list(
+            'username_lower', 'email_lower',
+        ):
+            taken.update((username, email))
+
+    course_ids = set()
+    for row in rows:
+        course_ids.update(code for code in re.split(r'[;,\s]+', row.get('courses', '')) if code.isdigit())
+    existing_courses = set()
+    for chunk in chunks({int(code) for code in course_ids}):
+        existing_courses.update(Course.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+
+    errors, parsed, seen = [], [], set()
+    for number, (row, email) in enumerate(zip(rows, emails), start=2): # 1 — строка заголовка
+        row_errors = {}
+        if not email:
+            row_errors['email'] = 'Обязательное поле.'
+        elif len(email) > email_limit:
+            row_errors['email'] = f'Не больше {email_limit} символов.'
+        else:
+            try:
+                validate_email(email)
+            except ValidationError:
+                row_errors['email'] = 'Некорректный email.'
+            else:
+                if email in taken:
+                    row_errors['email'] = 'Пользователь с таким email уже существует.'
+                elif email in seen:
+                    row_errors['email'] = 'Email повторяется в файле.'
+            seen.add(email)
+
+        for field, limit in limits.items():
+            if len(row.get(field, '')) > limit:
+                row_errors[field] = f'Не больше {limit} символов.'
+
+        codes = [code for code in re.split(r'[;,\s]+', row.get('courses', '')) if code]
+        bad = [code for code in codes if not code.isdigit() or int(code) not in existing_courses]
+        if bad:
+            row_errors['courses'] = f'Курсы не найдены: {", ".join(bad)}.'
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+            continue
+        parsed.append({**row, 'email': email, 'courses': sorted({int(code) for code in codes})})
+    return errors, parsed
+
+
+def import_students(source, dry_run=False):
+    """
+    Импорт учеников из CSV. Сначала проверяются все строки; если есть хоть одна
+    ошибка, ничего не записывается. Иначе пользователи, профили и записи на курсы
+    вставляются пачками в одной транзакции, а общий пароль по умолчанию хешируется
+    один раз. Возвращает {'rows', 'created', 'enrollments', 'errors'}.
+
+    bulk_create не вызывает post_save, поэтому профили создаются здесь, а счетчики
+    дашборда обновляются через сигналы students_imported и enrollments_bulk_changed.
+    """
+    fieldnames, rows = read_rows(source)
+    errors, parsed = validate(fieldnames, rows)
+    result = {'rows': len(rows), 'created': 0, 'enrollments': 0, 'errors': errors}
+    if errors or dry_run or not parsed:
+        return result
+
+    with transaction.atomic():
+        password = make_password(DEFAULT_PASSWORD)
+        now = timezone.now()
+        User.objects.bulk_create([
+            User(
+                username=row['email'], email=row['email'], role='student', password=password, date_joined=now,
+                **{field: row.get(field, '') for field in USER_FIELDS},
+            )
+            for row in parsed
+        ], batch_size=CHUNK_SIZE)
+
+        # Не на всех СУБД bulk_create возвращает pk, поэтому читаем их по username
+        user_ids = {}
+        for chunk in chunks([row['email'] for row in parsed]):
+            user_ids.update(User.objects.filter(username__in=chunk).values_list('username', 'pk'))
+
+        Profile.objects.bulk_create([
+            Profile(user_id=user_ids[row['email']], **{field: row.get(field) or None for field in PROFILE_FIELDS})
+            for row in parsed
+        ], batch_size=CHUNK_SIZE)
+
+        profile_ids = {}
+        for chunk in chunks(user_ids.values()):
+            profile_ids.update(Profile.objects.filter(user_id__in=chunk).values_list('user_id', 'pk'))
+
+        enrollments, changes = [], {}
+        for row in parsed:
+            if not row['courses']:
+                continue
+            profile_id = profile_ids[user_ids[row['email']]]
+            enrollments.extend(Enrollment(profile_id=profile_id, course_id=course_id) for course_id in row['courses'])
+            changes[profile_id] = (set(row['courses']), set())
+        Enrollment.objects.bulk_create(enrollments, batch_size=CHUNK_SIZE)
+
+        students_imported.send(sender=User, user_ids=list(user_ids.values()), date_joined=now)
+        if changes:
+            enrollments_bulk_changed.send(sender=Enrollment, changes=changes)
+
+    result.update(created=len(parsed), enrollments=len(enrollments))
+    return result
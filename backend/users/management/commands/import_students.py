@@ -0,0 +1,37 @@
+# backend/users/management/commands/import_students.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importing import COLUMNS, import_students
+
+
+class Command(BaseCommand):
+    help = f'Импортирует учеников из CSV (колонки: {", ".join(COLUMNS)}). Пароль у всех — пароль по умолчанию.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к CSV-файлу в UTF-8')
+        parser.add_argument('--dry-run', action='store_true', help='Только проверить файл, ничего не создавая')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as source:
+                result = import_students(source, dry_run=options['dry_run'])
+        except OSError as error:
+            raise CommandError(f'Не удалось открыть файл: {error}')
+
+        for error in result['errors']:
+            messages = '; '.join(f'{field}: {message}' for field, message in error['errors'].items())
+            self.stderr.write(f'Строка {error["row"]}: {messages}')
+        if result['errors']:
+            raise CommandError(f'Ошибок: {len(result["errors"])} из {result["rows"]} строк. Ничего не импортировано.')
+
+        elapsed = time.perf_counter() - started
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Проверено строк: {result["rows"]}, ошибок нет ({elapsed:.1f} с).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Создано учеников: {result["created"]}, записей на курсы: {result["enrollments"]} ({elapsed:.1f} с).'
+            ))
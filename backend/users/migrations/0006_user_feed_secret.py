@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_role_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='feed_secret',
+            field=models.CharField(blank=True, editable=False, max_length=32, verbose_name='Секрет ссылки на календарь'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from courses.models import Course
@@ -12,6 +13,21 @@ class User(AbstractUser):
     )
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student')
     avatar = models.URLField(blank=True, null=True, verbose_name="URL аватара")
+    # Входит в подпись ссылки на календарь (courses/timetable.py): смена секрета отзывает прежние ссылки
+    feed_secret = models.CharField(max_length=32, blank=True, editable=False, verbose_name="Секрет ссылки на календарь")
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Публичный список преподавателей: role='teacher' среди активных по id.
+            # is_active — в условии частичного индекса, а не колонкой: SQLite сравнивает булево поле
+            # без "= 1" и не может искать по такой колонке составного индекса
+            models.Index(fields=['role', 'id'], condition=models.Q(is_active=True), name='user_role_active_idx'),
+            # Счетчики по ролям и регистрации учеников по неделям (stats)
+            models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+            # Импорт учеников ищет уже занятые email и username без учета регистра (users/importing.py)
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+        ]
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
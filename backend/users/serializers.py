@@ -1,11 +1,32 @@
 from rest_framework import serializers
+from backend.mixins import EagerLoadingSerializerMixin
 from .models import User, Profile
+from .importing import DEFAULT_PASSWORD
 
 # --- Сериализатор для смены пароля (оставляем без изменений) ---
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
     new_password = serializers.CharField(required=True)
 
+# --- Сериализаторы для массовой записи на курсы ---
+class EnrollmentItemSerializer(serializers.Serializer):
+    student_id = serializers.IntegerField()
+    course_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+
+
+class BulkEnrollmentSerializer(serializers.Serializer):
+    MAX_ITEMS = 10000
+
+    mode = serializers.ChoiceField(choices=['set', 'add', 'remove'], default='set')
+    enrollments = EnrollmentItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+    def validate_enrollments(self, value):
+        student_ids = [item['student_id'] for item in value]
+        if len(student_ids) != len(set(student_ids)):
+            raise serializers.ValidationError('Каждый студент может встречаться в запросе только один раз.')
+        return value
+
+
 # --- Сериализатор для профиля (оставляем без изменений) ---
 class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,9 +35,12 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 
 # --- Основной сериализатор пользователя ---
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     profile = ProfileSerializer(read_only=True) # Профиль только для чтения
 
+    select_related_fields = ('profile',)
+    prefetch_related_fields = ('profile__enrolled_courses',)
+
     class Meta:
         model = User
         # Убираем 'password' из списка, т.к. он будет задан автоматически
@@ -47,7 +71,7 @@ class UserSerializer(serializers.ModelSerializer):
         validated_data['username'] = validated_data.get('email')
         
         # Задаем пароль по умолчанию
-        password = "235689qW#"
+        password = DEFAULT_PASSWORD
         
         # Создаем пользователя через менеджер, который правильно хеширует пароль
         user = User.objects.create_user(password=password, **validated_data)
@@ -55,9 +79,12 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 # --- Публичный сериализатор для преподавателей (оставляем без изменений) ---
-class TeacherPublicSerializer(serializers.ModelSerializer):
+class TeacherPublicSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     profile = ProfileSerializer(read_only=True)
 
+    select_related_fields = ('profile',)
+    prefetch_related_fields = ('profile__enrolled_courses',)
+
     class Meta:
         model = User
         fields = ['id', 'first_name', 'last_name', 'profile']
\ No newline at end of file
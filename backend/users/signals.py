@@ -1,2 +1,47 @@
-# Этот файл больше не используется, чтобы избежать дублирования сигналов.
-# Вся логика по созданию профиля перенесена в users/models.py.
\ No newline at end of file
+# Логика по созданию профиля находится в users/models.py.
+# Здесь — собственные сигналы приложения и отзыв JWT при изменении пользователя.
+
+from django.conf import settings
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from backend.authentication import revoke
+
+# Массовая запись на курсы (users.enrollment.bulk_enroll) пишет в таблицу связи напрямую,
+# без m2m_changed. Вместо него отправляется этот сигнал с аргументом
+# changes: {profile_id: (добавленные course_id, удаленные course_id)}.
+enrollments_bulk_changed = Signal()
+
+# Импорт учеников (users.importing.import_students) создает пользователей через bulk_create,
+# без post_save. Аргументы: user_ids — ID созданных учеников, date_joined — дата регистрации.
+students_imported = Signal()
+
+
+# --- Отзыв JWT ---
+# В access-токене лежат role и is_staff, а пользователь из БД не читается
+# (backend.authentication). Поэтому при смене роли, прав, активности или пароля,
+# а также при удалении пользователя его выпущенные токены отзываются.
+
+REVOKING_FIELDS = ('role', 'is_staff', 'is_active', 'password')
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_auth_fields(sender, instance, update_fields=None, **kwargs):
+    instance._auth_fields = None
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(REVOKING_FIELDS)):
+        return
+    instance._auth_fields = sender.objects.filter(pk=instance.pk).values(*REVOKING_FIELDS).first()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def revoke_changed_user_tokens(sender, instance, created, **kwargs):
+    old = getattr(instance, '_auth_fields', None)
+    if created or not old:
+        return
+    if any(old[field] != getattr(instance, field) for field in REVOKING_FIELDS):
+        revoke(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke(instance.pk)
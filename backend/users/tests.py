@@ -1,3 +1,211 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend.testing import QueryCountTestMixin
+from courses.models import Course
+from .importing import DEFAULT_PASSWORD
+from .models import User
+
+
+def make_users(count, role='student', courses=()):
+    start = User.objects.count()
+    for i in range(start, start + count):
+        user = User.objects.create_user(username=f'{role}{i}', email=f'{role}{i}@example.com', role=role)
+        user.profile.enrolled_courses.set(courses)
+
+
+class UserQueryCountTests(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.courses = [Course.objects.create(title=f'Курс {i}', subject='Математика', price=1000) for i in range(3)]
+        make_users(2, courses=self.courses)
+        make_users(2, role='teacher')
+
+    def test_user_list_is_constant(self):
+        self.client.force_authenticate(self.admin)
+        self.assertConstantQueries(
+            reverse('user-list'), lambda: make_users(10, courses=self.courses), budget=3,
+        )
+
+    def test_user_list_filtered_by_role_is_constant(self):
+        self.client.force_authenticate(self.admin)
+        self.assertConstantQueries(
+            reverse('user-list'), lambda: make_users(10, courses=self.courses), budget=3, role='student',
+        )
+
+    def test_public_teachers_is_constant(self):
+        self.assertConstantQueries(
+            reverse('public-teacher-list'), lambda: make_users(10, role='teacher'), budget=2,
+        )
+
+    def test_current_user(self):
+        student = User.objects.filter(role='student').first()
+        self.client.force_authenticate(student)
+        self.assertLessEqual(self.count_queries(reverse('current-user')), 2)
+
+
+class BulkEnrollmentTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(self.admin)
+        self.courses = [Course.objects.create(title=f'Курс {i}', subject='История', price=1000) for i in range(3)]
+        make_users(3)
+        self.students = list(User.objects.filter(role='student').order_by('pk'))
+
+    def enroll(self, enrollments, mode='set'):
+        return self.client.post(reverse('bulk-enroll-students'), {'mode': mode, 'enrollments': enrollments}, format='json')
+
+    def enrolled(self, student):
+        return set(student.profile.enrolled_courses.values_list('pk', flat=True))
+
+    def test_set_add_remove_diffs(self):
+        c1, c2, c3 = (course.pk for course in self.courses)
+        s1, s2, s3 = self.students
+        s1.profile.enrolled_courses.set([c1, c2])
+
+        response = self.enroll([{'student_id': s1.pk, 'course_ids': [c2, c3]}, {'student_id': s2.pk, 'course_ids': [c1]}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0], {'student_id': s1.pk, 'status': 'ok', 'added': 1, 'removed': 1})
+        self.assertEqual(self.enrolled(s1), {c2, c3})
+        self.assertEqual(self.enrolled(s2), {c1})
+
+        self.enroll([{'student_id': s2.pk, 'course_ids': [c2]}], mode='add')
+        self.enroll([{'student_id': s1.pk, 'course_ids': [c3]}], mode='remove')
+        self.assertEqual(self.enrolled(s1), {c2})
+        self.assertEqual(self.enrolled(s2), {c1, c2})
+        self.assertEqual(self.enrolled(s3), set())
+
+    def test_errors_are_reported_per_student(self):
+        teacher = User.objects.create_user(username='teacher', role='teacher')
+        response = self.enroll([
+            {'student_id': self.students[0].pk, 'course_ids': [self.courses[0].pk]},
+            {'student_id': teacher.pk, 'course_ids': [self.courses[0].pk]},
+            {'student_id': self.students[1].pk, 'course_ids': [999999]},
+        ])
+        self.assertEqual(response.data['succeeded'], 1)
+        self.assertEqual([row['status'] for row in response.data['results']], ['ok', 'error', 'error'])
+        self.assertEqual(self.enrolled(self.students[0]), {self.courses[0].pk})
+        self.assertEqual(self.enrolled(self.students[1]), set())
+
+    def test_duplicate_students_are_rejected(self):
+        item = {'student_id': self.students[0].pk, 'course_ids': []}
+        self.assertEqual(self.enroll([item, item]).status_code, 400)
+
+    def test_dashboard_counters_follow_bulk_changes(self):
+        from stats.counters import dashboard_stats, reconcile
+        reconcile()
+        self.enroll([{'student_id': student.pk, 'course_ids': [self.courses[0].pk]} for student in self.students])
+        self.enroll([{'student_id': self.students[0].pk, 'course_ids': []}])
+        incremental = dashboard_stats()
+        reconcile()
+        self.assertEqual(incremental['enrollments_by_course'], dashboard_stats()['enrollments_by_course'])
+
+    def test_conflicting_insert_is_counted_once(self):
+        from stats.counters import dashboard_stats, reconcile
+        from .enrollment import Enrollment
+        reconcile()
+        profile_id, course_id = self.students[0].profile.pk, self.courses[0].pk
+        original = Enrollment.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Ту же строку успела записать другая транзакция
+            original([Enrollment(profile_id=profile_id, course_id=course_id)])
+            self.assertTrue(kwargs.get('ignore_conflicts'))
+            return original(objs, **kwargs)
+
+        with mock.patch.object(Enrollment.objects, 'bulk_create', side_effect=racing_bulk_create):
+            response = self.enroll([
+                {'student_id': self.students[0].pk, 'course_ids': [course_id]},
+                {'student_id': self.students[1].pk, 'course_ids': [course_id]},
+            ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['added'] for row in response.data['results']], [1, 1])
+        incremental = dashboard_stats()['enrollments_by_course']
+        reconcile()
+        self.assertEqual(incremental, dashboard_stats()['enrollments_by_course'])
+        self.assertEqual(incremental[0]['count'], 2)
+
+    def test_export_enrollments_respects_user_filters(self):
+        c1, c2, c3 = (course.pk for course in self.courses)
+        s1, s2, s3 = self.students
+        s1.profile.enrolled_courses.set([c1, c2])
+        s2.profile.enrolled_courses.set([c3])
+
+        response = self.client.get(reverse('user-export-enrollments'), {'role': 'student', 'search': s1.username})
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual({line.split(',')[4] for line in lines[1:]}, {str(c1), str(c2)})
+
+
+class StudentImportTests(APITestCase):
+    HEADER = 'email,first_name,last_name,phone,school,student_class,parent_name,parent_phone,courses\n'
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True, role='admin')
+        self.client.force_authenticate(self.admin)
+        self.courses = [Course.objects.create(title=f'Курс {i}', subject='История', price=1000) for i in range(2)]
+
+    def upload(self, content, **params):
+        url = reverse('import-students')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(url, {'file': SimpleUploadedFile('students.csv', content.encode())}, format='multipart')
+
+    def test_imports_users_profiles_and_enrollments(self):
+        c1, c2 = (course.pk for course in self.courses)
+        content = self.HEADER + (
+            f'Asel@Example.com,Асель,Ким,+77001,Школа №5,10А,Ким Ирина,+77002,{c1};{c2}\n'
+            'bolat@example.com,Болат,Оспанов,,,,,,\n'
+        )
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['enrollments'], 2)
+
+        student = User.objects.get(username='asel@example.com')
+        self.assertEqual(student.role, 'student')
+        self.assertTrue(student.check_password(DEFAULT_PASSWORD))
+        self.assertEqual(student.profile.parent_name, 'Ким Ирина')
+        self.assertEqual(set(student.profile.enrolled_courses.values_list('pk', flat=True)), {c1, c2})
+        self.assertIsNone(User.objects.get(username='bolat@example.com').profile.phone)
+
+        stats = self.client.get(reverse('admin-stats')).data
+        self.assertEqual(stats['students_count'], 2)
+        self.assertEqual(sum(row['count'] for row in stats['enrollments_by_course']), 2)
+
+    def test_row_errors_reject_whole_file(self):
+        User.objects.create_user(username='taken@example.com', email='taken@example.com')
+        content = self.HEADER + (
+            'ok@example.com,,,,,,,,\n'
+            'taken@example.com,,,,,,,,\n'
+            'not-an-email,,,,,,,,\n'
+            'ok@example.com,,,,,,,,999\n'
+        )
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 5])
+        self.assertIn('courses', response.data['errors'][2]['errors'])
+        self.assertFalse(User.objects.filter(username='ok@example.com').exists())
+
+    def test_existing_accounts_match_case_insensitively_and_length_fits_username(self):
+        User.objects.create_user(username='Foo', email='Foo@Example.com')
+        User.objects.create_user(username='Bar@Example.com')
+        long_email = 'a' * 140 + '@example.com' # короче поля email, но длиннее username
+        content = self.HEADER + f'foo@example.com,,,,,,,,\nbar@example.com,,,,,,,,\n{long_email},,,,,,,,\n'
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 400)
+        errors = {error['row']: error['errors']['email'] for error in response.data['errors']}
+        self.assertEqual(set(errors), {2, 3, 4})
+        self.assertIn('уже существует', errors[2])
+        self.assertIn('уже существует', errors[3])
+        self.assertEqual(errors[4], 'Не больше 150 символов.')
+
+    def test_dry_run_only_validates(self):
+        response = self.upload(self.HEADER + 'new@example.com,,,,,,,,\n', dry_run=1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rows'], 1)
+        self.assertFalse(User.objects.filter(username='new@example.com').exists())
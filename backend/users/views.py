@@ -3,17 +3,25 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from .models import User
-from .serializers import UserSerializer, TeacherPublicSerializer, ProfileSerializer, ChangePasswordSerializer # <-- Теперь импорт сработает
+from .models import User, Profile
+from .serializers import UserSerializer, TeacherPublicSerializer, ProfileSerializer, ChangePasswordSerializer, BulkEnrollmentSerializer # <-- Теперь импорт сработает
+from .enrollment import bulk_enroll
+from .importing import import_students
 from backend.permissions import IsAdmin
+from backend.mixins import EagerLoadingMixin, ReplicaReadMixin
+from backend.exports import EXPORT_FORMATS, export_response
+from httpcache.mixins import ConditionalGetMixin
 from courses.models import Course
+from stats.counters import dashboard_stats
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdmin]
     filter_backends = [filters.SearchFilter]
     search_fields = ['username', 'email', 'first_name', 'last_name']
+    ordering = 'id'
+    offset_pagination = True # Админская таблица может листать по номерам страниц
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -22,10 +30,63 @@ class UserViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(role=role)
         return queryset
 
-class TeacherPublicViewSet(viewsets.ReadOnlyModelViewSet):
+    def get_export_queryset(self, request):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return None, file_format
+        # Для выгрузки связи подтягиваются JOIN-ом в values_list, prefetch не нужен
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        return queryset.order_by(self.ordering), file_format
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Выгрузка пользователей с контактами из профиля (?file_format=csv|xlsx|json, фильтры как у списка)."""
+        queryset, file_format = self.get_export_queryset(request)
+        if queryset is None:
+            return Response({'error': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+        columns = [
+            ('id', 'ID'),
+            ('email', 'Email'),
+            ('first_name', 'Имя'),
+            ('last_name', 'Фамилия'),
+            ('role', 'Роль'),
+            ('is_active', 'Активен'),
+            ('date_joined', 'Дата регистрации'),
+            ('profile__phone', 'Телефон'),
+            ('profile__school', 'Школа'),
+            ('profile__student_class', 'Класс'),
+            ('profile__parent_name', 'Родитель'),
+            ('profile__parent_phone', 'Телефон родителя'),
+        ]
+        return export_response(queryset, columns, 'users', file_format)
+
+    @action(detail=False, methods=['get'], url_path='export-enrollments')
+    def export_enrollments(self, request):
+        """Выгрузка записей на курсы: строка на пару ученик — курс, фильтры как у списка пользователей."""
+        queryset, file_format = self.get_export_queryset(request)
+        if queryset is None:
+            return Response({'error': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+        enrollments = Profile.enrolled_courses.through.objects.filter(
+            profile__user__in=queryset.values('pk'),
+        ).order_by('profile__user_id', 'course_id')
+        columns = [
+            ('profile__user_id', 'ID ученика'),
+            ('profile__user__email', 'Email'),
+            ('profile__user__first_name', 'Имя'),
+            ('profile__user__last_name', 'Фамилия'),
+            ('course_id', 'ID курса'),
+            ('course__title', 'Курс'),
+            ('course__teacher__last_name', 'Преподаватель'),
+        ]
+        return export_response(enrollments, columns, 'enrollments', file_format)
+
+class TeacherPublicViewSet(ReplicaReadMixin, ConditionalGetMixin, EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.filter(role='teacher', is_active=True)
     serializer_class = TeacherPublicSerializer
     permission_classes = [AllowAny]
+    ordering = 'id'
+    version_models = ('users.User', 'users.Profile')
+    response_cache = True
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -50,12 +111,8 @@ def change_password_view(request):
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def admin_dashboard_stats_view(request):
-    stats = {
-        'students_count': User.objects.filter(role='student').count(),
-        'teachers_count': User.objects.filter(role='teacher').count(),
-        'courses_count': Course.objects.count(),
-    }
-    return Response(stats)
+    # Счетчики ведутся сигналами в приложении stats, здесь только чтение готовых таблиц
+    return Response(dashboard_stats())
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
@@ -72,4 +129,43 @@ def enroll_student_to_courses(request, pk):
     courses = Course.objects.filter(id__in=course_ids)
     user.profile.enrolled_courses.set(courses)
     
-    return Response({'status': f'Студент {user.username} обновлен в курсах.'}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({'status': f'Студент {user.username} обновлен в курсах.'}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def bulk_enroll_students(request):
+    """
+    Массовая запись: {"mode": "set" | "add" | "remove", "enrollments": [{"student_id": 1, "course_ids": [2, 3]}, ...]}.
+    Все изменения — в одной транзакции; ошибки возвращаются по каждому студенту отдельно.
+    """
+    serializer = BulkEnrollmentSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    items = [(item['student_id'], item['course_ids']) for item in serializer.validated_data['enrollments']]
+    results = bulk_enroll(items, mode=serializer.validated_data['mode'])
+    failed = sum(1 for result in results if result['status'] == 'error')
+    return Response({'succeeded': len(results) - failed, 'failed': failed, 'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def import_students_view(request):
+    """
+    Импорт учеников из CSV: multipart-поле file; ?dry_run=1 — только проверка.
+    Если хоть одна строка с ошибкой, ничего не создается и возвращается 400 со списком ошибок по строкам.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'Прикрепите CSV-файл в поле file.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        content = upload.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return Response({'error': 'Файл должен быть в кодировке UTF-8.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = request.query_params.get('dry_run') in ('1', 'true')
+    result = import_students(content, dry_run=dry_run)
+    if result['errors']:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
@@ -46,11 +46,17 @@ const CourseFormModal: React.FC<CourseFormModalProps> = ({ isOpen, onClose, onSu
     if (currentCourse) {
       setFormData({
         title: currentCourse.title,
-        description: currentCourse.description,
+        description: currentCourse.description ?? '',
         subject: currentCourse.subject,
         price: String(currentCourse.price),
         teacher: String(currentCourse.teacher),
       });
+      // В списке курсов нет описания — догружаем полную карточку курса
+      if (isOpen && currentCourse.description === undefined) {
+        apiClient.get<Course>(`/courses/${currentCourse.id}/`)
+          .then((response) => setFormData(prev => ({ ...prev, description: response.data.description ?? '' })))
+          .catch((error) => console.error("Failed to fetch course", error));
+      }
     } else {
       setFormData({ title: '', description: '', subject: '', price: '', teacher: '' });
     }
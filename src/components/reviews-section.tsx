@@ -53,8 +53,8 @@ export const ReviewsSection: React.FC = () => {
   useEffect(() => {
     const fetchReviews = async () => {
       try {
-        const response = await apiClient.get<Review[]>('/reviews/');
-        setReviews(response.data);
+        const response = await apiClient.get<{ results: Review[] } | Review[]>('/reviews/');
+        setReviews(Array.isArray(response.data) ? response.data : response.data.results);
       } catch (error) {
         console.error("Failed to fetch reviews:", error);
       } finally {
@@ -47,10 +47,10 @@ const AdminDashboard: React.FC = () => {
       try {
         const [statsResponse, appsResponse] = await Promise.all([
           apiClient.get<Stats>('/users/admin-stats/'),
-          apiClient.get<Application[]>('/applications/?limit=5') // Получаем 5 последних заявок
+          apiClient.get<{ results: Application[] } | Application[]>('/applications/?limit=5') // Получаем 5 последних заявок
         ]);
         setStats(statsResponse.data);
-        setApplications(appsResponse.data);
+        setApplications(Array.isArray(appsResponse.data) ? appsResponse.data : appsResponse.data.results);
       } catch (error) {
         console.error("Failed to fetch dashboard data", error);
       } finally {
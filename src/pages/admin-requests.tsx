@@ -49,8 +49,8 @@ const AdminRequests: React.FC = () => {
       if (statusFilter !== 'all') {
         params.append('status', statusFilter);
       }
-      const response = await apiClient.get<Application[]>(`/applications/?${params.toString()}`);
-      setApplications(response.data);
+      const response = await apiClient.get<{ results: Application[] } | Application[]>(`/applications/?${params.toString()}`);
+      setApplications(Array.isArray(response.data) ? response.data : response.data.results);
     } catch (error) {
       console.error("Failed to fetch applications:", error);
       addToast({ title: "Ошибка", description: "Не удалось загрузить заявки", color: "danger" });
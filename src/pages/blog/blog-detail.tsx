@@ -30,8 +30,9 @@ const BlogDetail: React.FC = () => {
 
         // Загружаем похожие статьи
         if (response.data.category) {
-            const relatedResponse = await apiClient.get(`/blog/posts/?category=${response.data.category}&exclude_id=${id}`);
-            setRelatedPosts(relatedResponse.data.slice(0, 3));
+            const relatedResponse = await apiClient.get(`/blog/posts/?category=${response.data.category}&exclude_id=${id}&page_size=4`);
+            const related = Array.isArray(relatedResponse.data) ? relatedResponse.data : relatedResponse.data.results;
+            setRelatedPosts(related.slice(0, 3));
         }
       } catch (err) {
         setError("Статья не найдена или произошла ошибка.");
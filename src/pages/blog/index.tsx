@@ -31,7 +31,7 @@ const Blog: React.FC = () => {
         params.append('search', searchQuery);
       }
       const postsResponse = await apiClient.get(`/blog/posts/?${params.toString()}`);
-      setPosts(postsResponse.data);
+      setPosts(Array.isArray(postsResponse.data) ? postsResponse.data : postsResponse.data.results);
     } catch (error) {
       console.error("Failed to fetch blog posts:", error);
     } finally {
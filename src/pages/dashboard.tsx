@@ -35,8 +35,8 @@ const formatDate = (dateString: string) => {
   return lessonDate.toLocaleDateString('ru-RU', { day: 'numeric', month: 'long' });
 };
 
-const formatTime = (timeString: string) => {
-  return new Date(`1970-01-01T${timeString}`).toLocaleTimeString('ru-RU', { hour: '2-digit', minute: '2-digit' });
+const formatTime = (dateTimeString: string) => {
+  return new Date(dateTimeString).toLocaleTimeString('ru-RU', { hour: '2-digit', minute: '2-digit' });
 };
 
 // --- Компоненты ---
@@ -49,9 +49,9 @@ const DashboardHeader: React.FC<{ user: User | null }> = ({ user }) => (
 );
 
 const LessonCard: React.FC<{ lesson: UpcomingLesson; index: number }> = ({ lesson, index }) => {
-  const lessonDate = useMemo(() => new Date(`${lesson.date}T${lesson.time}`), [lesson.date, lesson.time]);
-  const isPast = useMemo(() => lessonDate < new Date(), [lessonDate]);
-  const dateLabel = formatDate(lesson.date);
+  // Урок, который уже идет, еще не прошел: сравниваем с окончанием
+  const isPast = useMemo(() => new Date(lesson.end ?? lesson.start) < new Date(), [lesson.start, lesson.end]);
+  const dateLabel = formatDate(lesson.start);
 
   return (
     <motion.div 
@@ -64,8 +64,8 @@ const LessonCard: React.FC<{ lesson: UpcomingLesson; index: number }> = ({ lesso
           <div className="flex flex-col h-full">
             <div className="flex items-start justify-between gap-4">
               <div>
-                <h3 className="font-semibold text-lg">{lesson.courseName}</h3>
-                <p className="text-foreground-500">с {lesson.teacherName}</p>
+                <h3 className="font-semibold text-lg">{lesson.course_title}</h3>
+                {lesson.teacher_name && <p className="text-foreground-500">с {lesson.teacher_name}</p>}
               </div>
               <Chip color={dateLabel === 'Сегодня' ? 'success' : 'primary'} variant="flat">{dateLabel}</Chip>
             </div>
@@ -73,17 +73,17 @@ const LessonCard: React.FC<{ lesson: UpcomingLesson; index: number }> = ({ lesso
             <div className="flex items-center justify-between mt-auto">
               <div className="flex items-center gap-2">
                 <Icon icon="lucide:clock" width={16} height={16} className="text-foreground-500" />
-                <span>{formatTime(lesson.time)}</span>
+                <span>{formatTime(lesson.start)}</span>
               </div>
               <Button 
                 as="a" 
-                href={lesson.zoomLink} 
+                href={lesson.meeting_url ?? undefined} 
                 target="_blank" 
                 rel="noopener noreferrer" 
                 color="primary" 
                 variant={!isPast && dateLabel === 'Сегодня' ? 'solid' : 'flat'} 
                 startContent={<Icon icon="lucide:video" width={16} height={16} />} 
-                isDisabled={isPast}
+                isDisabled={isPast || !lesson.meeting_url}
               >
                 {isPast ? 'Прошел' : 'Подключиться'}
               </Button>
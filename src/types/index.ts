@@ -23,7 +23,7 @@ export interface TeacherDetails {
 export interface Course {
   id: number;
   title: string;
-  description: string;
+  description?: string; // Только в карточке курса, в списке не приходит
   subject: string;
   price: number;
   teacher: number; // ID преподавателя
@@ -35,6 +35,9 @@ export interface Lesson {
   title: string;
   content: string;
   course: number;
+  start?: string | null;
+  end?: string | null;
+  meeting_url?: string | null;
 }
 
 export interface Review {
@@ -46,9 +49,11 @@ export interface Review {
 
 export interface UpcomingLesson {
   id: number;
-  courseName: string;
-  teacherName: string;
-  date: string;
-  time: string;
-  zoomLink: string;
+  title: string;
+  course: number;
+  course_title: string;
+  teacher_name: string | null;
+  start: string;
+  end: string | null;
+  meeting_url: string | null;
 }
\ No newline at end of file